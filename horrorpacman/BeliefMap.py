@@ -0,0 +1,90 @@
+import math
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+BELIEF_SPREAD_RATE = 3.0
+BELIEF_MIN_PEAK = 0.01
+
+
+class BeliefMap:
+    def __init__(self, mask, rows, cols, spread_rate=BELIEF_SPREAD_RATE, min_peak=BELIEF_MIN_PEAK):
+        self.rows = rows
+        self.cols = cols
+        self.spread_rate = spread_rate
+        self.min_peak = min_peak
+        self.walk = np.frombuffer(bytes(mask), dtype=np.uint8).reshape(rows, cols).astype(np.float32)
+        deg = np.zeros((rows, cols), dtype=np.float32)
+        deg[1:, :] += self.walk[:-1, :]
+        deg[:-1, :] += self.walk[1:, :]
+        deg[:, 1:] += self.walk[:, :-1]
+        deg[:, :-1] += self.walk[:, 1:]
+        self.inv_deg = np.where(deg > 0, 1.0 / np.maximum(deg, 1.0), 0.0).astype(np.float32) * self.walk
+        self.has_nbr = (self.inv_deg > 0).astype(np.float32)
+        self.p = np.zeros((rows, cols), dtype=np.float32)
+        self._out = np.zeros((rows, cols), dtype=np.float32)
+        self._in = np.zeros((rows, cols), dtype=np.float32)
+        self._seen_idx = {}
+        self.active = False
+
+    def clear(self):
+        self.p.fill(0.0)
+        self.active = False
+
+    def reset_to(self, cell):
+        self.p.fill(0.0)
+        self.p[cell[0], cell[1]] = 1.0
+        self.active = True
+
+    def step(self, dt):
+        if not self.active:
+            return
+        d = min(0.9, self.spread_rate * dt)
+        np.multiply(self.p, self.inv_deg, out=self._out)
+        self._out *= d
+        self._in.fill(0.0)
+        self._in[1:, :] += self._out[:-1, :]
+        self._in[:-1, :] += self._out[1:, :]
+        self._in[:, 1:] += self._out[:, :-1]
+        self._in[:, :-1] += self._out[:, 1:]
+        self.p -= self.p * self.has_nbr * d
+        self.p += self._in
+        self.p *= self.walk
+
+    def _visible_idx(self, fov, cell):
+        key = cell[0] * self.cols + cell[1]
+        idx = self._seen_idx.get(key)
+        if idx is None:
+            ids = set([key])
+            for octant in range(8):
+                ids.update(fov.octant_cells(cell, octant))
+            idx = np.fromiter(sorted(ids), dtype=np.int32)
+            self._seen_idx[key] = idx
+        return idx
+
+    def clear_visible(self, fov, cell, facing_yaw=None, fov_degrees=None):
+        if not self.active:
+            return
+        idx = self._visible_idx(fov, cell)
+        if facing_yaw is not None and fov_degrees is not None and fov_degrees < 360.0:
+            dr = (idx // self.cols - cell[0]).astype(np.float32)
+            dc = (idx % self.cols - cell[1]).astype(np.float32)
+            yaw = math.radians(facing_yaw)
+            dot = dc * math.sin(yaw) - dr * math.cos(yaw)
+            keep = dot >= math.cos(math.radians(fov_degrees * 0.5)) * np.hypot(dr, dc)
+            idx = idx[keep]
+        self.p.flat[idx] = 0.0
+        total = float(self.p.sum())
+        if total <= 1e-9:
+            self.clear()
+            return
+        self.p *= (1.0 / total)
+        if float(self.p.max()) < self.min_peak:
+            self.clear()
+
+    def peak(self):
+        if not self.active:
+            return None
+        r, c = divmod(int(self.p.argmax()), self.cols)
+        return (r, c)
@@ -0,0 +1,245 @@
+import heapq
+from array import array
+from collections import deque
+
+from GridAccel import GridKernels
+
+COOP_HORIZON_STEPS = 12
+# Pac-Man lands a two-cell hop about every 1.5 s
+COOP_STEP_SECONDS = 0.75
+# a cell stays reserved this many steps after it is left, so plans survive
+# a chaser running that far behind the reservation clock
+COOP_ROBUST_STEPS = 1
+COOP_MAX_PLANS_PER_FRAME = 2
+COOP_MAX_EXPANSIONS = 2000
+COOP_GOAL_SPREAD_RADIUS = 3
+
+_MOVES = ((0, 0), (1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+class ReservationTable:
+    def __init__(self):
+        self.cells = {}
+        self._owned = {}
+
+    def owner(self, t, idx):
+        return self.cells.get((t, idx))
+
+    def is_free(self, agent, t, idx):
+        other = self.cells.get((t, idx))
+        return other is None or other == agent
+
+    def crosses(self, agent, t, a, b):
+        other = self.cells.get((t, b))
+        return other is not None and other != agent and self.cells.get((t + 1, a)) == other
+
+    def reserve(self, agent, t, idx):
+        key = (t, idx)
+        if key not in self.cells:
+            self.cells[key] = agent
+            self._owned.setdefault(agent, []).append(key)
+
+    def release(self, agent):
+        for key in self._owned.pop(agent, []):
+            if self.cells.get(key) == agent:
+                del self.cells[key]
+
+    def purge_before(self, t):
+        for agent, keys in list(self._owned.items()):
+            kept = []
+            for key in keys:
+                if key[0] < t:
+                    if self.cells.get(key) == agent:
+                        del self.cells[key]
+                else:
+                    kept.append(key)
+            self._owned[agent] = kept
+
+
+class CoopPlanner:
+    def __init__(self, mask, rows, cols, horizon=COOP_HORIZON_STEPS, step_seconds=COOP_STEP_SECONDS,
+                 max_plans_per_frame=COOP_MAX_PLANS_PER_FRAME, kernels=None):
+        self.mask = mask
+        self.rows = rows
+        self.cols = cols
+        self.horizon = horizon
+        self.step_seconds = step_seconds
+        self.max_plans_per_frame = max_plans_per_frame
+        self.kernels = kernels if kernels is not None else GridKernels(mask, rows, cols)
+        self.table = ReservationTable()
+        self.time = 0.0
+        self._agents = {}
+        self._pending = deque()
+        self._goals = {}
+        self._next_id = 0
+        self.plans_last_frame = 0
+
+    def register(self, chaser):
+        agent = self._next_id
+        self._next_id += 1
+        self._agents[agent] = chaser
+        return agent
+
+    def attach(self, chaser):
+        chaser.coop = self
+        chaser.agent_id = self.register(chaser)
+        return chaser.agent_id
+
+    def unregister(self, agent):
+        self._agents.pop(agent, None)
+        self._goals.pop(agent, None)
+        self.table.release(agent)
+
+    def current_step(self):
+        return int(self.time / self.step_seconds)
+
+    def request(self, agent, goal_rc):
+        if agent not in self._goals:
+            self._pending.append(agent)
+        self._goals[agent] = goal_rc
+
+    def update(self, dt):
+        self.time += dt
+        self.table.purge_before(self.current_step())
+        planned = 0
+        claimed = set()
+        while self._pending and planned < self.max_plans_per_frame:
+            agent = self._pending.popleft()
+            goal = self._goals.pop(agent, None)
+            chaser = self._agents.get(agent)
+            if goal is None or chaser is None:
+                continue
+            start = (chaser.grid_r, chaser.grid_c)
+            goal = self._spread_goal(agent, goal, claimed)
+            claimed.add(goal)
+            step0 = self.current_step()
+            chaser._set_path(self.plan(agent, start, goal), step0=step0)
+            planned += 1
+        self.plans_last_frame = planned
+
+    def _spread_goal(self, agent, goal, claimed):
+        cols = self.cols
+        taken = set(claimed)
+        for other, chaser in self._agents.items():
+            if other != agent and chaser.current_path:
+                taken.add(tuple(chaser.current_path[-1]))
+        if goal not in taken:
+            return goal
+        best = None
+        best_d = None
+        gr, gc = goal
+        for dr in range(-COOP_GOAL_SPREAD_RADIUS, COOP_GOAL_SPREAD_RADIUS + 1):
+            for dc in range(-COOP_GOAL_SPREAD_RADIUS, COOP_GOAL_SPREAD_RADIUS + 1):
+                r, c = gr + dr, gc + dc
+                if not (0 <= r < self.rows and 0 <= c < cols) or not self.mask[r * cols + c]:
+                    continue
+                if (r, c) in taken:
+                    continue
+                d = abs(dr) + abs(dc)
+                if best_d is None or d < best_d:
+                    best = (r, c)
+                    best_d = d
+        return best if best is not None else goal
+
+    def plan(self, agent, start, goal):
+        self.table.release(agent)
+        cols = self.cols
+        t0 = self.current_step()
+        s = start[0] * cols + start[1]
+        g = goal[0] * cols + goal[1]
+        gr, gc = goal
+        open_heap = [(abs(start[0] - gr) + abs(start[1] - gc), 0, s)]
+        came = {(s, 0): None}
+        best = (s, 0)
+        best_h = open_heap[0][0]
+        found = None
+        expansions = 0
+        while open_heap and expansions < COOP_MAX_EXPANSIONS:
+            f, t, idx = heapq.heappop(open_heap)
+            expansions += 1
+            if idx == g:
+                found = (idx, t)
+                break
+            r, c = divmod(idx, cols)
+            h = abs(r - gr) + abs(c - gc)
+            if h < best_h or (h == best_h and t > best[1]):
+                best = (idx, t)
+                best_h = h
+            if t >= self.horizon:
+                continue
+            for dr, dc in _MOVES:
+                nr, nc = r + dr, c + dc
+                if not (0 <= nr < self.rows and 0 <= nc < cols):
+                    continue
+                nidx = nr * cols + nc
+                if not self.mask[nidx] and nidx != s:
+                    continue
+                key = (nidx, t + 1)
+                if key in came:
+                    continue
+                if not all(self.table.is_free(agent, t0 + t + 1 + k, nidx) for k in range(COOP_ROBUST_STEPS + 1)):
+                    continue
+                if nidx != idx and self.table.crosses(agent, t0 + t, idx, nidx):
+                    continue
+                came[key] = (idx, t)
+                heapq.heappush(open_heap, (t + 1 + abs(nr - gr) + abs(nc - gc), t + 1, nidx))
+        end = found if found is not None else best
+        steps = []
+        node = end
+        while node is not None:
+            steps.append(node[0])
+            node = came[node]
+        steps.reverse()
+        for t, idx in enumerate(steps):
+            for k in range(COOP_ROBUST_STEPS + 1):
+                self.table.reserve(agent, t0 + t + k, idx)
+        for t in range(len(steps), self.horizon + 1):
+            self.table.reserve(agent, t0 + t, steps[-1])
+        path = [divmod(idx, cols) for idx in steps]
+        if found is None and path[-1] != goal:
+            tail = self.kernels.astar(path[-1], goal)
+            path.extend(tail[1:])
+        return path
+
+
+class OccupancyGrid:
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.count = array('i', [0]) * (rows * cols)
+        # lowest live token per cell; -1 when empty
+        self.owner = array('i', [-1]) * (rows * cols)
+        self._occupants = {}
+        self._next_token = 0
+
+    def register(self):
+        token = self._next_token
+        self._next_token += 1
+        return token
+
+    def enter(self, token, idx):
+        self._occupants.setdefault(idx, []).append(token)
+        self.count[idx] += 1
+        owner = self.owner[idx]
+        if owner == -1 or token < owner:
+            self.owner[idx] = token
+
+    def leave(self, token, idx):
+        tokens = self._occupants.get(idx)
+        if not tokens or token not in tokens:
+            return
+        tokens.remove(token)
+        self.count[idx] -= 1
+        if not tokens:
+            del self._occupants[idx]
+            self.owner[idx] = -1
+        elif self.owner[idx] == token:
+            self.owner[idx] = min(tokens)
+
+    def is_free(self, idx):
+        return self.count[idx] == 0
+
+    def blocks(self, token, idx):
+        # lower tokens keep right of way so two chasers never yield to each other
+        owner = self.owner[idx]
+        return owner != -1 and owner < token
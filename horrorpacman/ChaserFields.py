@@ -0,0 +1,107 @@
+import math
+
+from GridAccel import GridKernels
+from GridNav import NO_CELL, build_nearest_walkable_table, build_source_table, find_junctions, walkable_neighbors
+
+PERSONALITIES = ('chase', 'ambush', 'flank', 'shy')
+AMBUSH_AHEAD_CELLS = 4
+FLANK_SCALE = 2.0
+SHY_RADIUS_CELLS = 8
+DESCEND_MAX_STEPS = 24
+
+
+class FieldBank:
+    def __init__(self, mask, rows, cols, kernels=None):
+        self.mask = mask
+        self.rows = rows
+        self.cols = cols
+        self.kernels = kernels if kernels is not None else GridKernels(mask, rows, cols)
+        self.nearest = build_nearest_walkable_table(mask, rows, cols)
+        self.junctions = find_junctions(mask, rows, cols)
+        self.nearest_key = build_source_table(mask, rows, cols, self.junctions)
+        self._key_fields = {}
+        self.player_rc = None
+        self.player_field = self.kernels.new_int_buffer()
+        self.player_dir = (0.0, 0.0)
+        self._last_player_xz = None
+        self.home_cell = min(self.junctions) if self.junctions else None
+
+    def _snap(self, r, c):
+        r = max(0, min(self.rows - 1, int(r)))
+        c = max(0, min(self.cols - 1, int(c)))
+        return self.nearest[r * self.cols + c]
+
+    def observe_player(self, player_rc, px, pz):
+        last = self._last_player_xz
+        if last is not None:
+            dx = px - last[0]
+            dz = pz - last[1]
+            d = math.hypot(dx, dz)
+            if d > 1e-3:
+                # grid columns follow +x, grid rows follow -z
+                self.player_dir = (-dz / d, dx / d)
+        self._last_player_xz = (px, pz)
+        idx = self._snap(player_rc[0], player_rc[1])
+        if idx == NO_CELL:
+            return
+        rc = divmod(idx, self.cols)
+        if rc != self.player_rc:
+            self.player_rc = rc
+            self.kernels.bfs_distances(rc, out=self.player_field)
+
+    def key_field(self, idx):
+        key = self.nearest_key[idx] if idx != NO_CELL else NO_CELL
+        if key == NO_CELL:
+            return None, None
+        field = self._key_fields.get(key)
+        if field is None:
+            field = self.kernels.new_int_buffer()
+            self.kernels.bfs_distances(divmod(key, self.cols), out=field)
+            self._key_fields[key] = field
+        return field, key
+
+    def player_distance(self, rc):
+        if self.player_rc is None:
+            return -1
+        return self.player_field[rc[0] * self.cols + rc[1]]
+
+    def target_field(self, personality, chaser_rc, partner_rc=None):
+        if self.player_rc is None:
+            return None, 'chase'
+        pr, pc = self.player_rc
+        if personality == 'ambush':
+            dr, dc = self.player_dir
+            idx = self._snap(pr + round(dr * AMBUSH_AHEAD_CELLS), pc + round(dc * AMBUSH_AHEAD_CELLS))
+            return self.key_field(idx)[0], 'ambush'
+        if personality == 'flank' and partner_rc is not None:
+            idx = self._snap(pr + round((pr - partner_rc[0]) * (FLANK_SCALE - 1.0)),
+                             pc + round((pc - partner_rc[1]) * (FLANK_SCALE - 1.0)))
+            return self.key_field(idx)[0], 'flank'
+        if personality == 'shy':
+            d = self.player_distance(chaser_rc)
+            if 0 <= d <= SHY_RADIUS_CELLS and self.home_cell is not None:
+                return self.key_field(self.home_cell)[0], 'shy'
+        return self.player_field, 'chase'
+
+    def descend(self, field, start_rc, max_steps=DESCEND_MAX_STEPS):
+        cols = self.cols
+        idx = start_rc[0] * cols + start_rc[1]
+        if field is None:
+            return []
+        if field[idx] < 0:
+            idx = self.nearest[idx]
+            if idx == NO_CELL or field[idx] < 0:
+                return []
+        path = [divmod(idx, cols)]
+        for _ in range(max_steps):
+            d = field[idx]
+            if d <= 0:
+                break
+            for nidx in walkable_neighbors(self.mask, self.rows, cols, idx):
+                if field[nidx] == d - 1:
+                    idx = nidx
+                    break
+            else:
+                break
+            path.append(divmod(idx, cols))
+        return path
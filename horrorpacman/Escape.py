@@ -1,10 +1,16 @@
 import os
 import math
-import viz
-import vizshape
-import vizact
+try:
+    import viz
+    import vizshape
+    import vizact
+except Exception:
+    viz = None
+    vizshape = None
+    vizact = None
 
 LOCK_CELL = '🟩'
+ACTIVATE_DISTANCE_CELLS = 0.6
 
 def _default_grid_path():
     return os.path.normpath(os.path.join(os.path.dirname(__file__), '..', 'Map_Grid.txt'))
@@ -138,6 +144,19 @@ def _count_locks(map_root):
     return count
 
 
+def find_escape_cells(grid):
+    # (top row, bottom row, col) of the first vertical 🟩 pair in row-major order, or None
+    rows = len(grid)
+    cols = max((len(r) for r in grid), default=0)
+    for r in range(rows - 1):
+        for c in range(cols):
+            a = grid[r][c] if c < len(grid[r]) else None
+            b = grid[r+1][c] if c < len(grid[r+1]) else None
+            if a == LOCK_CELL and b == LOCK_CELL:
+                return (r, r+1, c)
+    return None
+
+
 def spawn_escape(map_root=None, attach_to_map=True, grid_path=None, cell_size=3.0, spawn_offset=None):
     global _node, _map_root, _cell_size
     _map_root = map_root
@@ -170,17 +189,7 @@ def spawn_escape(map_root=None, attach_to_map=True, grid_path=None, cell_size=3.
     rows = len(grid)
     cols = max(len(r) for r in grid)
 
-    found = None
-    for r in range(rows - 1):
-        for c in range(cols):
-            a = grid[r][c] if c < len(grid[r]) else None
-            b = grid[r+1][c] if c < len(grid[r+1]) else None
-            if a == LOCK_CELL and b == LOCK_CELL:
-                found = (r, r+1, c)
-                break
-        if found:
-            break
-
+    found = find_escape_cells(grid)
     if not found:
         print('[Escape] No vertical 🟩 pair found in grid')
         return None
@@ -300,7 +309,7 @@ def _try_activate():
     except Exception:
         return False
     try:
-        thresh = (_cell_size * 0.6)
+        thresh = (_cell_size * ACTIVATE_DISTANCE_CELLS)
     except Exception:
         thresh = 1.8
     dx = px - ex
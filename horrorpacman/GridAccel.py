@@ -0,0 +1,369 @@
+from array import array
+try:
+    import numpy as np
+except Exception:
+    np = None
+try:
+    from numba import njit
+except Exception:
+    njit = None
+
+NUMBA_AVAILABLE = njit is not None and np is not None
+
+
+def _bfs_kernel(mask, rows, cols, src, dist, queue):
+    n = rows * cols
+    for i in range(n):
+        dist[i] = -1
+    if src < 0 or src >= n or mask[src] == 0:
+        return 0
+    dist[src] = 0
+    head = 0
+    tail = 1
+    queue[0] = src
+    while head < tail:
+        idx = queue[head]
+        head += 1
+        r = idx // cols
+        c = idx - r * cols
+        d = dist[idx] + 1
+        if r + 1 < rows and mask[idx + cols] != 0 and dist[idx + cols] < 0:
+            dist[idx + cols] = d
+            queue[tail] = idx + cols
+            tail += 1
+        if r > 0 and mask[idx - cols] != 0 and dist[idx - cols] < 0:
+            dist[idx - cols] = d
+            queue[tail] = idx - cols
+            tail += 1
+        if c + 1 < cols and mask[idx + 1] != 0 and dist[idx + 1] < 0:
+            dist[idx + 1] = d
+            queue[tail] = idx + 1
+            tail += 1
+        if c > 0 and mask[idx - 1] != 0 and dist[idx - 1] < 0:
+            dist[idx - 1] = d
+            queue[tail] = idx - 1
+            tail += 1
+    return tail
+
+
+def _astar_kernel(mask, rows, cols, start, goal, max_iter, g, came, closed, heap_f, heap_n):
+    n = rows * cols
+    for i in range(n):
+        g[i] = -1
+        came[i] = -1
+        closed[i] = 0
+    gr = goal // cols
+    gc = goal - gr * cols
+    g[start] = 0
+    sr = start // cols
+    heap_f[0] = abs(sr - gr) + abs(start - sr * cols - gc)
+    heap_n[0] = start
+    size = 1
+    it = 0
+    while size > 0 and it < max_iter:
+        cur = heap_n[0]
+        size -= 1
+        if size > 0:
+            lf = heap_f[size]
+            ln = heap_n[size]
+            i = 0
+            while True:
+                child = 2 * i + 1
+                if child >= size:
+                    break
+                if child + 1 < size and heap_f[child + 1] < heap_f[child]:
+                    child += 1
+                if heap_f[child] >= lf:
+                    break
+                heap_f[i] = heap_f[child]
+                heap_n[i] = heap_n[child]
+                i = child
+            heap_f[i] = lf
+            heap_n[i] = ln
+        if closed[cur] != 0:
+            continue
+        it += 1
+        if cur == goal:
+            return 1
+        closed[cur] = 1
+        r = cur // cols
+        c = cur - r * cols
+        for k in range(4):
+            if k == 0:
+                if r + 1 >= rows:
+                    continue
+                nb = cur + cols
+            elif k == 1:
+                if r == 0:
+                    continue
+                nb = cur - cols
+            elif k == 2:
+                if c + 1 >= cols:
+                    continue
+                nb = cur + 1
+            else:
+                if c == 0:
+                    continue
+                nb = cur - 1
+            if mask[nb] == 0 or closed[nb] != 0:
+                continue
+            tentative = g[cur] + 1
+            if g[nb] < 0 or tentative < g[nb]:
+                g[nb] = tentative
+                came[nb] = cur
+                nr = nb // cols
+                f = tentative + abs(nr - gr) + abs(nb - nr * cols - gc)
+                i = size
+                size += 1
+                while i > 0:
+                    parent = (i - 1) // 2
+                    if heap_f[parent] <= f:
+                        break
+                    heap_f[i] = heap_f[parent]
+                    heap_n[i] = heap_n[parent]
+                    i = parent
+                heap_f[i] = f
+                heap_n[i] = nb
+    return 0
+
+
+def _flood_kernel(mask, rows, cols, seed, label, labels, stack):
+    if mask[seed] == 0 or labels[seed] != 0:
+        return 0
+    labels[seed] = label
+    stack[0] = seed
+    top = 1
+    count = 1
+    while top > 0:
+        top -= 1
+        idx = stack[top]
+        r = idx // cols
+        c = idx - r * cols
+        for k in range(4):
+            if k == 0:
+                if r + 1 >= rows:
+                    continue
+                nb = idx + cols
+            elif k == 1:
+                if r == 0:
+                    continue
+                nb = idx - cols
+            elif k == 2:
+                if c + 1 >= cols:
+                    continue
+                nb = idx + 1
+            else:
+                if c == 0:
+                    continue
+                nb = idx - 1
+            if mask[nb] != 0 and labels[nb] == 0:
+                labels[nb] = label
+                stack[top] = nb
+                top += 1
+                count += 1
+    return count
+
+
+def _make_label_kernel(flood):
+    def _label_kernel(mask, rows, cols, labels, stack):
+        for i in range(rows * cols):
+            labels[i] = 0
+        label = 0
+        for seed in range(rows * cols):
+            if mask[seed] != 0 and labels[seed] == 0:
+                label += 1
+                flood(mask, rows, cols, seed, label, labels, stack)
+        return label
+    return _label_kernel
+
+
+def _los_kernel(mask, rows, cols, r0, c0, r1, c1):
+    dr = abs(r1 - r0)
+    dc = abs(c1 - c0)
+    sr = 1 if r0 < r1 else -1
+    sc = 1 if c0 < c1 else -1
+    err = dr - dc
+    r = r0
+    c = c0
+    while True:
+        if not (r == r0 and c == c0) and not (r == r1 and c == c1):
+            if r < 0 or c < 0 or r >= rows or c >= cols or mask[r * cols + c] == 0:
+                return False
+        if r == r1 and c == c1:
+            break
+        e2 = 2 * err
+        if e2 > -dc:
+            err -= dc
+            r += sr
+        if e2 < dr:
+            err += dr
+            c += sc
+    return True
+
+
+def _make_los_row_kernel(los):
+    def _los_row_kernel(mask, rows, cols, r0, c0, out):
+        for r in range(rows):
+            for c in range(cols):
+                out[r * cols + c] = 1 if los(mask, rows, cols, r0, c0, r, c) else 0
+    return _los_row_kernel
+
+
+_label_kernel = _make_label_kernel(_flood_kernel)
+_los_row_kernel = _make_los_row_kernel(_los_kernel)
+
+
+if NUMBA_AVAILABLE:
+    bfs_kernel = njit(cache=True)(_bfs_kernel)
+    astar_kernel = njit(cache=True)(_astar_kernel)
+    flood_kernel = njit(cache=True)(_flood_kernel)
+    los_kernel = njit(cache=True)(_los_kernel)
+    label_kernel = njit(_make_label_kernel(flood_kernel))
+    los_row_kernel = njit(_make_los_row_kernel(los_kernel))
+else:
+    bfs_kernel = _bfs_kernel
+    astar_kernel = _astar_kernel
+    flood_kernel = _flood_kernel
+    los_kernel = _los_kernel
+    label_kernel = _label_kernel
+    los_row_kernel = _los_row_kernel
+
+
+class GridKernels:
+    def __init__(self, mask, rows, cols, use_numba=None):
+        self.rows = rows
+        self.cols = cols
+        self.use_numba = NUMBA_AVAILABLE if use_numba is None else (use_numba and NUMBA_AVAILABLE)
+        n = rows * cols
+        if self.use_numba:
+            self.mask = np.frombuffer(bytes(mask), dtype=np.uint8).copy()
+            self._ints = lambda size: np.zeros(size, dtype=np.int32)
+            self._bfs, self._astar, self._label, self._los, self._los_row = bfs_kernel, astar_kernel, label_kernel, los_kernel, los_row_kernel
+        else:
+            self.mask = bytearray(mask)
+            self._ints = lambda size: array('i', [0]) * size
+            self._bfs, self._astar, self._label, self._los, self._los_row = _bfs_kernel, _astar_kernel, _label_kernel, _los_kernel, _los_row_kernel
+        self._dist = self._ints(n)
+        self._queue = self._ints(max(n, 1))
+        self._g = self._ints(n)
+        self._came = self._ints(n)
+        self._closed = self._ints(n)
+        self._heap_f = self._ints(4 * n + 1)
+        self._heap_n = self._ints(4 * n + 1)
+
+    def new_int_buffer(self):
+        return self._ints(self.rows * self.cols)
+
+    def bfs_distances(self, src_rc, out=None):
+        dist = out if out is not None else self._dist
+        self._bfs(self.mask, self.rows, self.cols, src_rc[0] * self.cols + src_rc[1], dist, self._queue)
+        return dist
+
+    def astar(self, start_rc, goal_rc, max_iter=5000):
+        if start_rc == goal_rc:
+            return [start_rc]
+        cols = self.cols
+        start = start_rc[0] * cols + start_rc[1]
+        goal = goal_rc[0] * cols + goal_rc[1]
+        if not self._astar(self.mask, self.rows, cols, start, goal, max_iter,
+                           self._g, self._came, self._closed, self._heap_f, self._heap_n):
+            return []
+        path = []
+        idx = goal
+        while idx != -1:
+            path.append(divmod(int(idx), cols))
+            if idx == start:
+                break
+            idx = self._came[idx]
+        path.reverse()
+        return path
+
+    def flood_labels(self):
+        labels = self._ints(self.rows * self.cols)
+        count = self._label(self.mask, self.rows, self.cols, labels, self._queue)
+        return labels, int(count)
+
+    def los(self, a, b):
+        return bool(self._los(self.mask, self.rows, self.cols, a[0], a[1], b[0], b[1]))
+
+    def los_from(self, src_rc, out=None):
+        out = out if out is not None else self._dist
+        self._los_row(self.mask, self.rows, self.cols, src_rc[0], src_rc[1], out)
+        return out
+
+
+def generate_maze(rows, cols, seed=1, loop_chance=0.1):
+    import random
+    rng = random.Random(seed)
+    mask = bytearray(rows * cols)
+    stack = [(1, 1)]
+    mask[cols + 1] = 1
+    while stack:
+        r, c = stack[-1]
+        options = []
+        for dr, dc in ((2, 0), (-2, 0), (0, 2), (0, -2)):
+            nr, nc = r + dr, c + dc
+            if 0 < nr < rows - 1 and 0 < nc < cols - 1 and not mask[nr * cols + nc]:
+                options.append((nr, nc, dr, dc))
+        if not options:
+            stack.pop()
+            continue
+        nr, nc, dr, dc = rng.choice(options)
+        mask[(r + dr // 2) * cols + (c + dc // 2)] = 1
+        mask[nr * cols + nc] = 1
+        stack.append((nr, nc))
+    for r in range(1, rows - 1):
+        for c in range(1, cols - 1):
+            if not mask[r * cols + c] and rng.random() < loop_chance:
+                mask[r * cols + c] = 1
+    return mask
+
+
+def _bench(size, repeats=5):
+    import time
+    rows = cols = size
+    mask = generate_maze(rows, cols)
+    cells = [i for i in range(rows * cols) if mask[i]]
+    a = divmod(cells[0], cols)
+    b = divmod(cells[-1], cols)
+    results = {}
+    for name, flag in (('python', False), ('numba', True)):
+        if flag and not NUMBA_AVAILABLE:
+            continue
+        k = GridKernels(mask, rows, cols, use_numba=flag)
+        k.astar(a, b, max_iter=rows * cols)
+        k.bfs_distances(a)
+        k.flood_labels()
+        k.los_from(a)
+        timings = {}
+        t0 = time.perf_counter()
+        for _ in range(repeats):
+            k.bfs_distances(a)
+        timings['bfs'] = (time.perf_counter() - t0) / repeats
+        t0 = time.perf_counter()
+        for _ in range(repeats):
+            k.astar(a, b, max_iter=rows * cols)
+        timings['astar'] = (time.perf_counter() - t0) / repeats
+        t0 = time.perf_counter()
+        for _ in range(repeats):
+            k.flood_labels()
+        timings['flood'] = (time.perf_counter() - t0) / repeats
+        t0 = time.perf_counter()
+        for _ in range(repeats):
+            k.los_from(a)
+        timings['los'] = (time.perf_counter() - t0) / repeats
+        results[name] = timings
+    return results
+
+
+if __name__ == '__main__':
+    print('[GridAccel] numba available:', NUMBA_AVAILABLE)
+    for size in (129, 257, 513):
+        res = _bench(size)
+        for kernel in ('bfs', 'astar', 'flood', 'los'):
+            py = res['python'][kernel]
+            line = '[GridAccel] %dx%d %-6s python %9.3f ms' % (size, size, kernel, py * 1000.0)
+            if 'numba' in res:
+                nb = res['numba'][kernel]
+                line += '  numba %9.3f ms  x%.1f' % (nb * 1000.0, py / max(nb, 1e-12))
+            print(line)
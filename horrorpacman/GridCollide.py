@@ -0,0 +1,392 @@
+import math
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+
+class TileGrid:
+    def __init__(self, mask, rows, cols, origin_x, origin_z, cell_size):
+        # origin is the centre of grid cell (rows - 1, 0); rows grow towards -z
+        self.mask = mask
+        self.rows = rows
+        self.cols = cols
+        self.origin_x = origin_x
+        self.origin_z = origin_z
+        self.cell_size = cell_size
+        self.inv_cell = 1.0 / cell_size
+        self.out_x = 0.0
+        self.out_z = 0.0
+        self.toi = 2.0
+        self.normal_x = 0.0
+        self.normal_z = 0.0
+
+    def _to_uv(self, x, z):
+        return (x - self.origin_x) * self.inv_cell + 0.5, (z - self.origin_z) * self.inv_cell + 0.5
+
+    def is_wall_uv(self, iu, iv):
+        if iu < 0 or iv < 0 or iu >= self.cols or iv >= self.rows:
+            return True
+        return not self.mask[(self.rows - 1 - iv) * self.cols + iu]
+
+    def is_wall_at(self, x, z):
+        u, v = self._to_uv(x, z)
+        return self.is_wall_uv(int(math.floor(u)), int(math.floor(v)))
+
+    def raycast(self, x, z, dx, dz, max_dist):
+        # Amanatides-Woo DDA; returns distance to the first wall tile, or max_dist
+        length = math.hypot(dx, dz)
+        if length < 1e-12 or max_dist <= 0.0:
+            return 0.0 if self.is_wall_at(x, z) else max_dist
+        dx /= length
+        dz /= length
+        u, v = self._to_uv(x, z)
+        iu = int(math.floor(u))
+        iv = int(math.floor(v))
+        if self.is_wall_uv(iu, iv):
+            return 0.0
+        du = dx * self.inv_cell
+        dv = dz * self.inv_cell
+        step_u = 1 if du > 0 else -1
+        step_v = 1 if dv > 0 else -1
+        t_delta_u = abs(1.0 / du) if du != 0 else math.inf
+        t_delta_v = abs(1.0 / dv) if dv != 0 else math.inf
+        t_max_u = ((iu + 1 - u) if du > 0 else (u - iu)) * t_delta_u if du != 0 else math.inf
+        t_max_v = ((iv + 1 - v) if dv > 0 else (v - iv)) * t_delta_v if dv != 0 else math.inf
+        while True:
+            if t_max_u < t_max_v:
+                t = t_max_u
+                iu += step_u
+                t_max_u += t_delta_u
+            else:
+                t = t_max_v
+                iv += step_v
+                t_max_v += t_delta_v
+            if t >= max_dist:
+                return max_dist
+            if self.is_wall_uv(iu, iv):
+                return t
+
+    def clamp_travel(self, x, z, dx, dz, length, margin=0.0):
+        if length <= 0.0:
+            return 0.0
+        if self.is_wall_at(x, z):
+            # already clipped into a wall: let the jump carry us back out
+            return length
+        free = self.raycast(x, z, dx, dz, length + margin) - margin
+        return max(0.0, min(length, free))
+
+    def clamp_move(self, x, z, dx, dz, margin=0.0):
+        # per axis, stop margin short of a wall tile like the ray model; never pushes out
+        for ax, az in ((dx, 0.0), (0.0, dz)):
+            length = abs(ax) + abs(az)
+            if length > 1e-9:
+                t = self.clamp_travel(x, z, ax / length, az / length, length, margin)
+                x += ax / length * t
+                z += az / length * t
+        return x, z
+
+    def _tile_bounds(self, iu, iv):
+        min_x = self.origin_x + (iu - 0.5) * self.cell_size
+        min_z = self.origin_z + (iv - 0.5) * self.cell_size
+        return min_x, min_x + self.cell_size, min_z, min_z + self.cell_size
+
+    def _depenetrate(self, x, z, radius):
+        u0 = int(math.floor((x - radius - self.origin_x) * self.inv_cell + 0.5))
+        u1 = int(math.floor((x + radius - self.origin_x) * self.inv_cell + 0.5))
+        v0 = int(math.floor((z - radius - self.origin_z) * self.inv_cell + 0.5))
+        v1 = int(math.floor((z + radius - self.origin_z) * self.inv_cell + 0.5))
+        for iv in range(v0, v1 + 1):
+            for iu in range(u0, u1 + 1):
+                if not self.is_wall_uv(iu, iv):
+                    continue
+                min_x, max_x, min_z, max_z = self._tile_bounds(iu, iv)
+                qx = min(max(x, min_x), max_x)
+                qz = min(max(z, min_z), max_z)
+                ox = x - qx
+                oz = z - qz
+                d2 = ox * ox + oz * oz
+                if d2 >= radius * radius:
+                    continue
+                if d2 > 1e-12:
+                    d = math.sqrt(d2)
+                    push = (radius - d) / d
+                    x += ox * push
+                    z += oz * push
+                else:
+                    # centre inside the tile: leave through the nearest face
+                    left = x - min_x
+                    right = max_x - x
+                    down = z - min_z
+                    up = max_z - z
+                    m = min(left, right, down, up)
+                    if m == left:
+                        x = min_x - radius
+                    elif m == right:
+                        x = max_x + radius
+                    elif m == down:
+                        z = min_z - radius
+                    else:
+                        z = max_z + radius
+        self.out_x = x
+        self.out_z = z
+
+    def _sweep(self, x, z, dx, dz, radius):
+        # earliest time of impact in [0, 1] of the moving circle against any wall tile
+        self.toi = 2.0
+        self.normal_x = 0.0
+        self.normal_z = 0.0
+        u0 = int(math.floor((min(x, x + dx) - radius - self.origin_x) * self.inv_cell + 0.5))
+        u1 = int(math.floor((max(x, x + dx) + radius - self.origin_x) * self.inv_cell + 0.5))
+        v0 = int(math.floor((min(z, z + dz) - radius - self.origin_z) * self.inv_cell + 0.5))
+        v1 = int(math.floor((max(z, z + dz) + radius - self.origin_z) * self.inv_cell + 0.5))
+        for iv in range(v0, v1 + 1):
+            for iu in range(u0, u1 + 1):
+                if self.is_wall_uv(iu, iv):
+                    self._sweep_tile(x, z, dx, dz, radius, iu, iv)
+
+    def _sweep_tile(self, x, z, dx, dz, radius, iu, iv):
+        min_x, max_x, min_z, max_z = self._tile_bounds(iu, iv)
+        inf = math.inf
+        if abs(dx) < 1e-12:
+            if x < min_x - radius or x > max_x + radius:
+                return
+            tx0, tx1 = -inf, inf
+        else:
+            tx0 = (min_x - radius - x) / dx
+            tx1 = (max_x + radius - x) / dx
+            if tx0 > tx1:
+                tx0, tx1 = tx1, tx0
+        if abs(dz) < 1e-12:
+            if z < min_z - radius or z > max_z + radius:
+                return
+            tz0, tz1 = -inf, inf
+        else:
+            tz0 = (min_z - radius - z) / dz
+            tz1 = (max_z + radius - z) / dz
+            if tz0 > tz1:
+                tz0, tz1 = tz1, tz0
+        t_enter = max(tx0, tz0)
+        t_exit = min(tx1, tz1)
+        if t_enter > t_exit or t_exit < 0.0 or t_enter > 1.0 or t_enter >= self.toi:
+            return
+        hx = x + dx * max(t_enter, 0.0)
+        hz = z + dz * max(t_enter, 0.0)
+        if min_x <= hx <= max_x or min_z <= hz <= max_z:
+            if tx0 >= tz0:
+                nx, nz = (-1.0 if dx > 0 else 1.0), 0.0
+            else:
+                nx, nz = 0.0, (-1.0 if dz > 0 else 1.0)
+            if t_enter < 0.0:
+                if dx * nx + dz * nz >= 0.0:
+                    return
+                t_enter = 0.0
+            self.toi = t_enter
+            self.normal_x = nx
+            self.normal_z = nz
+            return
+        cx = min_x if hx < min_x else max_x
+        cz = min_z if hz < min_z else max_z
+        px = x - cx
+        pz = z - cz
+        a = dx * dx + dz * dz
+        b = 2.0 * (px * dx + pz * dz)
+        c = px * px + pz * pz - radius * radius
+        if c <= 0.0:
+            if b >= 0.0:
+                return
+            t = 0.0
+        else:
+            disc = b * b - 4.0 * a * c
+            if disc < 0.0 or a < 1e-24:
+                return
+            t = (-b - math.sqrt(disc)) / (2.0 * a)
+            if t < 0.0 or t > 1.0:
+                return
+        if t >= self.toi:
+            return
+        nx = px + dx * t
+        nz = pz + dz * t
+        n = math.hypot(nx, nz)
+        if n < 1e-12:
+            return
+        self.toi = t
+        self.normal_x = nx / n
+        self.normal_z = nz / n
+
+    def move_circle(self, x, z, dx, dz, radius, max_slides=3, skin=1e-3):
+        # result is left in out_x / out_z; returns True when a wall was touched
+        self._depenetrate(x, z, radius)
+        x = self.out_x
+        z = self.out_z
+        hit = False
+        for _ in range(max_slides):
+            length = math.hypot(dx, dz)
+            if length < 1e-9:
+                break
+            self._sweep(x, z, dx, dz, radius)
+            if self.toi > 1.0:
+                x += dx
+                z += dz
+                dx = dz = 0.0
+                break
+            hit = True
+            t = max(0.0, self.toi - skin / length)
+            x += dx * t
+            z += dz * t
+            dx *= (1.0 - t)
+            dz *= (1.0 - t)
+            into = dx * self.normal_x + dz * self.normal_z
+            if into < 0.0:
+                dx -= into * self.normal_x
+                dz -= into * self.normal_z
+        self.out_x = x
+        self.out_z = z
+        return hit
+
+
+class GridRaycaster:
+    def __init__(self, tiles):
+        if np is None:
+            raise RuntimeError('GridRaycaster requires NumPy')
+        self.tiles = tiles
+        rows, cols = tiles.rows, tiles.cols
+        walk = np.frombuffer(bytes(tiles.mask), dtype=np.uint8).reshape(rows, cols)
+        # indexed [iv, iu] like TileGrid.is_wall_uv
+        self.wall_uv = (walk[::-1, :] == 0).copy()
+
+    def cast(self, ox, oz, dx, dz, max_dist):
+        # one DDA pass for all rays; returns (hit distance or max_dist, flat hit cell or -1)
+        t = self.tiles
+        rows, cols = t.rows, t.cols
+        ox = np.asarray(ox, dtype=np.float64).ravel()
+        oz = np.asarray(oz, dtype=np.float64).ravel()
+        n = ox.shape[0]
+        dx = np.broadcast_to(np.asarray(dx, dtype=np.float64).ravel(), (n,)).copy()
+        dz = np.broadcast_to(np.asarray(dz, dtype=np.float64).ravel(), (n,)).copy()
+        max_dist = np.broadcast_to(np.asarray(max_dist, dtype=np.float64).ravel(), (n,))
+        length = np.hypot(dx, dz)
+        ok = length > 1e-12
+        dx[ok] /= length[ok]
+        dz[ok] /= length[ok]
+
+        u = (ox - t.origin_x) * t.inv_cell + 0.5
+        v = (oz - t.origin_z) * t.inv_cell + 0.5
+        iu = np.floor(u).astype(np.int64)
+        iv = np.floor(v).astype(np.int64)
+        du = dx * t.inv_cell
+        dv = dz * t.inv_cell
+        step_u = np.where(du > 0, 1, -1)
+        step_v = np.where(dv > 0, 1, -1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_delta_u = np.where(du != 0, np.abs(1.0 / du), np.inf)
+            t_delta_v = np.where(dv != 0, np.abs(1.0 / dv), np.inf)
+            t_max_u = np.where(du != 0, np.where(du > 0, iu + 1 - u, u - iu) * t_delta_u, np.inf)
+            t_max_v = np.where(dv != 0, np.where(dv > 0, iv + 1 - v, v - iv) * t_delta_v, np.inf)
+
+        dist = max_dist.copy()
+        cell = np.full(n, -1, dtype=np.int64)
+        wall = self._wall(iu, iv, rows, cols)
+        inside = (iu >= 0) & (iv >= 0) & (iu < cols) & (iv < rows)
+        dist[wall] = 0.0
+        cell[wall & inside] = ((rows - 1 - iv) * cols + iu)[wall & inside]
+        act = np.nonzero(~wall & ok & (max_dist > 0))[0]
+        while act.size:
+            take_u = t_max_u[act] < t_max_v[act]
+            tt = np.where(take_u, t_max_u[act], t_max_v[act])
+            au = iu[act] + np.where(take_u, step_u[act], 0)
+            av = iv[act] + np.where(take_u, 0, step_v[act])
+            iu[act] = au
+            iv[act] = av
+            t_max_u[act] += np.where(take_u, t_delta_u[act], 0.0)
+            t_max_v[act] += np.where(take_u, 0.0, t_delta_v[act])
+            beyond = tt >= max_dist[act]
+            hit = ~beyond & self._wall(au, av, rows, cols)
+            if hit.any():
+                h = act[hit]
+                dist[h] = tt[hit]
+                hu = au[hit]
+                hv = av[hit]
+                valid = (hu >= 0) & (hv >= 0) & (hu < cols) & (hv < rows)
+                cell[h[valid]] = (rows - 1 - hv[valid]) * cols + hu[valid]
+            act = act[~(beyond | hit)]
+        return dist, cell
+
+    def _wall(self, iu, iv, rows, cols):
+        inside = (iu >= 0) & (iv >= 0) & (iu < cols) & (iv < rows)
+        wall = ~inside
+        wall[inside] = self.wall_uv[iv[inside], iu[inside]]
+        return wall
+
+
+SDF_RESOLUTION = 0.1
+SDF_WINDOW_CELLS = 2
+
+
+class WallSDF:
+    def __init__(self, tiles, resolution=SDF_RESOLUTION, window=SDF_WINDOW_CELLS):
+        if np is None:
+            raise RuntimeError('WallSDF requires NumPy')
+        self.tiles = tiles
+        self.resolution = resolution
+        self.inv_res = 1.0 / resolution
+        cs = tiles.cell_size
+        rows, cols = tiles.rows, tiles.cols
+        self.x0 = tiles.origin_x - 0.5 * cs
+        self.z0 = tiles.origin_z - 0.5 * cs
+        self.nx = int(math.ceil(cols * cs * self.inv_res)) + 1
+        self.nz = int(math.ceil(rows * cs * self.inv_res)) + 1
+        # distances are exact up to window cells away and clamped beyond that
+        self.max_dist = window * cs
+        xs = self.x0 + np.arange(self.nx) * resolution
+        zs = self.z0 + np.arange(self.nz) * resolution
+        cu = np.clip(np.floor((xs - self.x0) / cs).astype(np.int64), 0, cols - 1)
+        cv = np.clip(np.floor((zs - self.z0) / cs).astype(np.int64), 0, rows - 1)
+        walk = np.frombuffer(bytes(tiles.mask), dtype=np.uint8).reshape(rows, cols)
+        wall_uv = np.ones((rows + 2 * window, cols + 2 * window), dtype=bool)
+        wall_uv[window:window + rows, window:window + cols] = walk[::-1, :] == 0
+        to_wall = np.full((self.nz, self.nx), self.max_dist * self.max_dist, dtype=np.float32)
+        to_free = np.full((self.nz, self.nx), self.max_dist * self.max_dist, dtype=np.float32)
+        half = 0.5 * cs
+        for ov in range(-window, window + 1):
+            v = cv + ov
+            gz = np.maximum(0.0, np.abs(zs - (self.z0 + (v + 0.5) * cs)) - half) ** 2
+            for ou in range(-window, window + 1):
+                u = cu + ou
+                gx = np.maximum(0.0, np.abs(xs - (self.x0 + (u + 0.5) * cs)) - half) ** 2
+                d2 = (gz[:, None] + gx[None, :]).astype(np.float32)
+                is_wall = wall_uv[(v + window)[:, None], (u + window)[None, :]]
+                np.minimum(to_wall, np.where(is_wall, d2, np.inf), out=to_wall)
+                np.minimum(to_free, np.where(is_wall, np.inf, d2), out=to_free)
+        inside = wall_uv[(cv + window)[:, None], (cu + window)[None, :]]
+        self.field = np.where(inside, -np.sqrt(to_free), np.sqrt(to_wall)).astype(np.float32)
+
+    def sample(self, x, z):
+        fx = (x - self.x0) * self.inv_res
+        fz = (z - self.z0) * self.inv_res
+        if fx < 0.0 or fz < 0.0 or fx >= self.nx - 1 or fz >= self.nz - 1:
+            return -self.max_dist
+        i = int(fx)
+        j = int(fz)
+        tx = fx - i
+        tz = fz - j
+        f = self.field
+        a = f[j, i] + (f[j, i + 1] - f[j, i]) * tx
+        b = f[j + 1, i] + (f[j + 1, i + 1] - f[j + 1, i]) * tx
+        return float(a + (b - a) * tz)
+
+    def sphere_trace(self, x, z, dx, dz, max_dist, radius, min_step=None):
+        # distance along the ray at which a circle of the given radius first touches a wall
+        length = math.hypot(dx, dz)
+        if length < 1e-12:
+            return max_dist
+        dx /= length
+        dz /= length
+        min_step = min_step if min_step is not None else 0.5 * self.resolution
+        t = 0.0
+        while t < max_dist:
+            d = self.sample(x + dx * t, z + dz * t) - radius
+            if d <= 0.0:
+                return t
+            t += max(d, min_step)
+        return max_dist
@@ -0,0 +1,144 @@
+from array import array
+
+WALKABLE_EMOJIS = {'🟦','🟨','🟪'}
+NO_CELL = -1
+
+_DIRS4 = ((1,0),(-1,0),(0,1),(0,-1))
+
+
+def build_walkable_mask(grid, rows, cols, walkable_emojis=WALKABLE_EMOJIS):
+    mask = bytearray(rows * cols)
+    for r in range(rows):
+        row = grid[r]
+        base = r * cols
+        for c in range(min(len(row), cols)):
+            if row[c] in walkable_emojis:
+                mask[base + c] = 1
+    return mask
+
+
+def _multi_source_bfs(rows, cols, sources, neighbors, keep_source=True):
+    # each reached cell stores the source it grew from, or with keep_source=False
+    # the cell it was reached from (one step back toward the sources)
+    table = array('i', [NO_CELL]) * (rows * cols)
+    frontier = []
+    for idx in sources:
+        if table[idx] == NO_CELL:
+            table[idx] = idx
+            frontier.append(idx)
+    while frontier:
+        next_frontier = []
+        for idx in frontier:
+            label = table[idx] if keep_source else idx
+            for nidx in neighbors(idx):
+                if table[nidx] == NO_CELL:
+                    table[nidx] = label
+                    next_frontier.append(nidx)
+        frontier = next_frontier
+    return table
+
+
+def _grid_neighbors(rows, cols, idx):
+    r, c = divmod(idx, cols)
+    out = []
+    for dr, dc in _DIRS4:
+        nr, nc = r + dr, c + dc
+        if 0 <= nr < rows and 0 <= nc < cols:
+            out.append(nr * cols + nc)
+    return out
+
+
+def build_nearest_walkable_table(mask, rows, cols):
+    # floods through walls too, so every cell maps to its closest walkable cell
+    sources = [idx for idx in range(rows * cols) if mask[idx]]
+    return _multi_source_bfs(rows, cols, sources, lambda idx: _grid_neighbors(rows, cols, idx))
+
+
+def walkable_neighbors(mask, rows, cols, idx):
+    r, c = divmod(idx, cols)
+    out = []
+    for dr, dc in _DIRS4:
+        nr, nc = r + dr, c + dc
+        if 0 <= nr < rows and 0 <= nc < cols and mask[nr * cols + nc]:
+            out.append(nr * cols + nc)
+    return out
+
+
+def find_junctions(mask, rows, cols):
+    junctions = []
+    for idx in range(rows * cols):
+        if mask[idx] and len(walkable_neighbors(mask, rows, cols, idx)) != 2:
+            junctions.append(idx)
+    return junctions
+
+
+def _bfs_path_to_any(mask, rows, cols, start, targets):
+    came = {start: None}
+    frontier = [start]
+    while frontier:
+        next_frontier = []
+        for idx in frontier:
+            if idx in targets:
+                path = []
+                while idx is not None:
+                    path.append(idx)
+                    idx = came[idx]
+                path.reverse()
+                return path
+            for nidx in walkable_neighbors(mask, rows, cols, idx):
+                if nidx not in came:
+                    came[nidx] = idx
+                    next_frontier.append(nidx)
+        frontier = next_frontier
+    return []
+
+
+def _flood_component(mask, rows, cols, seed, seen):
+    seen[seed] = 1
+    component = [seed]
+    stack = [seed]
+    while stack:
+        idx = stack.pop()
+        for nidx in walkable_neighbors(mask, rows, cols, idx):
+            if not seen[nidx]:
+                seen[nidx] = 1
+                component.append(nidx)
+                stack.append(nidx)
+    return component
+
+
+def build_patrol_tours(mask, rows, cols):
+    tours = []
+    seen = bytearray(rows * cols)
+    junctions = set(find_junctions(mask, rows, cols))
+    for seed in range(rows * cols):
+        if not mask[seed] or seen[seed]:
+            continue
+        component = _flood_component(mask, rows, cols, seed, seen)
+        pending = set(idx for idx in component if idx in junctions) or set(component)
+        start = min(pending)
+        pending.discard(start)
+        tour = [start]
+        current = start
+        while pending:
+            leg = _bfs_path_to_any(mask, rows, cols, current, pending)
+            if not leg:
+                break
+            tour.extend(leg[1:])
+            current = leg[-1]
+            for cell in leg:
+                pending.discard(cell)
+        if current != start:
+            back = _bfs_path_to_any(mask, rows, cols, current, {start})
+            tour.extend(back[1:-1])
+        tours.append(tour)
+    return tours
+
+
+def build_toward_table(mask, rows, cols, sources):
+    return _multi_source_bfs(rows, cols, sources, lambda idx: walkable_neighbors(mask, rows, cols, idx),
+                             keep_source=False)
+
+
+def build_source_table(mask, rows, cols, sources):
+    return _multi_source_bfs(rows, cols, sources, lambda idx: walkable_neighbors(mask, rows, cols, idx))
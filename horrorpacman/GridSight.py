@@ -0,0 +1,251 @@
+import os
+import math
+import hashlib
+import pickle
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+CACHE_VERSION = 1
+BUILD_CHUNK = 32
+
+# (dc per col, dc per depth, dr per col, dr per depth) for each octant
+_OCTANTS = (
+    (1, 0, 0, 1),
+    (0, 1, 1, 0),
+    (0, -1, 1, 0),
+    (-1, 0, 0, 1),
+    (-1, 0, 0, -1),
+    (0, -1, -1, 0),
+    (0, 1, -1, 0),
+    (1, 0, 0, -1),
+)
+
+
+def los_clear(mask, rows, cols, a, b):
+    (r0, c0) = a
+    (r1, c1) = b
+    dr = abs(r1 - r0)
+    dc = abs(c1 - c0)
+    sr = 1 if r0 < r1 else -1
+    sc = 1 if c0 < c1 else -1
+    err = dr - dc
+    r, c = r0, c0
+    while True:
+        if (r, c) != a and (r, c) != b:
+            if r < 0 or c < 0 or r >= rows or c >= cols or not mask[r * cols + c]:
+                return False
+        if r == r1 and c == c1:
+            break
+        e2 = 2 * err
+        if e2 > -dc:
+            err -= dc
+            r += sr
+        if e2 < dr:
+            err += dr
+            c += sc
+    return True
+
+
+def _source_bits(mask, rows, cols, src, radius):
+    r0, c0 = divmod(src, cols)
+    bits = 0
+    if radius is None:
+        for tr in range(rows):
+            for tc in range(cols):
+                if los_clear(mask, rows, cols, (r0, c0), (tr, tc)):
+                    bits |= 1 << (tr * cols + tc)
+        return bits
+    span = 2 * radius + 1
+    rad_sq = radius * radius
+    for dr in range(-radius, radius + 1):
+        tr = r0 + dr
+        if tr < 0 or tr >= rows:
+            continue
+        for dc in range(-radius, radius + 1):
+            tc = c0 + dc
+            if tc < 0 or tc >= cols or dr * dr + dc * dc > rad_sq:
+                continue
+            if los_clear(mask, rows, cols, (r0, c0), (tr, tc)):
+                bits |= 1 << ((dr + radius) * span + (dc + radius))
+    return bits
+
+
+def _build_chunk(args):
+    mask, rows, cols, radius, sources = args
+    return [(src, _source_bits(mask, rows, cols, src, radius)) for src in sources]
+
+
+def _default_workers():
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        return 1
+    return os.cpu_count() or 1
+
+
+def build_visibility_bits(mask, rows, cols, radius=None, workers=None):
+    sources = [idx for idx in range(rows * cols) if mask[idx]]
+    chunks = [(bytes(mask), rows, cols, radius, sources[i:i + BUILD_CHUNK])
+              for i in range(0, len(sources), BUILD_CHUNK)]
+    if workers is None:
+        workers = _default_workers()
+    bits = {}
+    if workers > 1 and len(chunks) > 1:
+        ctx = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            for part in pool.map(_build_chunk, chunks):
+                bits.update(part)
+    else:
+        for chunk in chunks:
+            bits.update(_build_chunk(chunk))
+    return bits
+
+
+def _cache_path(mask, rows, cols, radius):
+    h = hashlib.sha1()
+    h.update(bytes(mask))
+    h.update(('%dx%d:r=%s:v%d' % (rows, cols, radius, CACHE_VERSION)).encode('ascii'))
+    return os.path.join(CACHE_DIR, 'sight_%s.pkl' % h.hexdigest())
+
+
+class VisibilityTable:
+    def __init__(self, rows, cols, bits, radius=None):
+        self.rows = rows
+        self.cols = cols
+        self.bits = bits
+        self.radius = radius
+        self.span = (2 * radius + 1) if radius is not None else 0
+
+    def covers(self, a):
+        return (a[0] * self.cols + a[1]) in self.bits
+
+    def visible(self, a, b):
+        bits = self.bits.get(a[0] * self.cols + a[1])
+        if bits is None:
+            return None
+        if self.radius is None:
+            return (bits >> (b[0] * self.cols + b[1])) & 1 == 1
+        dr = b[0] - a[0]
+        dc = b[1] - a[1]
+        if abs(dr) > self.radius or abs(dc) > self.radius:
+            return False
+        return (bits >> ((dr + self.radius) * self.span + (dc + self.radius))) & 1 == 1
+
+
+def _octant_of(dr, dc):
+    if abs(dr) >= abs(dc):
+        if dr > 0:
+            return 0 if dc >= 0 else 3
+        return 7 if dc >= 0 else 4
+    if dc > 0:
+        return 1 if dr >= 0 else 6
+    return 2 if dr >= 0 else 5
+
+
+class ShadowcastFOV:
+    def __init__(self, mask, rows, cols, radius=None):
+        self.mask = mask
+        self.rows = rows
+        self.cols = cols
+        self.radius = radius if radius is not None else max(rows, cols)
+        self._cache = {}
+
+    def _is_wall(self, r, c):
+        return r < 0 or c < 0 or r >= self.rows or c >= self.cols or not self.mask[r * self.cols + c]
+
+    def octant_cells(self, cell, octant):
+        key = (cell[0] * self.cols + cell[1], octant)
+        cells = self._cache.get(key)
+        if cells is None:
+            cells = self._cast_octant(cell, octant)
+            self._cache[key] = cells
+        return cells
+
+    def _cast_octant(self, cell, octant):
+        r0, c0 = cell
+        dc_col, dc_depth, dr_col, dr_depth = _OCTANTS[octant]
+        rad_sq = self.radius * self.radius
+        seen = set()
+
+        def scan(depth, start, end):
+            if depth > self.radius:
+                return
+            prev_wall = None
+            min_col = math.floor(depth * start + Fraction(1, 2))
+            max_col = math.ceil(depth * end - Fraction(1, 2))
+            for col in range(min_col, max_col + 1):
+                r = r0 + dr_col * col + dr_depth * depth
+                c = c0 + dc_col * col + dc_depth * depth
+                wall = self._is_wall(r, c)
+                if (wall or (depth * start <= col <= depth * end)) and depth * depth + col * col <= rad_sq:
+                    if 0 <= r < self.rows and 0 <= c < self.cols:
+                        seen.add(r * self.cols + c)
+                if prev_wall is True and not wall:
+                    start = Fraction(2 * col - 1, 2 * depth)
+                if prev_wall is False and wall:
+                    scan(depth + 1, start, Fraction(2 * col - 1, 2 * depth))
+                prev_wall = wall
+            if prev_wall is False:
+                scan(depth + 1, start, end)
+
+        if not self._is_wall(r0, c0):
+            scan(1, Fraction(0), Fraction(1))
+        return frozenset(seen)
+
+    def visible(self, a, b):
+        dr = b[0] - a[0]
+        dc = b[1] - a[1]
+        if dr == 0 and dc == 0:
+            return True
+        return (b[0] * self.cols + b[1]) in self.octant_cells(a, _octant_of(dr, dc))
+
+    def in_cone(self, a, b, facing_yaw, fov_degrees):
+        dr = b[0] - a[0]
+        dc = b[1] - a[1]
+        if dr == 0 and dc == 0:
+            return True
+        yaw = math.radians(facing_yaw)
+        # grid rows grow towards -z; yaw 0 faces +z
+        dot = dc * math.sin(yaw) - dr * math.cos(yaw)
+        if dot < math.cos(math.radians(fov_degrees * 0.5)) * math.hypot(dr, dc):
+            return False
+        return (b[0] * self.cols + b[1]) in self.octant_cells(a, _octant_of(dr, dc))
+
+
+def load_or_build_visibility(mask, rows, cols, radius=None, workers=None, use_cache=True):
+    if radius is not None and radius >= max(rows, cols):
+        radius = None
+    path = _cache_path(mask, rows, cols, radius)
+    if use_cache and os.path.exists(path):
+        try:
+            with open(path, 'rb') as f:
+                bits = pickle.load(f)
+            return VisibilityTable(rows, cols, bits, radius)
+        except Exception as e:
+            print('[GridSight] Cache read failed, rebuilding:', e)
+    bits = build_visibility_bits(mask, rows, cols, radius=radius, workers=workers)
+    if use_cache:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmp = path + '.tmp'
+            with open(tmp, 'wb') as f:
+                pickle.dump(bits, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except Exception as e:
+            print('[GridSight] Cache write failed:', e)
+    return VisibilityTable(rows, cols, bits, radius)
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+    from GridNav import WALKABLE_EMOJIS, build_walkable_mask
+    grid_path = sys.argv[1] if len(sys.argv) > 1 else os.path.normpath(os.path.join(os.path.dirname(__file__), '..', 'Map_Grid.txt'))
+    with open(grid_path, 'r', encoding='utf-8') as f:
+        grid = [list(ln.rstrip('\n')) for ln in f.readlines() if ln.strip()]
+    rows = len(grid)
+    cols = max((len(r) for r in grid), default=0)
+    mask = build_walkable_mask(grid, rows, cols, WALKABLE_EMOJIS)
+    t0 = time.time()
+    table = load_or_build_visibility(mask, rows, cols, workers=os.cpu_count() or 1)
+    print('[GridSight] %d sources ready in %.2fs, cache dir: %s' % (len(table.bits), time.time() - t0, CACHE_DIR))
@@ -0,0 +1,109 @@
+import math
+from array import array
+from collections import deque
+
+HEARING_DECAY = 0.85
+HEARING_THRESHOLD = 0.2
+NOISE_MAX_RADIUS = 24
+NOISE_SPRINT = 0.6
+NOISE_SPRINT_INTERVAL = 0.5
+NOISE_KEY_PICKUP = 1.0
+NOISE_UNLOCK = 1.0
+NOISE_QUEUE_LEN = 64
+NOISE_MAX_AGE = 1.0
+
+class NoiseQueue:
+    # recent noise events with a frame clock; the module functions below use a shared
+    # default queue, headless simulations keep their own
+    def __init__(self, maxlen=NOISE_QUEUE_LEN):
+        self.events = deque(maxlen=maxlen)
+        self.seq = 0
+        self.clock = 0.0
+
+    def advance(self, dt):
+        # driven once per frame by the game loop; events are stamped with this clock
+        self.clock += dt
+
+    def emit(self, x, z, loudness):
+        self.seq += 1
+        self.events.append((self.seq, x, z, loudness, self.clock))
+        return self.seq
+
+    def last_seq(self):
+        return self.seq
+
+    def events_since(self, seq, max_age=None):
+        oldest = self.clock - max_age if max_age is not None else None
+        return [e for e in self.events if e[0] > seq and (oldest is None or e[4] >= oldest)]
+
+
+default_queue = NoiseQueue()
+
+
+def advance(dt):
+    default_queue.advance(dt)
+
+
+def emit_noise(x, z, loudness):
+    return default_queue.emit(x, z, loudness)
+
+
+def last_seq():
+    return default_queue.last_seq()
+
+
+def events_since(seq, max_age=None):
+    return default_queue.events_since(seq, max_age)
+
+
+def noise_radius(loudness, threshold=HEARING_THRESHOLD, decay=HEARING_DECAY):
+    if loudness < threshold:
+        return -1
+    return min(NOISE_MAX_RADIUS, int(math.log(threshold / loudness) / math.log(decay)))
+
+
+class NoiseMap:
+    def __init__(self, mask, rows, cols):
+        self.mask = mask
+        self.rows = rows
+        self.cols = cols
+        n = rows * cols
+        self.dist = array('i', [-1]) * n
+        self.queue = array('i', [0]) * max(n, 1)
+        self.touched = 0
+
+    def propagate(self, src, radius):
+        dist = self.dist
+        queue = self.queue
+        for i in range(self.touched):
+            dist[queue[i]] = -1
+        self.touched = 0
+        if radius < 0 or not self.mask[src]:
+            return 0
+        rows, cols, mask = self.rows, self.cols, self.mask
+        dist[src] = 0
+        queue[0] = src
+        head = 0
+        tail = 1
+        while head < tail:
+            idx = queue[head]
+            head += 1
+            d = dist[idx]
+            if d >= radius:
+                continue
+            r, c = divmod(idx, cols)
+            for nr, nc in ((r + 1, c), (r - 1, c), (r, c + 1), (r, c - 1)):
+                if 0 <= nr < rows and 0 <= nc < cols:
+                    nidx = nr * cols + nc
+                    if mask[nidx] and dist[nidx] < 0:
+                        dist[nidx] = d + 1
+                        queue[tail] = nidx
+                        tail += 1
+        self.touched = tail
+        return tail
+
+    def level_at(self, idx, loudness, decay=HEARING_DECAY):
+        d = self.dist[idx]
+        if d < 0:
+            return 0.0
+        return loudness * (decay ** d)
@@ -1,8 +1,12 @@
 import math
 import time
 import os
-import viz
-import vizact
+try:
+    import viz
+    import vizact
+except Exception:
+    viz = None
+    vizact = None
 
 try:
     import KeyLoader as _KL
@@ -13,6 +17,12 @@ except Exception:
     get_last_spawned_keys = None
     _DEFAULT_CELL = 3.0
 
+try:
+    import Hearing as _Hearing
+except Exception:
+    _Hearing = None
+
+KEY_PICK_DISTANCE = 4.0
 
 _player = None
 _pick_distance = None
@@ -131,6 +141,12 @@ def _attempt_pick():
                 snd.play()
         except Exception:
             pass
+        try:
+            if _Hearing is not None and _player is not None:
+                px, py, pz = _player.getPosition()
+                _Hearing.emit_noise(px, pz, _Hearing.NOISE_KEY_PICKUP)
+        except Exception:
+            pass
         _flash_until = time.time() + 2.0
         _update_hud('Collected!')
         try:
@@ -295,7 +311,7 @@ def _update(dt=0):
         pass
 
 
-def init(player, pick_distance=4.0, angle_threshold=20.0, on_collect=None):
+def init(player, pick_distance=KEY_PICK_DISTANCE, angle_threshold=20.0, on_collect=None):
     global _player, _pick_distance, _angle_threshold
     _player = player
     _pick_distance = float(pick_distance)
@@ -1,8 +1,12 @@
 import os
 import random
 import math
-import viz
-import vizshape
+try:
+    import viz
+    import vizshape
+except Exception:
+    viz = None
+    vizshape = None
 
 CELL_EMOJI = '🟪' 
 DEFAULT_CELL_SIZE = 3.0
@@ -11,6 +15,7 @@ KEY_Y = 0.15
 KEY_RADIUS = 0.25
 
 _KEY_ASSETS = ['Key_Green.glb', 'Key_White.glb', 'Key_Yellow.glb']
+KEY_COLORS = ('green', 'white', 'yellow')
 
 def _center_glb_local_in_wrapper(raw, center_blend=0.6, desired_bottom=0.0):
     def _get_sphere_center(node):
@@ -148,6 +153,40 @@ def _read_grid(grid_path):
     grid = [list(line) for line in raw]
     return grid
 
+def key_candidate_cells(grid, spawn_chance=1.0):
+    # (row, col) of every purple cell, each kept with probability spawn_chance
+    cols = max((len(r) for r in grid), default=0)
+    cells = []
+    for r, row in enumerate(grid):
+        for c in range(cols):
+            ch = row[c] if c < len(row) else None
+            if ch != CELL_EMOJI:
+                continue
+            if spawn_chance < 1.0 and random.random() > spawn_chance:
+                continue
+            cells.append((r, c))
+    return cells
+
+def pick_spread_cells(cells, count):
+    # a random first cell, then repeatedly the cell farthest from everything picked so far
+    if count >= len(cells):
+        return list(cells)
+    chosen = [random.choice(cells)]
+    while len(chosen) < count:
+        best = None
+        best_min_sq = -1
+        for rc in cells:
+            if rc in chosen:
+                continue
+            min_sq = min((rc[0]-p[0])**2 + (rc[1]-p[1])**2 for p in chosen)
+            if min_sq > best_min_sq:
+                best_min_sq = min_sq
+                best = rc
+        if best is None:
+            break
+        chosen.append(best)
+    return chosen
+
 def spawn_keys_on_map(parent=None, map_root=None, attach_to_map=True, visualize=True,
                       grid_path=None, cell_size=DEFAULT_CELL_SIZE, spawn_chance=1.0,
                       num_keys=3, min_distance=None, key_offset=(0.0, 0.0, 0.0), center_blend=0.6):
@@ -185,59 +224,26 @@ def spawn_keys_on_map(parent=None, map_root=None, attach_to_map=True, visualize=
     else:
         group = parent if parent is not None else viz.addGroup()
 
-    eligible_positions = []
-    for r in range(rows):
-        row = grid[r]
-        for c in range(cols):
-            ch = row[c] if c < len(row) else None
-            if ch != CELL_EMOJI:
-                continue
-            if spawn_chance < 1.0 and random.random() > spawn_chance:
-                continue
-            grid_r = (rows - 1 - r)
-            if use_local:
-                lx = local_origin_x + (c * cell_size)
-                lz = local_origin_z + (grid_r * cell_size)
-                pos = [lx, KEY_Y, lz]
-            else:
-                wx = origin_x + (c * cell_size)
-                wz = origin_z + (grid_r * cell_size)
-                pos = [wx, KEY_Y, wz]
-            eligible_positions.append(pos)
-
-    if not eligible_positions:
+    eligible_cells = key_candidate_cells(grid, spawn_chance=spawn_chance)
+    if not eligible_cells:
         print('[KeyLoader] No eligible purple tiles found in grid -> no keys spawned')
         return group, []
 
     if min_distance is None:
         min_distance = cell_size * 1.25
     chosen = []
-    if not eligible_positions:
-        return group, []
+    for r, c in pick_spread_cells(eligible_cells, num_keys):
+        grid_r = (rows - 1 - r)
+        if use_local:
+            lx = local_origin_x + (c * cell_size)
+            lz = local_origin_z + (grid_r * cell_size)
+            chosen.append([lx, KEY_Y, lz])
+        else:
+            wx = origin_x + (c * cell_size)
+            wz = origin_z + (grid_r * cell_size)
+            chosen.append([wx, KEY_Y, wz])
 
-    if num_keys >= len(eligible_positions):
-        chosen = list(eligible_positions)
-    else:
-        first = random.choice(eligible_positions)
-        chosen.append(first)
-
-        while len(chosen) < num_keys:
-            best_pos = None
-            best_min_sq = -1.0
-            for pos in eligible_positions:
-                if pos in chosen:
-                    continue
-                min_sq = min((pos[0]-p[0])**2 + (pos[2]-p[2])**2 for p in chosen)
-                if min_sq > best_min_sq:
-                    best_min_sq = min_sq
-                    best_pos = pos
-
-            if best_pos is None:
-                break
-
-            chosen.append(best_pos)
-
-    print('[KeyLoader] Eligible positions:', len(eligible_positions), '  requested keys:', num_keys)
+    print('[KeyLoader] Eligible positions:', len(eligible_cells), '  requested keys:', num_keys)
     spawned = []
     try:
         ox, oy, oz = (float(key_offset[0]), float(key_offset[1]), float(key_offset[2]))
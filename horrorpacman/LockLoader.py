@@ -1,7 +1,11 @@
 import os
 import math
-import viz
-import vizshape
+try:
+    import viz
+    import vizshape
+except Exception:
+    viz = None
+    vizshape = None
 
 WALL_EMOJI = '🟧'
 LOCK_CELL = '🟩'
@@ -96,44 +100,12 @@ def _load_lock_model(filename, scale_factor=1.0, tint=None, fallback_color=(0.9,
     return g
 
 
-def spawn_locks_on_map(map_root=None, attach_to_map=True, grid_path=None, cell_size=3.0, visualize=True, spacing=0.40):
-    if grid_path is None:
-        grid_path = _default_grid_path()
-    if not os.path.exists(grid_path):
-        raise FileNotFoundError('Grid file not found: %s' % grid_path)
-
-    grid = _read_grid(grid_path)
-    if not grid:
-        return None, {}
-
-    rows = len(grid)
-    cols = max(len(r) for r in grid)
-
-    if map_root is not None and hasattr(map_root, '_pacmap_center'):
-        center_x, center_z = map_root._pacmap_center
-    else:
-        center_x, center_z = (0.0, 0.0)
-
-    grid_width = cols * cell_size
-    grid_depth = rows * cell_size
-
-    if attach_to_map and map_root is not None and hasattr(map_root, '_pacmap_center'):
-        local_origin_x = - (grid_width / 2.0) + (cell_size / 2.0)
-        local_origin_z = - (grid_depth / 2.0) + (cell_size / 2.0)
-        use_local = True
-    else:
-        origin_x = center_x - (grid_width / 2.0) + (cell_size / 2.0)
-        origin_z = center_z - (grid_depth / 2.0) + (cell_size / 2.0)
-        use_local = False
-
-    if attach_to_map and map_root is not None:
-        group = map_root
-    else:
-        group = viz.addGroup()
-
+def choose_lock_cells(grid):
+    # (top, bottom) 🟩 cells with 🟧 on their left: the widest pair in one column, else the
+    # first and last candidates by row; None when the grid has no candidate
+    cols = max((len(r) for r in grid), default=0)
     candidates = []
-    for r in range(rows):
-        row = grid[r]
+    for r, row in enumerate(grid):
         for c in range(cols):
             ch = row[c] if c < len(row) else None
             if ch != LOCK_CELL:
@@ -141,51 +113,32 @@ def spawn_locks_on_map(map_root=None, attach_to_map=True, grid_path=None, cell_s
             left = row[c-1] if c-1 >= 0 and c-1 < len(row) else None
             if left != WALL_EMOJI:
                 continue
-            grid_r = (rows - 1 - r)
-            if use_local:
-                lx = local_origin_x + (c * cell_size)
-                lz = local_origin_z + (grid_r * cell_size)
-                pos = [lx, 0.0, lz]
-            else:
-                wx = origin_x + (c * cell_size)
-                wz = origin_z + (grid_r * cell_size)
-                pos = [wx, 0.0, wz]
-            candidates.append((r, c, pos))
-
+            candidates.append((r, c))
     if not candidates:
-        print('[LockLoader] No suitable 🟩 cells with left 🟧 found')
-        return group, {'green': None, 'white': None, 'yellow': None}
+        return None
 
     by_col = {}
-    for r, c, pos in candidates:
-        by_col.setdefault(c, []).append((r, pos))
+    for r, c in candidates:
+        by_col.setdefault(c, []).append(r)
 
     chosen_pair = None
-    chosen_col = None
     best_span = -1
-    for c, items in by_col.items():
-        if len(items) < 2:
+    for c, rs in by_col.items():
+        if len(rs) < 2:
             continue
-        rs = sorted(items, key=lambda x: x[0])
-        span = rs[-1][0] - rs[0][0]
+        span = max(rs) - min(rs)
         if span > best_span:
             best_span = span
-            chosen_pair = (rs[0], rs[-1])
-            chosen_col = c
+            chosen_pair = ((min(rs), c), (max(rs), c))
 
     if chosen_pair is None:
         all_sorted = sorted(candidates, key=lambda x: x[0])
-        if len(all_sorted) >= 2:
-            top = all_sorted[0]
-            bottom = all_sorted[-1]
-            chosen_pair = ((top[0], top[2]), (bottom[0], bottom[2]))
-        else:
-            only = candidates[0]
-            chosen_pair = ((only[0], only[2]), (only[0], only[2]))
-
-    top_r, top_pos = chosen_pair[0]
-    bottom_r, bottom_pos = chosen_pair[1]
+        chosen_pair = (all_sorted[0], all_sorted[-1])
+    return chosen_pair
 
+def lock_layout(top_pos, bottom_pos, spacing=0.40, cell_size=3.0):
+    # green at the bottom, white at the top, yellow between, pulled toward the middle by
+    # spacing and moved onto the wall face
     mid_pos = [(top_pos[0] + bottom_pos[0]) * 0.5,
                (top_pos[1] + bottom_pos[1]) * 0.5,
                (top_pos[2] + bottom_pos[2]) * 0.5]
@@ -207,8 +160,59 @@ def spawn_locks_on_map(map_root=None, attach_to_map=True, grid_path=None, cell_s
                    (top_pos[2] + bottom_pos[2]) * 0.5]
 
     attach_offset = (-cell_size * 0.36, 1.2, 1.2)
+    return {kind: [pos[i] + attach_offset[i] for i in range(3)]
+            for kind, pos in (('green', bottom_pos), ('white', top_pos), ('yellow', mid_pos))}
+
+
+def spawn_locks_on_map(map_root=None, attach_to_map=True, grid_path=None, cell_size=3.0, visualize=True, spacing=0.40):
+    if grid_path is None:
+        grid_path = _default_grid_path()
+    if not os.path.exists(grid_path):
+        raise FileNotFoundError('Grid file not found: %s' % grid_path)
+
+    grid = _read_grid(grid_path)
+    if not grid:
+        return None, {}
+
+    rows = len(grid)
+    cols = max(len(r) for r in grid)
+
+    if map_root is not None and hasattr(map_root, '_pacmap_center'):
+        center_x, center_z = map_root._pacmap_center
+    else:
+        center_x, center_z = (0.0, 0.0)
+
+    grid_width = cols * cell_size
+    grid_depth = rows * cell_size
+
+    if attach_to_map and map_root is not None and hasattr(map_root, '_pacmap_center'):
+        local_origin_x = - (grid_width / 2.0) + (cell_size / 2.0)
+        local_origin_z = - (grid_depth / 2.0) + (cell_size / 2.0)
+        use_local = True
+    else:
+        origin_x = center_x - (grid_width / 2.0) + (cell_size / 2.0)
+        origin_z = center_z - (grid_depth / 2.0) + (cell_size / 2.0)
+        use_local = False
+
+    if attach_to_map and map_root is not None:
+        group = map_root
+    else:
+        group = viz.addGroup()
+
+    pair = choose_lock_cells(grid)
+    if pair is None:
+        print('[LockLoader] No suitable 🟩 cells with left 🟧 found')
+        return group, {'green': None, 'white': None, 'yellow': None}
+
+    def _cell_pos(r, c):
+        grid_r = (rows - 1 - r)
+        if use_local:
+            return [local_origin_x + (c * cell_size), 0.0, local_origin_z + (grid_r * cell_size)]
+        return [origin_x + (c * cell_size), 0.0, origin_z + (grid_r * cell_size)]
+
+    layout = lock_layout(_cell_pos(*pair[0]), _cell_pos(*pair[1]), spacing=spacing, cell_size=cell_size)
 
-    def _spawn_asset(kind, filename, world_pos, offset, desired_size=0.9, fallback=None):
+    def _spawn_asset(kind, filename, world_pos, desired_size=0.9, fallback=None):
         if fallback is None:
             if 'Green' in filename:
                 fallback = (0.2, 0.9, 0.2)
@@ -228,7 +232,7 @@ def spawn_locks_on_map(map_root=None, attach_to_map=True, grid_path=None, cell_s
         except Exception:
             pass
         try:
-            node.setPosition((world_pos[0] + offset[0], world_pos[1] + offset[1], world_pos[2] + offset[2]))
+            node.setPosition(tuple(world_pos))
         except Exception:
             pass
         try:
@@ -239,15 +243,15 @@ def spawn_locks_on_map(map_root=None, attach_to_map=True, grid_path=None, cell_s
 
     spawned = {'green': None, 'white': None, 'yellow': None}
     try:
-        spawned['green'] = _spawn_asset('green', _LOCK_ASSETS[0], bottom_pos, attach_offset)
+        spawned['green'] = _spawn_asset('green', _LOCK_ASSETS[0], layout['green'])
     except Exception:
         spawned['green'] = None
     try:
-        spawned['white'] = _spawn_asset('white', _LOCK_ASSETS[1], top_pos, attach_offset, desired_size=0.5)
+        spawned['white'] = _spawn_asset('white', _LOCK_ASSETS[1], layout['white'], desired_size=0.5)
     except Exception:
         spawned['white'] = None
     try:
-        spawned['yellow'] = _spawn_asset('yellow', _LOCK_ASSETS[2], mid_pos, attach_offset)
+        spawned['yellow'] = _spawn_asset('yellow', _LOCK_ASSETS[2], layout['yellow'])
     except Exception:
         spawned['yellow'] = None
 
@@ -1,8 +1,12 @@
 import time
 import math
 import os
-import viz
-import vizact
+try:
+    import viz
+    import vizact
+except Exception:
+    viz = None
+    vizact = None
 
 try:
     import KeyCollector as _KC
@@ -14,6 +18,13 @@ try:
 except Exception:
     _KL = None
 
+try:
+    import Hearing as _Hearing
+except Exception:
+    _Hearing = None
+
+UNLOCK_DISTANCE_CELLS = 0.6
+
 _player = None
 _map_root = None
 _pick_distance = None
@@ -142,7 +153,7 @@ def _find_nearby_lock():
         return None, None
     if _pick_distance is None:
         try:
-            _pick_distance = float(getattr(_KL, 'DEFAULT_CELL_SIZE', 3.0)) * 0.6
+            _pick_distance = float(getattr(_KL, 'DEFAULT_CELL_SIZE', 3.0)) * UNLOCK_DISTANCE_CELLS
         except Exception:
             _pick_distance = 1.8
 
@@ -230,6 +241,12 @@ def _attempt_unlock():
                 snd.play()
         except Exception:
             pass
+        try:
+            if _Hearing is not None and _player is not None:
+                px, py, pz = _player.getPosition()
+                _Hearing.emit_noise(px, pz, _Hearing.NOISE_UNLOCK)
+        except Exception:
+            pass
         try:
             _scan_locks()
         except Exception:
@@ -257,7 +274,7 @@ def init(player, map_root=None, pick_distance=None, on_unlock=None):
         if pick_distance is not None:
             _pick_distance = float(pick_distance)
         else:
-            _pick_distance = float(getattr(_KL, 'DEFAULT_CELL_SIZE', 3.0)) * 0.6
+            _pick_distance = float(getattr(_KL, 'DEFAULT_CELL_SIZE', 3.0)) * UNLOCK_DISTANCE_CELLS
     except Exception:
         _pick_distance = 1.8
 
@@ -2,10 +2,24 @@ import os
 import math
 import random
 
-import viz
-import vizact
-import vizshape
-from PacManLoaderAndAnimations import run_pacman_animation
+try:
+    import viz
+    import vizact
+    import vizshape
+except Exception:
+    viz = None
+    vizact = None
+    vizshape = None
+from PacManLoaderAndAnimations import run_pacman_animation, DEFAULT_SQUASH_FREQ_HZ
+from GridNav import NO_CELL, build_walkable_mask, build_nearest_walkable_table, build_patrol_tours, build_toward_table
+from GridSight import ShadowcastFOV, load_or_build_visibility
+from BeliefMap import BeliefMap, np as _np
+from GridAccel import GridKernels
+from GridCollide import TileGrid
+from SweptContact import swept_capsules_toi
+from ChaserFields import FieldBank
+import Hearing
+from Hearing import NoiseMap
 
 GRID_FILE = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', 'Map_Grid.txt'))
 CELL_SIZE = 3.0
@@ -15,12 +29,26 @@ PACMAN_SCALE = 0.11
 PACMAN_Y = 0.35
 DOUBLE_JUMP_ENABLED = True 
 PACMAN_JUMP_DISTANCE = 2.0  
+SEGMENT_REACH_EPS = 0.05
+SEGMENT_AXIS_TOLERANCE = 0.05
+JUMP_WALL_MARGIN = 0.35
 
 SIGHT_MAX_DIST = 9999.0  
+SIGHT_CONE_ENABLED = True
+SIGHT_CONE_DEGREES = 120.0
+SIGHT_NEAR_CELLS = 1
+BELIEF_SEEK_ENABLED = True
+OCCUPANCY_YIELD_SECONDS = 0.8
+AI_TICK_HZ = 20.0
+AI_MAX_TICKS_PER_FRAME = 4
+INTERCEPT_ENABLED = True
+INTERCEPT_LOOKAHEAD_CELLS = 10
+INTERCEPT_MIN_PLAYER_SPEED = 0.5
 REPATH_INTERVAL_CHASE = 0.25
 REPATH_INTERVAL_WANDER = 1.25
 REPATH_INTERVAL_SEEK = 0.35 
 WANDER_REACH_CELLS = 6
+WANDER_TOUR_SPAN = 8
 PLAYER_WANDER_RADIUS = 10.0 
 WALKABLE_EMOJIS = {'🟦','🟨','🟪'}
 
@@ -30,9 +58,12 @@ def _read_grid(path):
     return [list(line) for line in lines]
 
 class PacManChaser:
-    def __init__(self, map_root=None, existing_node=None, jump_distance=None):
+    def __init__(self, map_root=None, existing_node=None, jump_distance=None, spawn_rc=None, coop=None,
+                 personality=None, fields=None, partner=None, occupancy=None, grid=None, hearing=None):
         self.map_root = map_root
-        self.grid = _read_grid(GRID_FILE) if os.path.exists(GRID_FILE) else []
+        if grid is None:
+            grid = _read_grid(GRID_FILE) if os.path.exists(GRID_FILE) else []
+        self.grid = grid
         self.rows = len(self.grid)
         self.cols = max((len(r) for r in self.grid), default=0)
         self.jump_distance = jump_distance if jump_distance is not None else PACMAN_JUMP_DISTANCE
@@ -49,8 +80,10 @@ class PacManChaser:
             self.local_origin_z = None
             self.center_x = 0.0
             self.center_z = 0.0
+        self._rebuild_grid_caches()
 
-        spawn_rc = self._find_spawn_cell_near_center()
+        if spawn_rc is None or not self.is_walkable(spawn_rc[0], spawn_rc[1]):
+            spawn_rc = self._find_spawn_cell_near_center()
         self.grid_r, self.grid_c = spawn_rc
         wx, wz = self.grid_to_world(self.grid_r, self.grid_c)
         if existing_node is not None:
@@ -73,19 +106,150 @@ class PacManChaser:
                 ball.setParent(self.node)
                 self.node.setPosition([wx, PACMAN_Y, wz])
                 self.node.setScale([PACMAN_SCALE, PACMAN_SCALE, PACMAN_SCALE])
+        try:
+            if hasattr(self.node, 'set_jump_params'):
+                self.node.set_jump_params(new_clamp=self._clamp_jump)
+        except Exception:
+            pass
         self.facing_yaw = 0.0
         self.mode = 'wander'
         self.current_path = []  
         self.next_path_idx = 0
+        self.path_segments = []
+        self.segment_idx = 0
+        self._segment_dir = None
+        self._issued_jump_len = None
+        self._path_step0 = None
+        self.hop_len = CELL_SIZE * (2 if DOUBLE_JUMP_ENABLED else 1)
         self.repath_timer = 0.0
         self.last_seen_rc = None  
         self.caught_player = False 
+        self._catch_prev = None
         self._did_pounce_this_cycle = False
         self.last_chase_target = None  
         self.anim_time = 0.0
+        self.tick_seconds = 1.0 / AI_TICK_HZ
+        self._tick_accum = 0.0
+        self._prev_yaw = self.facing_yaw
+        self._shown_yaw = None
+        self._shown_scale = None
+        self._player_prev = None
+        self._player_vel = (0.0, 0.0)
+        self.hearing = hearing if hearing is not None else Hearing.default_queue
+        self._noise_seq = self.hearing.last_seq()
+        self.heard_rc = None
         self.anim_freq = 1.0  
         self.anim_w_amp = 0.2
         self.anim_h_amp = 0.22
+        self.coop = coop
+        self.agent_id = coop.register(self) if coop is not None else None
+        self.tactic = None
+        self.occupancy = occupancy
+        self.occupancy_token = occupancy.register() if occupancy is not None else None
+        self._occupied_idx = None
+        self._yield_time = 0.0
+        self._occupy_cell()
+        self.assign_personality(personality, fields=fields, partner=partner)
+
+    def assign_personality(self, personality, fields=None, partner=None):
+        self.personality = personality
+        self.partner = partner
+        if fields is None and personality is not None:
+            fields = FieldBank(self._walkable, self.rows, self.cols, kernels=self._kernels)
+        self.fields = fields
+
+    def attach_occupancy(self, occupancy):
+        self.occupancy = occupancy
+        self.occupancy_token = occupancy.register()
+        self._occupied_idx = None
+        self._occupy_cell()
+
+    def _occupy_cell(self):
+        if self.occupancy is None or not self.is_walkable(self.grid_r, self.grid_c):
+            return
+        idx = self.grid_r * self.cols + self.grid_c
+        if idx == self._occupied_idx:
+            return
+        if self._occupied_idx is not None:
+            self.occupancy.leave(self.occupancy_token, self._occupied_idx)
+        self.occupancy.enter(self.occupancy_token, idx)
+        self._occupied_idx = idx
+
+    def _ahead_step(self, vx, vz):
+        # dominant axis only: path segments run along rows or columns, never diagonally
+        if abs(vx) < 1e-6 and abs(vz) < 1e-6:
+            return 0, 0
+        if abs(vx) >= abs(vz):
+            return 0, (1 if vx > 0 else -1)
+        return (-1 if vz > 0 else 1), 0
+
+    def _ahead_blocked(self, vx, vz):
+        dr, dc = self._ahead_step(vx, vz)
+        if dr == 0 and dc == 0:
+            return False
+        r, c = self.grid_r + dr, self.grid_c + dc
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            return False
+        return self.occupancy.blocks(self.occupancy_token, r * self.cols + c)
+
+    def _try_sidestep(self, vx, vz):
+        here = (self.grid_r, self.grid_c)
+        options = list(self._neighbors(here[0], here[1]))
+        if len(options) < 3 or not self.current_path:
+            return False
+        dr, dc = self._ahead_step(vx, vz)
+        ahead = (here[0] + dr, here[1] + dc)
+        goal = self.current_path[-1]
+        for rc in options:
+            if rc == ahead or not self.occupancy.is_free(rc[0] * self.cols + rc[1]):
+                continue
+            detour = self._astar(rc, goal)
+            if detour:
+                self._set_path([here] + detour)
+                return True
+        return False
+
+    def set_grid(self, grid):
+        self.grid = grid
+        self.rows = len(self.grid)
+        self.cols = max((len(r) for r in self.grid), default=0)
+        if self.use_local:
+            self.local_origin_x = - (self.cols * CELL_SIZE) / 2.0 + (CELL_SIZE / 2.0)
+            self.local_origin_z = - (self.rows * CELL_SIZE) / 2.0 + (CELL_SIZE / 2.0)
+        self._rebuild_grid_caches()
+        if self.personality is not None:
+            self.fields = FieldBank(self._walkable, self.rows, self.cols, kernels=self._kernels)
+        self._set_path([], next_idx=0)
+
+    def _rebuild_grid_caches(self):
+        self._walkable = build_walkable_mask(self.grid, self.rows, self.cols, WALKABLE_EMOJIS)
+        self._nearest_idx = build_nearest_walkable_table(self._walkable, self.rows, self.cols)
+        self._kernels = GridKernels(self._walkable, self.rows, self.cols)
+        self._tours = build_patrol_tours(self._walkable, self.rows, self.cols)
+        self._tour_of = {}
+        for tour_id, tour in enumerate(self._tours):
+            for pos, idx in enumerate(tour):
+                if idx not in self._tour_of:
+                    self._tour_of[idx] = (tour_id, pos)
+        self._tour_step = build_toward_table(self._walkable, self.rows, self.cols, list(self._tour_of))
+        self._tour_cursor = None
+        ox, oz = self.grid_to_world(self.rows - 1, 0)
+        self._tiles = TileGrid(self._walkable, self.rows, self.cols, ox, oz, CELL_SIZE)
+        self._sight = None
+        self._fov = None
+        if self.rows and self.cols:
+            radius = int(math.ceil(SIGHT_MAX_DIST / CELL_SIZE))
+            try:
+                self._sight = load_or_build_visibility(self._walkable, self.rows, self.cols, radius=radius)
+            except Exception as e:
+                print('[PacMan] Visibility table unavailable, using per-frame LOS:', e)
+            self._fov = ShadowcastFOV(self._walkable, self.rows, self.cols, radius=min(radius, max(self.rows, self.cols)))
+        self._belief = None
+        self._self_field = self._kernels.new_int_buffer()
+        self._self_field_idx = None
+        self._noise = NoiseMap(self._walkable, self.rows, self.cols)
+        if BELIEF_SEEK_ENABLED and _np is not None and self.rows and self.cols:
+            self._belief = BeliefMap(self._walkable, self.rows, self.cols)
 
     def grid_to_world(self, r, c):
         grid_r = (self.rows - 1 - r)
@@ -115,8 +279,7 @@ class PacManChaser:
     def is_walkable(self, r, c):
         if r < 0 or c < 0 or r >= self.rows or c >= self.cols:
             return False
-        tile = self.grid[r][c] if c < len(self.grid[r]) else None
-        return tile in WALKABLE_EMOJIS
+        return self._walkable[r * self.cols + c] == 1
     
     def _find_spawn_cell_near_center(self):
         center_r = self.rows // 2
@@ -137,60 +300,85 @@ class PacManChaser:
             if self.is_walkable(nr, nc):
                 yield nr, nc
 
-    def _heuristic(self, a, b):
-        return abs(a[0]-b[0]) + abs(a[1]-b[1])
-
     def _astar(self, start, goal, max_iter=5000):
-        if start == goal:
-            return [start]
-        open_set = {start}
-        came = {}
-        g = {start: 0}
-        f = {start: self._heuristic(start, goal)}
-        for _ in range(max_iter):
-            if not open_set:
-                break
-            current = min(open_set, key=lambda n: f.get(n, float('inf')))
-            if current == goal:
-                path = [current]
-                while current in came:
-                    current = came[current]
-                    path.append(current)
-                path.reverse()
-                return path
-            open_set.remove(current)
-            cr, cc = current
-            for nb in self._neighbors(cr, cc):
-                tentative = g[current] + 1
-                if tentative < g.get(nb, float('inf')):
-                    came[nb] = current
-                    g[nb] = tentative
-                    f[nb] = tentative + self._heuristic(nb, goal)
-                    open_set.add(nb)
-        return []
+        return self._kernels.astar(start, goal, max_iter)
+
+    def _plan_path(self, goal):
+        if self.coop is not None:
+            self.coop.request(self.agent_id, goal)
+            return
+        self._set_path(self._astar((self.grid_r, self.grid_c), goal))
+
+    def _chase_path(self, goal):
+        if self.personality is None or self.fields is None:
+            self._plan_path(goal)
+            return
+        here = (self.grid_r, self.grid_c)
+        partner_rc = (self.partner.grid_r, self.partner.grid_c) if self.partner is not None else None
+        field, self.tactic = self.fields.target_field(self.personality, here, partner_rc)
+        max_steps = self.rows * self.cols if self.coop is not None else None
+        path = self._descend(field, here, max_steps)
+        if len(path) < 2 and self.tactic in ('ambush', 'flank'):
+            # already at the cut-off point: close in on the player
+            self.tactic = 'chase'
+            path = self._descend(self.fields.player_field, here, max_steps)
+        if self.coop is not None and path:
+            # the field picks the target cell; the coop planner reserves the way there
+            self.coop.request(self.agent_id, path[-1])
+            return
+        self._set_path(path)
+
+    def _descend(self, field, here, max_steps=None):
+        if max_steps is None:
+            return self.fields.descend(field, here)
+        return self.fields.descend(field, here, max_steps=max_steps)
+
+    def _compress_path(self, path):
+        segments = []
+        n = len(path)
+        i = 0
+        while i < n - 1:
+            dr = path[i + 1][0] - path[i][0]
+            dc = path[i + 1][1] - path[i][1]
+            j = i + 1
+            while j + 1 < n and path[j + 1][0] - path[j][0] == dr and path[j + 1][1] - path[j][1] == dc:
+                j += 1
+            sx, sz = self.grid_to_world(path[i][0], path[i][1])
+            ex, ez = self.grid_to_world(path[j][0], path[j][1])
+            length = math.hypot(ex - sx, ez - sz)
+            if dr == 0 and dc == 0:
+                # reserved wait from the coop planner: hop in place
+                segments.append((j, ex, ez, 0.0, 0.0, None))
+            elif length > 1e-6:
+                vx = (ex - sx) / length
+                vz = (ez - sz) / length
+                yaw = math.degrees(math.atan2(vx, vz)) % 360.0
+                segments.append((j, ex, ez, vx, vz, yaw))
+            i = j
+        return segments
+
+    def _set_path(self, path, next_idx=1, step0=None):
+        self.current_path = path
+        self.next_path_idx = next_idx
+        self._path_step0 = step0 if path else None
+        self.path_segments = self._compress_path(path) if path else []
+        self.segment_idx = 0
+        self._segment_dir = None
+        self._issued_jump_len = None
 
     def _los_clear_grid(self, a, b):
-        (r0, c0) = a
-        (r1, c1) = b
-        dr = abs(r1 - r0)
-        dc = abs(c1 - c0)
-        sr = 1 if r0 < r1 else -1
-        sc = 1 if c0 < c1 else -1
-        err = dr - dc
-        r, c = r0, c0
-        while True:
-            if not self.is_walkable(r, c) and (r, c) != a and (r, c) != b:
-                return False
-            if (r, c) == (r1, c1):
-                break
-            e2 = 2 * err
-            if e2 > -dc:
-                err -= dc
-                r += sr
-            if e2 < dr:
-                err += dr
-                c += sc
-        return True
+        return self._kernels.los(a, b)
+
+    def _in_sight(self, a, b):
+        # the precomputed bitset rejects first; only its hits pay for the cone test
+        visible = self._sight.visible(a, b) if self._sight is not None else None
+        if visible is False:
+            return False
+        if SIGHT_CONE_ENABLED and self._fov is not None and abs(a[0] - b[0]) + abs(a[1] - b[1]) > SIGHT_NEAR_CELLS:
+            return self._fov.in_cone(a, b, self.facing_yaw, SIGHT_CONE_DEGREES)
+        if visible is not None:
+            return visible
+        return self._los_clear_grid(a, b)
 
     def _choose_wander_target(self, from_rc):
         fr, fc = from_rc
@@ -202,35 +390,70 @@ class PacManChaser:
                 return (tr, tc)
         return from_rc
 
-    def _nearest_walkable(self, r, c, max_radius=25):
-        if self.is_walkable(r, c):
-            return (r, c)
-        visited = set([(r, c)])
-        frontier = [(r, c)]
-        for depth in range(1, max_radius + 1):
-            next_frontier = []
-            for cr, cc in frontier:
-                for dr, dc in [(1,0),(-1,0),(0,1),(0,-1)]:
-                    nr, nc = cr + dr, cc + dc
-                    if (nr, nc) in visited:
-                        continue
-                    visited.add((nr, nc))
-                    if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                        if self.is_walkable(nr, nc):
-                            return (nr, nc)
-                        next_frontier.append((nr, nc))
-            if not next_frontier:
-                break
-            frontier = next_frontier
-        return None
+    def _tour_wander_path(self, from_rc):
+        if not self._tours:
+            return []
+        idx = self._nearest_idx[from_rc[0] * self.cols + from_rc[1]]
+        if idx == NO_CELL:
+            return []
+        path = [divmod(idx, self.cols)]
+        while idx not in self._tour_of:
+            nxt = self._tour_step[idx]
+            if nxt == NO_CELL or nxt == idx:
+                return []
+            idx = nxt
+            path.append(divmod(idx, self.cols))
+        tour_id, pos = self._tour_of[idx]
+        tour = self._tours[tour_id]
+        if self._tour_cursor is not None and self._tour_cursor[0] == tour_id:
+            start = self._tour_cursor[1]
+            for k in range(WANDER_TOUR_SPAN + 1):
+                if tour[(start + k) % len(tour)] == idx:
+                    pos = (start + k) % len(tour)
+                    break
+        for k in range(1, min(WANDER_TOUR_SPAN, len(tour) - 1) + 1):
+            path.append(divmod(tour[(pos + k) % len(tour)], self.cols))
+        self._tour_cursor = (tour_id, pos)
+        return path
+
+    def spread_cells(self, count):
+        if not self._tours or count <= 0:
+            return [(self.grid_r, self.grid_c)] * max(count, 0)
+        tour = max(self._tours, key=len)
+        return [divmod(tour[(i * len(tour)) // count], self.cols) for i in range(count)]
+
+    def _nearest_walkable(self, r, c):
+        if r < 0 or c < 0 or r >= self.rows or c >= self.cols:
+            return None
+        idx = self._nearest_idx[r * self.cols + c]
+        if idx == NO_CELL:
+            return None
+        return divmod(idx, self.cols)
 
     def update(self, dt, player_world_pos):
+        # sampled per frame: catch-up ticks all see the same player position
+        self._track_player_velocity(dt, player_world_pos[0], player_world_pos[2])
+        self._tick_accum += dt
+        ticks = 0
+        while self._tick_accum >= self.tick_seconds and ticks < AI_MAX_TICKS_PER_FRAME:
+            self._prev_yaw = self.facing_yaw
+            self.tick(self.tick_seconds, player_world_pos)
+            self._tick_accum -= self.tick_seconds
+            ticks += 1
+        if ticks == AI_MAX_TICKS_PER_FRAME and self._tick_accum >= self.tick_seconds:
+            # drop the backlog after a long stall instead of spiralling
+            self._tick_accum = self._tick_accum % self.tick_seconds
+        self._push_transforms(self._tick_accum / self.tick_seconds)
+
+    def tick(self, dt, player_world_pos):
         if self.rows == 0 or self.cols == 0:
             self._update_animation(dt)
             return
 
         nx, ny, nz = self.node.getPosition()
         self.grid_r, self.grid_c = self.world_to_grid(nx, nz)
+        self._occupy_cell()
+        self._check_reservation_drift()
 
         px, py, pz = player_world_pos
         if self.use_local and self.map_root is not None:
@@ -246,9 +469,14 @@ class PacManChaser:
         dist_to_player = math.hypot(px - pac_world_x, pz - pac_world_z)
         inside_radius = dist_to_player <= PLAYER_WANDER_RADIUS
 
-        in_sight = self._los_clear_grid((self.grid_r, self.grid_c), (pr, pc))
+        if self.fields is not None:
+            self.fields.observe_player((pr, pc), px, pz)
+
+        in_sight = self._in_sight((self.grid_r, self.grid_c), (pr, pc))
         if in_sight:
             self.last_seen_rc = (pr, pc)
+        self._listen(pac_world_x - nx, pac_world_z - nz, in_sight)
+        self._update_belief(dt, in_sight, pr, pc)
 
         POUNCE_TRIGGER_DIST = (PACMAN_RADIUS + 0.22) + 0.6
         POUNCE_OVERSHOOT = 0.4
@@ -259,6 +487,8 @@ class PacManChaser:
         chase_goal = self._nearest_walkable(pr, pc)
         if chase_goal is None:
             chase_goal = (pr, pc) 
+        if INTERCEPT_ENABLED and self.personality is None:
+            chase_goal = self._intercept_goal(chase_goal)
         if not inside_radius:
             if _can_pounce() and dist_to_player <= POUNCE_TRIGGER_DIST and not self.caught_player:
                 self.mode = 'pounce'
@@ -293,24 +523,27 @@ class PacManChaser:
         if self.mode != 'pounce':
             self.repath_timer -= dt
             if self.repath_timer <= 0.0:
-                if self.mode in ('chase','seek') and target_rc is not None:
-                    self.current_path = self._astar((self.grid_r, self.grid_c), target_rc)
+                if self.mode == 'chase' and target_rc is not None:
+                    self._chase_path(target_rc)
+                    self.repath_timer = repath_interval
+                elif self.mode == 'seek' and target_rc is not None:
+                    self._plan_path(target_rc)
                     self.repath_timer = repath_interval
                 elif self.mode == 'wander':
-                    wander_goal = self._choose_wander_target((self.grid_r, self.grid_c))
-                    self.current_path = self._astar((self.grid_r, self.grid_c), wander_goal)
+                    path = self._tour_wander_path((self.grid_r, self.grid_c))
+                    if not path:
+                        wander_goal = self._choose_wander_target((self.grid_r, self.grid_c))
+                        path = self._astar((self.grid_r, self.grid_c), wander_goal)
+                    self._set_path(path)
                     self.repath_timer = REPATH_INTERVAL_WANDER
                 else:
-                    self.current_path = []
+                    self._set_path([])
                     self.repath_timer = REPATH_INTERVAL_WANDER
-                self.next_path_idx = 1
             else:
                 if self.mode == 'chase' and self.last_chase_target and target_rc != self.last_chase_target:
-                    self.current_path = self._astar((self.grid_r, self.grid_c), self.last_chase_target)
-                    self.next_path_idx = 1
+                    self._chase_path(self.last_chase_target)
         else:
-            self.current_path = [] 
-            self.next_path_idx = 0
+            self._set_path([], next_idx=0)
 
         if self.mode == 'pounce':
             dx = px - pac_world_x
@@ -327,10 +560,6 @@ class PacManChaser:
                     pass
                 desired_yaw = math.degrees(math.atan2(vx, vz))
                 self.facing_yaw = self._turn_towards(self.facing_yaw, desired_yaw, PACMAN_TURN_RATE * dt)
-                try:
-                    self.node.setEuler([self.facing_yaw,0,0])
-                except Exception:
-                    pass
                 self._did_pounce_this_cycle = True
         else:
             self._follow_path_jump(dt)
@@ -340,46 +569,203 @@ class PacManChaser:
         self.caught_player = (dist_to_player <= catch_threshold)
 
         if self.mode == 'seek' and (not self.current_path or self.next_path_idx >= len(self.current_path)):
-            self.last_seen_rc = None
-            self.mode = 'wander'
+            if self._belief is None or not self._belief.active:
+                self.last_seen_rc = None
+                self.mode = 'wander'
         self._update_animation(dt)
 
+    def _listen(self, offset_x, offset_z, in_sight=False):
+        # the queue is drained every tick, so noise made while the player is in sight
+        # is never replayed later; only the newest audible recent event counts
+        events = self.hearing.events_since(self._noise_seq, Hearing.NOISE_MAX_AGE)
+        self._noise_seq = self.hearing.last_seq()
+        if in_sight or not events:
+            return
+        here = self._nearest_idx[self.grid_r * self.cols + self.grid_c]
+        if here == NO_CELL:
+            return
+        best = None
+        for _, x, z, loudness, _ in reversed(events):
+            rc = self._nearest_walkable(*self.world_to_grid(x - offset_x, z - offset_z))
+            if rc is None:
+                continue
+            self._noise.propagate(rc[0] * self.cols + rc[1], Hearing.noise_radius(loudness))
+            if self._noise.level_at(here, loudness) >= Hearing.HEARING_THRESHOLD:
+                best = rc
+                break
+        if best is None:
+            return
+        self.heard_rc = best
+        self.last_seen_rc = best
+        if self._belief is not None:
+            self._belief.reset_to(best)
+
+    def _track_player_velocity(self, dt, px, pz):
+        if self._player_prev is not None and dt > 0.0:
+            vx = (px - self._player_prev[0]) / dt
+            vz = (pz - self._player_prev[1]) / dt
+            ox, oz = self._player_vel
+            self._player_vel = (0.5 * (ox + vx), 0.5 * (oz + vz))
+        self._player_prev = (px, pz)
+
+    def _distance_from_self(self):
+        idx = self.grid_r * self.cols + self.grid_c
+        if idx != self._self_field_idx:
+            self._kernels.bfs_distances((self.grid_r, self.grid_c), out=self._self_field)
+            self._self_field_idx = idx
+        return self._self_field
+
+    def _predict_player_route(self, start, max_cells):
+        vx, vz = self._player_vel
+        speed = math.hypot(vx, vz)
+        # grid rows grow towards -z
+        hr, hc = -vz / speed, vx / speed
+        route = []
+        prev = None
+        cur = start
+        for _ in range(max_cells):
+            best = None
+            best_dot = None
+            for rc in self._neighbors(cur[0], cur[1]):
+                if rc == prev:
+                    continue
+                dot = (rc[0] - cur[0]) * hr + (rc[1] - cur[1]) * hc
+                if best_dot is None or dot > best_dot:
+                    best = rc
+                    best_dot = dot
+            if best is None:
+                break
+            hr, hc = best[0] - cur[0], best[1] - cur[1]
+            prev, cur = cur, best
+            route.append(cur)
+        return route
+
+    def _intercept_goal(self, chase_goal):
+        player_speed = math.hypot(self._player_vel[0], self._player_vel[1])
+        if player_speed < INTERCEPT_MIN_PLAYER_SPEED:
+            return chase_goal
+        pac_speed = self.hop_len * DEFAULT_SQUASH_FREQ_HZ
+        field = self._distance_from_self()
+        for k, rc in enumerate(self._predict_player_route(chase_goal, INTERCEPT_LOOKAHEAD_CELLS), 1):
+            d = field[rc[0] * self.cols + rc[1]]
+            if 0 <= d and d * CELL_SIZE / pac_speed <= k * CELL_SIZE / player_speed:
+                return rc
+        return chase_goal
+
+    def _update_belief(self, dt, in_sight, pr, pc):
+        if self._belief is None:
+            return
+        if in_sight:
+            seen = self._nearest_walkable(pr, pc)
+            if seen is not None:
+                self._belief.reset_to(seen)
+            return
+        if not self._belief.active:
+            return
+        self._belief.step(dt)
+        own = self._nearest_walkable(self.grid_r, self.grid_c)
+        if own is not None and self._fov is not None:
+            if SIGHT_CONE_ENABLED:
+                self._belief.clear_visible(self._fov, own, self.facing_yaw, SIGHT_CONE_DEGREES)
+            else:
+                self._belief.clear_visible(self._fov, own)
+        self.last_seen_rc = self._belief.peak()
+
+    def _path_step_limit(self):
+        # coop paths are timed: cell i is reserved for step step0 + i, so during a step
+        # the chaser may head for the next reserved cell but no further
+        if self._path_step0 is None or self.coop is None:
+            return None
+        return self.coop.current_step() - self._path_step0 + 1
+
+    def _check_reservation_drift(self):
+        limit = self._path_step_limit()
+        if limit is None or not self.current_path:
+            return
+        last = len(self.current_path) - 1
+        expected = max(0, min(last, limit - 1))
+        window = self.current_path[max(0, expected - 1):min(last, expected + 1) + 1]
+        if (self.grid_r, self.grid_c) not in window:
+            self.coop.request(self.agent_id, tuple(self.current_path[-1]))
+
+    def _hold_in_place(self):
+        if self._issued_jump_len != 0.0:
+            try:
+                if hasattr(self.node, 'set_jump_params'):
+                    self.node.set_jump_params(new_jump_forward=0.0)
+            except Exception:
+                pass
+            self._issued_jump_len = 0.0
+
     def _follow_path_jump(self, dt):
-        if not self.current_path or self.next_path_idx >= len(self.current_path):
+        if self.segment_idx >= len(self.path_segments):
+            return
+        end_idx, ex, ez, vx, vz, yaw = self.path_segments[self.segment_idx]
+        limit = self._path_step_limit()
+        if yaw is None:
+            if limit is None or limit > end_idx:
+                self._advance_segment(end_idx)
+            else:
+                self._hold_in_place()
             return
-        current_cell = self.current_path[self.next_path_idx - 1] if self.next_path_idx > 0 else self.current_path[0]
-        target_cell = self.current_path[self.next_path_idx]
-        advance = 1
-        if DOUBLE_JUMP_ENABLED and (self.next_path_idx + 1) < len(self.current_path):
-            c1 = self.current_path[self.next_path_idx]
-            c2 = self.current_path[self.next_path_idx + 1]
-            if (c1[0] == c2[0] == current_cell[0]) or (c1[1] == c2[1] == current_cell[1]):
-                if (abs(c1[0]-current_cell[0]) + abs(c1[1]-current_cell[1]) == 1 and
-                    abs(c2[0]-c1[0]) + abs(c2[1]-c1[1]) == 1):
-                    target_cell = c2
-                    advance = 2
-
-        tr, tc = target_cell
-        tx, tz = self.grid_to_world(tr, tc)
         cx, cy, cz = self.node.getPosition()
-        dx = tx - cx
-        dz = tz - cz
-        dist = math.hypot(dx, dz)
-        if dist < 0.05:
-            self.next_path_idx += advance
+        if self._segment_dir is None:
+            lateral = (ex - cx) * vz - (ez - cz) * vx
+            if abs(lateral) > SEGMENT_AXIS_TOLERANCE:
+                dx = ex - cx
+                dz = ez - cz
+                dist = math.hypot(dx, dz)
+                if dist < SEGMENT_REACH_EPS:
+                    self._advance_segment(end_idx)
+                    return
+                vx = dx / dist
+                vz = dz / dist
+                yaw = math.degrees(math.atan2(vx, vz)) % 360.0
+            self._segment_dir = (vx, vz, yaw)
+            self._issued_jump_len = None
+        vx, vz, yaw = self._segment_dir
+        remaining = (ex - cx) * vx + (ez - cz) * vz
+        if remaining < SEGMENT_REACH_EPS:
+            self._advance_segment(end_idx)
             return
-        vx = dx / max(dist, 1e-6)
-        vz = dz / max(dist, 1e-6)
-        jump_len = CELL_SIZE * advance
-        jump_len = min(jump_len, dist) 
-        try:
-            if hasattr(self.node, 'set_jump_params'):
-                self.node.set_jump_params(new_forward_dir=(vx, 0.0, vz), new_jump_forward=jump_len)
-        except Exception:
-            pass
-        desired_yaw = math.degrees(math.atan2(vx, vz))
-        self.facing_yaw = self._turn_towards(self.facing_yaw, desired_yaw, PACMAN_TURN_RATE * dt)
-        self.node.setEuler([self.facing_yaw, 0, 0])
+        if self.occupancy is not None:
+            blocked = self._ahead_blocked(vx, vz)
+            if blocked and self._yield_time < OCCUPANCY_YIELD_SECONDS:
+                if self._yield_time == 0.0 and self._try_sidestep(vx, vz):
+                    return
+                self._yield_time += dt
+                self._hold_in_place()
+                return
+            if not blocked:
+                self._yield_time = 0.0
+        jump_len = min(self.hop_len, remaining)
+        if limit is not None and limit < end_idx:
+            gx, gz = self.grid_to_world(*self.current_path[max(0, limit)])
+            gated = (gx - cx) * vx + (gz - cz) * vz
+            if gated < SEGMENT_REACH_EPS:
+                self._hold_in_place()
+                return
+            jump_len = min(jump_len, gated)
+        if self._issued_jump_len == 0.0:
+            self._issued_jump_len = None
+        if self._issued_jump_len is None or abs(jump_len - self._issued_jump_len) > 1e-3:
+            try:
+                if hasattr(self.node, 'set_jump_params'):
+                    self.node.set_jump_params(new_forward_dir=(vx, 0.0, vz), new_jump_forward=jump_len)
+            except Exception:
+                pass
+            self._issued_jump_len = jump_len
+        if self.facing_yaw != yaw:
+            self.facing_yaw = self._turn_towards(self.facing_yaw, yaw, PACMAN_TURN_RATE * dt)
+
+    def _clamp_jump(self, x, z, dx, dz, length):
+        return self._tiles.clamp_travel(x, z, dx, dz, length, margin=JUMP_WALL_MARGIN)
+
+    def _advance_segment(self, end_idx):
+        self.segment_idx += 1
+        self.next_path_idx = end_idx + 1
+        self._segment_dir = None
+        self._issued_jump_len = None
 
     def _turn_towards(self, current, target, max_delta):
         a = (target - current + 180.0) % 360.0 - 180.0
@@ -391,16 +777,41 @@ class PacManChaser:
 
     def _update_animation(self, dt):
         self.anim_time += dt
-        phase = math.sin(2.0 * math.pi * self.anim_freq * self.anim_time)
-        sx = PACMAN_SCALE * (1.0 + self.anim_w_amp * max(0.0, phase))
-        sy = PACMAN_SCALE * (1.0 - self.anim_h_amp * max(0.0, phase))
-        sz = PACMAN_SCALE * (1.0 + self.anim_w_amp * max(0.0, phase))
+
+    def _push_transforms(self, alpha):
+        # state lags one tick so the node can blend between the last two ticks
+        delta = (self.facing_yaw - self._prev_yaw + 180.0) % 360.0 - 180.0
+        yaw = (self._prev_yaw + delta * alpha) % 360.0
+        if yaw != self._shown_yaw:
+            try:
+                self.node.setEuler([yaw, 0, 0])
+            except Exception:
+                pass
+            self._shown_yaw = yaw
+        t = self.anim_time - (1.0 - alpha) * self.tick_seconds
+        phase = max(0.0, math.sin(2.0 * math.pi * self.anim_freq * t))
+        if phase == 0.0 and self._shown_scale == 0.0:
+            return
+        sx = PACMAN_SCALE * (1.0 + self.anim_w_amp * phase)
+        sy = PACMAN_SCALE * (1.0 - self.anim_h_amp * phase)
         try:
-            self.node.setScale([sx, sy, sz])
+            self.node.setScale([sx, sy, sx])
         except Exception:
             pass
+        self._shown_scale = phase
 
     def collides_with_point(self, pos, radius=0.25):
         px, py, pz = pos
         cx, cy, cz = self.node.getPosition()
         return math.hypot(px - cx, pz - cz) <= (PACMAN_RADIUS + radius)
+
+    def swept_collides(self, prev_pos, pos, radius=0.25, height=1.3):
+        # continuous collides_with_point: both bodies swept from the previous call to now
+        cur = self.node.getPosition()
+        prev = self._catch_prev if self._catch_prev is not None else cur
+        self._catch_prev = cur
+        p_lo = min(prev_pos[1], pos[1]) + radius
+        p_hi = max(prev_pos[1], pos[1]) + max(radius, height)
+        toi = swept_capsules_toi(prev, cur, min(prev[1], cur[1]), max(prev[1], cur[1]),
+                                 prev_pos, pos, p_lo, p_hi, PACMAN_RADIUS + radius)
+        return toi >= 0.0
@@ -1,4 +1,5 @@
 import os
+import math
 try:
     import viz
     import vizact
@@ -18,6 +19,122 @@ PACMAN_JUMP_FORWARD_DIR = (0.0, 0.0, 1.0)
 DEFAULT_SQUASH_FREQ_HZ = 0.55 
 DEFAULT_JUMP_VEL = 2.6        
 DEFAULT_GRAVITY = 8.8         
+JUMP_SUBSTEP_DT = 1.0 / 60.0
+JUMP_MAX_SUBSTEPS = 8
+
+def _step_hop(root, state, tnow, base_scale, freq_hz, width_amp, height_amp, jump_forward, jump_vel, gravity, forward_dir, px, py, pz):
+    dt = tnow - state.get('last_t', tnow)
+    state['last_t'] = tnow
+
+    if state['mode'] == 'squash':
+        elapsed = tnow - state.get('start_time', tnow)
+        theta = 2.0 * math.pi * freq_hz * elapsed
+        val = (math.sin(theta) + 1.0) * 0.5
+
+        sx = base_scale * (1.0 + width_amp * val)
+        sy = base_scale * (1.0 - height_amp * val)
+        sz = base_scale * (1.0 + width_amp * val)
+        try:
+            root.setScale([sx, sy, sz])
+        except Exception:
+            pass
+        prev_phase = state.get('prev_phase', None)
+        phase = math.sin(theta)
+        if prev_phase is None:
+            state['prev_phase'] = phase
+        else:
+            if state.get('passed_peak', False) is False and phase > 0.9:
+                state['passed_peak'] = True
+            if state.get('passed_peak', False) and abs(phase) < 0.05:
+                state['mode'] = 'jump'
+                params = getattr(root, '_anim_params', None)
+                jf = jump_forward
+                jv = jump_vel
+                gr = gravity
+                fd = forward_dir
+                clamp = None
+                if isinstance(params, dict):
+                    jf = params.get('jump_forward', jf)
+                    jv = params.get('jump_vel', jv)
+                    gr = params.get('gravity', gr)
+                    fd = params.get('forward_dir', fd)
+                    clamp = params.get('clamp')
+                state['vy'] = jv
+                try:
+                    fx, fy, fz = fd
+                    mag = math.hypot(math.hypot(fx, fy), fz)
+                    if mag > 1e-6:
+                        state['forward_dir'] = (fx/mag, fy/mag, fz/mag)
+                    else:
+                        state['forward_dir'] = (0.0, 0.0, 1.0)
+                except Exception:
+                    state['forward_dir'] = (0.0, 0.0, 1.0)
+                if clamp is not None and jf:
+                    try:
+                        sx, _, sz = root.getPosition()
+                        fdx, _, fdz = state['forward_dir']
+                        jf = clamp(sx, sz, fdx, fdz, float(jf))
+                    except Exception:
+                        pass
+                state['jump_left'] = float(jf or 0.0)
+                time_to_land = (2.0 * jv / gr) if gr != 0 else 0.0
+                if time_to_land > 1e-6 and jf:
+                    state['forward_speed'] = float(jf) / float(time_to_land)
+                else:
+                    state['forward_speed'] = 0.0
+                state['passed_peak'] = False
+                try:
+                    root.setScale([base_scale, base_scale, base_scale])
+                except Exception:
+                    pass
+    elif state['mode'] == 'jump':
+        try:
+            curx, cury, curz = root.getPosition()
+        except Exception:
+            curx, cury, curz = state.get('base_x', px), state.get('y', py), state.get('base_z', pz)
+        fdx, fdy, fdz = state.get('forward_dir', (0.0, 0.0, 1.0))
+        fs = state.get('forward_speed', 0.0)
+        # long frames are integrated in at most JUMP_MAX_SUBSTEPS slices
+        n = min(JUMP_MAX_SUBSTEPS, max(1, int(math.ceil(dt / JUMP_SUBSTEP_DT))))
+        h = dt / n
+        vy = state.get('vy', 0.0)
+        for _ in range(n):
+            vy -= gravity * h
+            state['y'] += vy * h
+            step = min(fs * h, state.get('jump_left', fs * h))
+            state['jump_left'] = state.get('jump_left', 0.0) - step
+            curx += fdx * step
+            curz += fdz * step
+            if state['y'] <= state.get('base_y', py):
+                break
+        state['vy'] = vy
+        try:
+            root.setPosition([curx, state['y'], curz])
+        except Exception:
+            pass
+        try:
+            root.setScale([base_scale, base_scale, base_scale])
+        except Exception:
+            pass
+        base_y = state.get('base_y', py)
+        if state['y'] <= base_y:
+
+            try:
+                landed_x, _, landed_z = root.getPosition()
+            except Exception:
+                landed_x, landed_z = state.get('base_x', px), state.get('base_z', pz)
+            state['y'] = base_y
+            state['vy'] = 0.0
+            try:
+                root.setPosition([landed_x, base_y, landed_z])
+            except Exception:
+                pass
+            state['base_x'] = landed_x
+            state['base_z'] = landed_z
+            state['start_time'] = tnow
+            state['mode'] = 'squash'
+            state['last_t'] = tnow
+
 
 def run_pacman_animation(asset_relative='assets/PacMan.glb', base_scale=PACMAN_SIZE, freq_hz=DEFAULT_SQUASH_FREQ_HZ, width_amp=0.22, height_amp=0.22, jump_vel=DEFAULT_JUMP_VEL, gravity=DEFAULT_GRAVITY, jump_forward=PACMAN_JUMP_FORWARD, forward_dir=PACMAN_JUMP_FORWARD_DIR, position=(0,0,0), parent=None):
     if viz is None:
@@ -88,7 +205,7 @@ def run_pacman_animation(asset_relative='assets/PacMan.glb', base_scale=PACMAN_S
     except Exception:
         pass
 
-    def _set_jump_params(new_forward_dir=None, new_jump_forward=None, new_jump_vel=None, new_gravity=None):
+    def _set_jump_params(new_forward_dir=None, new_jump_forward=None, new_jump_vel=None, new_gravity=None, new_clamp=None):
         params = getattr(root, '_anim_params', None)
         if params is None:
             return
@@ -100,6 +217,8 @@ def run_pacman_animation(asset_relative='assets/PacMan.glb', base_scale=PACMAN_S
             params['jump_vel'] = new_jump_vel
         if new_gravity is not None:
             params['gravity'] = new_gravity
+        if new_clamp is not None:
+            params['clamp'] = new_clamp
     try:
         root.set_jump_params = _set_jump_params
     except Exception:
@@ -109,103 +228,9 @@ def run_pacman_animation(asset_relative='assets/PacMan.glb', base_scale=PACMAN_S
     except Exception:
         pass
 
-    import math
-
     def _update():
-        tnow = viz.getFrameTime()
-        dt = tnow - state.get('last_t', tnow)
-        state['last_t'] = tnow
-
-        if state['mode'] == 'squash':
-            elapsed = tnow - state.get('start_time', tnow)
-            theta = 2.0 * math.pi * freq_hz * elapsed
-            val = (math.sin(theta) + 1.0) * 0.5
-
-            sx = base_scale * (1.0 + width_amp * val)
-            sy = base_scale * (1.0 - height_amp * val)
-            sz = base_scale * (1.0 + width_amp * val)
-            try:
-                root.setScale([sx, sy, sz])
-            except Exception:
-                pass
-            prev_phase = state.get('prev_phase', None)
-            phase = math.sin(theta)
-            if prev_phase is None:
-                state['prev_phase'] = phase
-            else:
-                if state.get('passed_peak', False) is False and phase > 0.9:
-                    state['passed_peak'] = True
-                if state.get('passed_peak', False) and abs(phase) < 0.05:
-                    state['mode'] = 'jump'
-                    params = getattr(root, '_anim_params', None)
-                    jf = jump_forward
-                    jv = jump_vel
-                    gr = gravity
-                    fd = forward_dir
-                    if isinstance(params, dict):
-                        jf = params.get('jump_forward', jf)
-                        jv = params.get('jump_vel', jv)
-                        gr = params.get('gravity', gr)
-                        fd = params.get('forward_dir', fd)
-                    state['vy'] = jv
-                    time_to_land = (2.0 * jv / gr) if gr != 0 else 0.0
-                    if time_to_land > 1e-6 and jf:
-                        state['forward_speed'] = float(jf) / float(time_to_land)
-                    else:
-                        state['forward_speed'] = 0.0
-                    try:
-                        fx, fy, fz = fd
-                        mag = math.hypot(math.hypot(fx, fy), fz)
-                        if mag > 1e-6:
-                            state['forward_dir'] = (fx/mag, fy/mag, fz/mag)
-                        else:
-                            state['forward_dir'] = (0.0, 0.0, 1.0)
-                    except Exception:
-                        state['forward_dir'] = (0.0, 0.0, 1.0)
-                    state['passed_peak'] = False
-                    try:
-                        root.setScale([base_scale, base_scale, base_scale])
-                    except Exception:
-                        pass
-        elif state['mode'] == 'jump':
-            vy = state.get('vy', 0.0)
-            vy -= gravity * dt
-            state['vy'] = vy
-            state['y'] += vy * dt
-            try:
-                curx, cury, curz = root.getPosition()
-            except Exception:
-                curx, cury, curz = state.get('base_x', px), state.get('y', py), state.get('base_z', pz)
-            fdx, fdy, fdz = state.get('forward_dir', (0.0, 0.0, 1.0))
-            fs = state.get('forward_speed', 0.0)
-            curx += fdx * fs * dt
-            curz += fdz * fs * dt
-            try:
-                root.setPosition([curx, state['y'], curz])
-            except Exception:
-                pass
-            try:
-                root.setScale([base_scale, base_scale, base_scale])
-            except Exception:
-                pass
-            base_y = state.get('base_y', py)
-            if state['y'] <= base_y:
-
-                try:
-                    landed_x, _, landed_z = root.getPosition()
-                except Exception:
-                    landed_x, landed_z = state.get('base_x', px), state.get('base_z', pz)
-                state['y'] = base_y
-                state['vy'] = 0.0
-                try:
-                    root.setPosition([landed_x, base_y, landed_z])
-                except Exception:
-                    pass
-                state['base_x'] = landed_x
-                state['base_z'] = landed_z
-                state['start_time'] = viz.getFrameTime()
-                state['mode'] = 'squash'
-                state['last_t'] = viz.getFrameTime()
+        _step_hop(root, state, viz.getFrameTime(), base_scale, freq_hz, width_amp, height_amp,
+                  jump_forward, jump_vel, gravity, forward_dir, px, py, pz)
 
     try:
         vizact.ontimer(0, _update)
@@ -219,6 +244,69 @@ def run_pacman_animation(asset_relative='assets/PacMan.glb', base_scale=PACMAN_S
     return root
 
 
+class HeadlessPacMan:
+    # scene-free stand-in for the node returned by run_pacman_animation; the owner advances it with step(tnow)
+    def __init__(self, position=(0, 0, 0), base_scale=PACMAN_SIZE, freq_hz=DEFAULT_SQUASH_FREQ_HZ, width_amp=0.22, height_amp=0.22,
+                 jump_vel=DEFAULT_JUMP_VEL, gravity=DEFAULT_GRAVITY, jump_forward=PACMAN_JUMP_FORWARD, forward_dir=PACMAN_JUMP_FORWARD_DIR, tnow=0.0):
+        px, py, pz = position
+        self._pos = [px, py, pz]
+        self._scale = [base_scale, base_scale, base_scale]
+        self._euler = [0.0, 0.0, 0.0]
+        self._args = (base_scale, freq_hz, width_amp, height_amp, jump_forward, jump_vel, gravity, forward_dir, px, py, pz)
+        self._anim_params = {
+            'jump_forward': jump_forward,
+            'forward_dir': forward_dir,
+            'jump_vel': jump_vel,
+            'gravity': gravity
+        }
+        self._pm_state = {
+            'mode': 'squash',
+            'time': 0.0,
+            'vy': 0.0,
+            'y': py,
+            'start_time': tnow,
+            'last_t': tnow,
+            'base_x': px,
+            'base_y': py,
+            'base_z': pz
+        }
+
+    def set_jump_params(self, new_forward_dir=None, new_jump_forward=None, new_jump_vel=None, new_gravity=None, new_clamp=None):
+        params = self._anim_params
+        if new_forward_dir is not None:
+            params['forward_dir'] = new_forward_dir
+        if new_jump_forward is not None:
+            params['jump_forward'] = new_jump_forward
+        if new_jump_vel is not None:
+            params['jump_vel'] = new_jump_vel
+        if new_gravity is not None:
+            params['gravity'] = new_gravity
+        if new_clamp is not None:
+            params['clamp'] = new_clamp
+
+    def step(self, tnow):
+        _step_hop(self, self._pm_state, tnow, *self._args)
+
+    def setPosition(self, pos, *args):
+        x, y, z = pos
+        self._pos = [x, y, z]
+
+    def getPosition(self, *args):
+        return list(self._pos)
+
+    def setScale(self, scale, *args):
+        self._scale = list(scale)
+
+    def getScale(self, *args):
+        return list(self._scale)
+
+    def setEuler(self, euler, *args):
+        self._euler = list(euler)
+
+    def getEuler(self, *args):
+        return list(self._euler)
+
+
 if __name__ == '__main__':
     node = run_pacman_animation()
     if node is None:
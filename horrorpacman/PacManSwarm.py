@@ -0,0 +1,224 @@
+import os
+import math
+try:
+    import numpy as np
+except Exception:
+    np = None
+import viz
+import vizshape
+from GridNav import NO_CELL
+from ChaserFields import FieldBank
+from PacManAI import PACMAN_SCALE, PACMAN_Y, PACMAN_RADIUS, PACMAN_TURN_RATE
+
+SWARM_ASSET = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'PacMan.glb')
+SWARM_SPEED = 4.0
+SWARM_POUNCE_SPEED = 6.0
+SWARM_CHASE_CELLS = 12
+SWARM_REACH_EPS = 0.05
+SWARM_ANIM_FREQ = 1.0
+SWARM_ANIM_W_AMP = 0.2
+SWARM_ANIM_H_AMP = 0.22
+SWARM_POUNCE_DIST = (PACMAN_RADIUS + 0.22) + 0.6
+SWARM_CATCH_DIST = PACMAN_RADIUS + 0.22
+
+MODE_WANDER = 0
+MODE_CHASE = 1
+MODE_POUNCE = 2
+
+_FAR = 1 << 30
+
+
+class PacManSwarm:
+    def __init__(self, template, count, fields=None, spawn_cells=None):
+        if np is None:
+            raise RuntimeError('PacManSwarm requires NumPy')
+        self.template = template
+        self.count = count
+        self.rows = template.rows
+        self.cols = template.cols
+        self.fields = fields if fields is not None else FieldBank(template._walkable, self.rows, self.cols, kernels=template._kernels)
+        n_cells = self.rows * self.cols
+        walk = np.frombuffer(bytes(template._walkable), dtype=np.uint8).astype(bool)
+        idx = np.arange(n_cells, dtype=np.int32)
+        r = idx // self.cols
+        c = idx % self.cols
+        nbr = np.full((n_cells, 4), NO_CELL, dtype=np.int32)
+        for k, (dr, dc) in enumerate(((1, 0), (-1, 0), (0, 1), (0, -1))):
+            nr = r + dr
+            nc = c + dc
+            ok = walk & (nr >= 0) & (nr < self.rows) & (nc >= 0) & (nc < self.cols)
+            nidx = np.where(ok, nr * self.cols + nc, 0)
+            ok &= walk[nidx]
+            nbr[:, k] = np.where(ok, nidx, NO_CELL)
+        self.nbr = nbr
+        self.cell_x = np.zeros(n_cells, dtype=np.float64)
+        self.cell_z = np.zeros(n_cells, dtype=np.float64)
+        for i in range(n_cells):
+            self.cell_x[i], self.cell_z[i] = template.grid_to_world(i // self.cols, i % self.cols)
+
+        tours = template._tours or [[int(i) for i in np.nonzero(walk)[0][:1]]]
+        self.tour_cells = np.array([cell for tour in tours for cell in tour], dtype=np.int32)
+        lengths = np.array([len(tour) for tour in tours], dtype=np.int32)
+        self.tour_start = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int32)
+        self.tour_len = lengths
+        self.tour_of_id = np.full(n_cells, NO_CELL, dtype=np.int32)
+        self.tour_of_pos = np.zeros(n_cells, dtype=np.int32)
+        for cell, (tour_id, pos) in template._tour_of.items():
+            self.tour_of_id[cell] = tour_id
+            self.tour_of_pos[cell] = pos
+        self.tour_step = np.frombuffer(template._tour_step, dtype=np.int32).copy()
+
+        if spawn_cells is None:
+            spawn_cells = template.spread_cells(count)
+        spawn = np.array([rc[0] * self.cols + rc[1] for rc in spawn_cells], dtype=np.int32)
+        spawn = np.resize(spawn, count)
+        self.x = self.cell_x[spawn].copy()
+        self.z = self.cell_z[spawn].copy()
+        self.yaw = np.zeros(count, dtype=np.float64)
+        self.mode = np.zeros(count, dtype=np.int8)
+        self.target = spawn.copy()
+        self.tour_id = np.maximum(self.tour_of_id[spawn], 0)
+        self.tour_pos = self.tour_of_pos[spawn].copy()
+        self.phase = np.linspace(0.0, 1.0, count, endpoint=False)
+        self.caught_player = False
+        self._prev_player = None
+        self.nodes = [self._make_node() for _ in range(count)]
+        self._push_transforms(np.ones(count, dtype=bool))
+
+    def _make_node(self):
+        parent = self.template.map_root if self.template.use_local else None
+        node = None
+        if getattr(self, '_proto', None) is not None:
+            try:
+                node = self._proto.clone()
+            except Exception:
+                node = None
+        if node is None:
+            node = viz.addGroup()
+            if os.path.exists(SWARM_ASSET):
+                body = viz.addChild(SWARM_ASSET)
+            else:
+                body = vizshape.addSphere(radius=0.5)
+            body.setParent(node)
+            try:
+                node.disable(viz.LIGHTING)
+                node.color(1.0, 0.9, 0.05)
+            except Exception:
+                pass
+            self._proto = node
+        if parent is not None:
+            try:
+                node.setParent(parent)
+            except Exception:
+                pass
+        return node
+
+    def _player_local(self, player_world_pos):
+        px, py, pz = player_world_pos
+        t = self.template
+        if t.use_local and t.map_root is not None:
+            mx, my, mz = t.map_root.getPosition()
+            return px - mx, pz - mz
+        return px, pz
+
+    def _player_field(self):
+        field = self.fields.player_field
+        if isinstance(field, np.ndarray):
+            return field
+        return np.frombuffer(field, dtype=np.int32)
+
+    def update(self, dt, player_world_pos):
+        px, pz = self._player_local(player_world_pos)
+        self.fields.observe_player(self.template.world_to_grid(px, pz), px, pz)
+        pf = self._player_field()
+
+        dx = px - self.x
+        dz = pz - self.z
+        dist_player = np.hypot(dx, dz)
+        geo = pf[self.target]
+        self.mode[:] = MODE_WANDER
+        self.mode[(geo >= 0) & (geo <= SWARM_CHASE_CELLS)] = MODE_CHASE
+        self.mode[dist_player <= SWARM_POUNCE_DIST] = MODE_POUNCE
+
+        tx = self.cell_x[self.target]
+        tz = self.cell_z[self.target]
+        arrived = np.hypot(tx - self.x, tz - self.z) < SWARM_REACH_EPS
+        if arrived.any():
+            self._advance_targets(np.nonzero(arrived)[0], pf)
+            tx = self.cell_x[self.target]
+            tz = self.cell_z[self.target]
+
+        pounce = self.mode == MODE_POUNCE
+        x0 = self.x.copy()
+        z0 = self.z.copy()
+        mx = np.where(pounce, dx, tx - self.x)
+        mz = np.where(pounce, dz, tz - self.z)
+        seg = np.hypot(mx, mz)
+        speed = np.where(pounce, SWARM_POUNCE_SPEED, SWARM_SPEED)
+        step = np.minimum(speed * dt, seg)
+        moving = seg > 1e-6
+        inv = np.where(moving, 1.0 / np.maximum(seg, 1e-6), 0.0)
+        self.x += mx * inv * step
+        self.z += mz * inv * step
+
+        desired = np.degrees(np.arctan2(mx, mz))
+        delta = (desired - self.yaw + 180.0) % 360.0 - 180.0
+        max_turn = PACMAN_TURN_RATE * dt
+        turning = moving & (np.abs(delta) > 1e-3)
+        self.yaw = np.where(turning, (self.yaw + np.clip(delta, -max_turn, max_turn)) % 360.0, self.yaw)
+
+        self.phase = (self.phase + SWARM_ANIM_FREQ * dt) % 1.0
+        self._push_transforms(turning)
+
+        # closest approach of each agent to the player over the frame, both moving linearly
+        ppx, ppz = self._prev_player if self._prev_player is not None else (px, pz)
+        self._prev_player = (px, pz)
+        rx = x0 - ppx
+        rz = z0 - ppz
+        vx = (self.x - x0) - (px - ppx)
+        vz = (self.z - z0) - (pz - ppz)
+        vv = vx * vx + vz * vz
+        t = np.clip(-(rx * vx + rz * vz) / np.maximum(vv, 1e-12), 0.0, 1.0)
+        closest = np.hypot(rx + vx * t, rz + vz * t)
+        self.caught_player = bool((closest <= SWARM_CATCH_DIST + np.where(pounce, 0.15, 0.0)).any())
+        return self.caught_player
+
+    def _advance_targets(self, agents, pf):
+        cur = self.target[agents]
+        chase = self.mode[agents] != MODE_WANDER
+
+        nb = self.nbr[cur]
+        nd = np.where(nb >= 0, pf[np.maximum(nb, 0)], _FAR)
+        nd = np.where(nd < 0, _FAR, nd)
+        best = nd.argmin(axis=1)
+        lane = np.arange(len(agents))
+        here = pf[cur]
+        downhill = (nd[lane, best] < here) & (here > 0)
+        chase_next = np.where(downhill, nb[lane, best], cur)
+
+        tid = self.tour_id[agents]
+        pos = self.tour_pos[agents]
+        on_tour = self.tour_cells[self.tour_start[tid] + pos] == cur
+        resync = ~on_tour & (self.tour_of_id[cur] >= 0)
+        tid = np.where(resync, self.tour_of_id[cur], tid)
+        pos = np.where(resync, self.tour_of_pos[cur], pos)
+        on_tour |= resync
+        pos = np.where(on_tour, (pos + 1) % self.tour_len[tid], pos)
+        step = self.tour_step[cur]
+        wander_next = np.where(on_tour, self.tour_cells[self.tour_start[tid] + pos], np.where(step >= 0, step, cur))
+        self.tour_id[agents] = tid
+        self.tour_pos[agents] = pos
+
+        self.target[agents] = np.where(chase, chase_next, wander_next)
+
+    def _push_transforms(self, turned):
+        s = np.maximum(0.0, np.sin(2.0 * math.pi * self.phase))
+        sx = (PACMAN_SCALE * (1.0 + SWARM_ANIM_W_AMP * s)).tolist()
+        sy = (PACMAN_SCALE * (1.0 - SWARM_ANIM_H_AMP * s)).tolist()
+        xs = self.x.tolist()
+        zs = self.z.tolist()
+        for i, node in enumerate(self.nodes):
+            node.setPosition([xs[i], PACMAN_Y, zs[i]])
+            node.setScale([sx[i], sy[i], sx[i]])
+        for i in np.nonzero(turned)[0].tolist():
+            self.nodes[i].setEuler([float(self.yaw[i]), 0, 0])
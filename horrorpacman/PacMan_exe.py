@@ -35,6 +35,8 @@ def _delayed_spawn():
             from PacManAI import PacManChaser
             game.pacman_ai = PacManChaser(map_root=parent_root, existing_node=pm_node)
             print('[ExE] PacMan AI attached after delay')
+            game.spawn_extra_chasers(game.pacman_ai)
+            game.spawn_pacman_swarm(game.pacman_ai)
         except Exception:
             print('[ExE] PacMan AI attach failed after delay:')
             traceback.print_exc()
@@ -4,25 +4,44 @@ import vizshape
 import math
 import os
 import random
-from MapLoader import build_and_attach_map
+from MapLoader import build_and_attach_map, PACMAP_PARTS
 from PacManAI import PacManChaser
+from ChaserCoop import CoopPlanner, OccupancyGrid
+from ChaserFields import FieldBank
+import Hearing
+from GridNav import build_walkable_mask
+from GridCollide import TileGrid, GridRaycaster, WallSDF
+from WallBVH import load_or_build_wall_bvh
+from RayCoherence import RayCoherenceCache
+from SceneRays import SceneRayBatch, SceneHit, NO_HIT
 import codecs
 
 PLAYER_SPEED        = 6.0
+PLAYER_SPRINT_MULT  = 1.6
 PLAYER_RADIUS       = 0.22
 PLAYER_MODEL_SCALE  = 0.35
 PLAYER_Y_OFFSET     = 0 
 ASSET_PLAYER_GLTF   = os.path.join('assets','Person.glb')
 CELL_SIZE           = 3.0  
 PASSABLE_EMOJIS     = {'🟨','🟪','🟦'}  
+MOVE_PASSABLE_EMOJIS = PASSABLE_EMOJIS | {'🟩'}  # lock/escape cells are blocked by their meshes
 CENTERING_STRENGTH  = 6.0  
 PLAYER_COLLISION_ENABLED = False  
 
 USE_RAYCAST_COLLISION = True  
+USE_SWEPT_GRID_COLLISION = False
+USE_GRID_RAYCASTS = False
+USE_WALL_BVH = False
+USE_WALL_SDF = True
+USE_RAY_COHERENCE = True
+WALL_SDF_MARGIN = 0.05
 COLLISION_BUFFER    = 0.3  
+MOVE_SUBSTEP_DIST   = 0.25
+MOVE_MAX_SUBSTEPS   = 8
 COLLISION_RAYS      = 3   
 CAMERA_COLLISION_ENABLED = True  
 COLLISION_SIMPLE_MODE = False  
+SCENE_RAY_REPORT    = False  
 
 FIRST_PERSON        = True
 CAMERA_DISTANCE_TP  = 4.5 
@@ -51,6 +70,9 @@ PLAYER_ROTATION_SPEED = 12.0
 PLAYER_ACCEL_TIME = 0.15       
 
 PACMAN_JUMP_DISTANCE = 3.0  
+PACMAN_COUNT = 1
+PACMAN_PERSONALITIES = ('chase', 'ambush', 'flank', 'shy')
+PACMAN_SWARM_COUNT = 0
 
 def clamp(v,a,b): return max(a,min(v,b))
 def lerp(a,b,t): return a + (b-a)*t
@@ -121,7 +143,7 @@ def load_model(asset_path, scale, tint=None, fallback_color=(0.9,0.85,0.15)):
             g.color(*tint)
         except:
             pass
-    return 
+    return g
 viz.setMultiSample(4)
 
 try: from window_utils import _maximize_window; _maximize_window()
@@ -152,6 +174,13 @@ _grid_rows = 0
 _grid_cols = 0
 _grid_origin_x = 0.0
 _grid_origin_z = 0.0
+_tile_grid = None
+_move_grid = None
+_grid_rays = None
+_wall_bvh = None
+_wall_sdf = None
+_ray_cache = RayCoherenceCache() if USE_RAY_COHERENCE else None
+_scene_rays = SceneRayBatch(viz.intersect)
 try:
     _grid_path = os.path.normpath(os.path.join(os.path.dirname(__file__),'..','Map_Grid.txt'))
     if os.path.exists(_grid_path):
@@ -169,10 +198,34 @@ try:
         _grid_origin_x = cx - (grid_w/2.0) + (CELL_SIZE/2.0)
         _grid_origin_z = cz - (grid_d/2.0) + (CELL_SIZE/2.0)
         print('[Map] Player grid loaded rows=%d cols=%d origin=(%.2f,%.2f)' % (_grid_rows,_grid_cols,_grid_origin_x,_grid_origin_z))
+        _tile_grid = TileGrid(build_walkable_mask(_grid,_grid_rows,_grid_cols,PASSABLE_EMOJIS),_grid_rows,_grid_cols,_grid_origin_x,_grid_origin_z,CELL_SIZE)
+        if _ray_cache is not None:
+            _ray_cache.set_face_grid(CELL_SIZE, _grid_origin_x, _grid_origin_z)
+        _move_grid = TileGrid(build_walkable_mask(_grid,_grid_rows,_grid_cols,MOVE_PASSABLE_EMOJIS),_grid_rows,_grid_cols,_grid_origin_x,_grid_origin_z,CELL_SIZE)
+        if USE_GRID_RAYCASTS:
+            try:
+                _grid_rays = GridRaycaster(_tile_grid)
+            except Exception as e:
+                print('[Map] Grid raycaster unavailable, using viz.intersect:', e)
+        if USE_WALL_SDF:
+            try:
+                _wall_sdf = WallSDF(_tile_grid)
+            except Exception as e:
+                print('[Map] Wall SDF unavailable:', e)
     else:
         print('[Map] Grid file missing for player collision -> no wall blocking')
 except Exception as e:
     print('[Map] Grid load error:', e)
+if USE_WALL_BVH:
+    try:
+        _wall_bvh = load_or_build_wall_bvh([os.path.join('assets', w) for w in PACMAP_PARTS.get('walls', [])])
+        if _wall_bvh is not None:
+            _grid_rays = _wall_bvh
+            print('[Map] Wall BVH ready tris=%d nodes=%d' % (len(_wall_bvh.tris), len(_wall_bvh.left)))
+        else:
+            print('[Map] Wall meshes missing or empty -> no BVH raycasts')
+    except Exception as e:
+        print('[Map] Wall BVH unavailable:', e)
 
 def _world_to_grid(x,z):
     if _grid_rows == 0 or _grid_cols == 0:
@@ -217,6 +270,11 @@ def check_collision_raycast(from_pos, to_pos, check_height=1.0):
     
     dir_x = dx / move_dist
     dir_z = dz / move_dist
+
+    if _grid_rays is not None:
+        return _check_collision_grid_rays(fx, fz, ty, dir_x, dir_z, move_dist)
+    if _ray_cache is not None:
+        return _check_collision_coherent(fx, fy, fz, ty, dir_x, dir_z, move_dist)
     
     collided = False
     min_safe_fraction = 1.0
@@ -227,7 +285,7 @@ def check_collision_raycast(from_pos, to_pos, check_height=1.0):
     ray_end = [tx, test_y, tz]
     
     try:
-        info = viz.intersect(ray_start, ray_end)
+        info = _scene_rays.intersect(ray_start, ray_end)
         if info.valid:
             hit_point = info.point
             hit_height = hit_point[1]
@@ -253,7 +311,7 @@ def check_collision_raycast(from_pos, to_pos, check_height=1.0):
             ray_end_rot = [fx + rotated_x * ray_length, test_y, fz + rotated_z * ray_length]
             
             try:
-                info = viz.intersect(ray_start, ray_end_rot)
+                info = _scene_rays.intersect(ray_start, ray_end_rot)
                 if info.valid:
                     hit_point = info.point
                     hit_height = hit_point[1]
@@ -275,6 +333,11 @@ def check_collision_raycast(from_pos, to_pos, check_height=1.0):
     return collided, to_pos
 
 def slide_collision(from_pos, desired_pos, check_height=1.0):
+    if _wall_sdf is not None:
+        # nothing can be hit within this step: skip the ray tests
+        step = math.hypot(desired_pos[0] - from_pos[0], desired_pos[2] - from_pos[2])
+        if _wall_sdf.sample(from_pos[0], from_pos[2]) > step + COLLISION_BUFFER + WALL_SDF_MARGIN:
+            return desired_pos
 
     collided, safe_pos = check_collision_raycast(from_pos, desired_pos, check_height)
     
@@ -308,6 +371,77 @@ def slide_collision(from_pos, desired_pos, check_height=1.0):
     
     return safe_pos
 
+_CONE_COS = math.cos(math.radians(30.0))
+_CONE_SIN = math.sin(math.radians(30.0))
+
+def _check_collision_grid_rays(fx, fz, ty, dir_x, dir_z, move_dist):
+    cone = COLLISION_RAYS > 1 and not COLLISION_SIMPLE_MODE
+    if cone:
+        rx = [dir_x, dir_x*_CONE_COS + dir_z*_CONE_SIN, dir_x*_CONE_COS - dir_z*_CONE_SIN]
+        rz = [dir_z, -dir_x*_CONE_SIN + dir_z*_CONE_COS, dir_x*_CONE_SIN + dir_z*_CONE_COS]
+        lengths = [move_dist, move_dist + COLLISION_BUFFER, move_dist + COLLISION_BUFFER]
+    else:
+        rx, rz, lengths = [dir_x], [dir_z], [move_dist]
+    dist, _ = _grid_rays.cast([fx]*len(rx), [fz]*len(rx), rx, rz, lengths)
+    hits = [d for d, l in zip(dist.tolist(), lengths) if d < l]
+    if not hits:
+        return False, [fx + dir_x*move_dist, ty, fz + dir_z*move_dist]
+    hit_dist = dist[0] if dist[0] < lengths[0] else min(hits)
+    safe = max(0.0, float(hit_dist) - COLLISION_BUFFER)
+    fraction = min(1.0, safe / move_dist)
+    return True, [fx + dir_x*move_dist*fraction, ty, fz + dir_z*move_dist*fraction]
+
+def _grid_intersect(start, end):
+    # budget fallback for _scene_rays: the segment against the wall tiles, projected onto the floor
+    sx, sy, sz = start
+    dx, dy, dz = end[0]-sx, end[1]-sy, end[2]-sz
+    flat = math.hypot(dx, dz)
+    if flat < 1e-9:
+        return NO_HIT
+    d = _tile_grid.raycast(sx, sz, dx, dz, flat)
+    if d >= flat:
+        return NO_HIT
+    f = d / flat
+    hx, hz = sx + dx*f, sz + dz*f
+    u = (hx - _grid_origin_x) / CELL_SIZE + 0.5
+    if abs(u - round(u)) < 1e-6:
+        normal = (-1.0 if dx > 0 else 1.0, 0.0, 0.0)
+    else:
+        normal = (0.0, 0.0, -1.0 if dz > 0 else 1.0)
+    return SceneHit((hx, sy + dy*f, hz), normal)
+if _tile_grid is not None:
+    _scene_rays.fallback = _grid_intersect
+
+def _intersect_flat(ox, y, oz, dx, dz, reach):
+    try:
+        info = _scene_rays.intersect([ox, y, oz], [ox + dx*reach, y, oz + dz*reach])
+    except Exception:
+        return None
+    if not info.valid or abs(info.point[1] - y) >= 0.8:
+        return None
+    hx, hz = info.point[0], info.point[2]
+    try:
+        nx, nz = info.normal[0], info.normal[2]
+    except Exception:
+        nx = nz = 0.0
+    return math.hypot(hx - ox, hz - oz), hx, hz, nx, nz
+
+def _check_collision_coherent(fx, fy, fz, ty, dir_x, dir_z, move_dist):
+    test_y = fy + 0.8
+    hit = _ray_cache.distance(fx, test_y, fz, dir_x, dir_z, move_dist, _intersect_flat)
+    if hit is None and COLLISION_RAYS > 1 and not COLLISION_SIMPLE_MODE:
+        for rx, rz in ((dir_x*_CONE_COS + dir_z*_CONE_SIN, -dir_x*_CONE_SIN + dir_z*_CONE_COS),
+                       (dir_x*_CONE_COS - dir_z*_CONE_SIN, dir_x*_CONE_SIN + dir_z*_CONE_COS)):
+            hit = _ray_cache.distance(fx, test_y, fz, rx, rz, move_dist + COLLISION_BUFFER, _intersect_flat)
+            if hit is not None:
+                break
+    if hit is None:
+        return False, [fx + dir_x*move_dist, ty, fz + dir_z*move_dist]
+    fraction = max(0.0, hit - COLLISION_BUFFER) / move_dist
+    if fraction >= 1.0:
+        return True, [fx + dir_x*move_dist, ty, fz + dir_z*move_dist]
+    return True, [fx + dir_x*move_dist*fraction, ty, fz + dir_z*move_dist*fraction]
+
 def check_camera_collision(cam_pos, target_pos):
     if not CAMERA_COLLISION_ENABLED:
         return cam_pos
@@ -327,8 +461,28 @@ def check_camera_collision(cam_pos, target_pos):
             cz = tz - min_distance
         cam_pos = [cx, cy, cz]
     
+    if _grid_rays is not None:
+        hx, hz = cam_pos[0] - tx, cam_pos[2] - tz
+        flat = math.hypot(hx, hz)
+        if flat > 1e-6:
+            dist, _ = _grid_rays.cast([tx], [tz], [hx], [hz], [flat])
+            if dist[0] < flat:
+                f = max(0.0, (float(dist[0]) - COLLISION_BUFFER) / flat)
+                return [tx + (cam_pos[0]-tx)*f, ty + (cam_pos[1]-ty)*f, tz + (cam_pos[2]-tz)*f]
+        return cam_pos
+
+    if _wall_sdf is not None:
+        hx, hz = cam_pos[0] - tx, cam_pos[2] - tz
+        flat = math.hypot(hx, hz)
+        if flat > 1e-6:
+            hit = _wall_sdf.sphere_trace(tx, tz, hx, hz, flat, COLLISION_BUFFER)
+            if hit < flat:
+                f = hit / flat
+                return [tx + (cam_pos[0]-tx)*f, ty + (cam_pos[1]-ty)*f, tz + (cam_pos[2]-tz)*f]
+        return cam_pos
+
     try:
-        info = viz.intersect(target_pos, cam_pos)
+        info = _scene_rays.intersect(target_pos, cam_pos)
         if info.valid:
             hit_point = info.point
             hx, hy, hz = hit_point
@@ -349,6 +503,54 @@ def check_camera_collision(cam_pos, target_pos):
     
     return cam_pos
 
+pacman_extra = []
+coop_planner = None
+pacman_swarm = None
+
+def spawn_extra_chasers(first):
+    global coop_planner
+    if PACMAN_COUNT <= 1 or first is None or coop_planner is not None:
+        return
+    try:
+        coop_planner = CoopPlanner(first._walkable, first.rows, first.cols)
+        coop_planner.attach(first)
+        occupancy = OccupancyGrid(first.rows, first.cols)
+        first.attach_occupancy(occupancy)
+        fields = FieldBank(first._walkable, first.rows, first.cols, kernels=coop_planner.kernels)
+        first.assign_personality(PACMAN_PERSONALITIES[0], fields=fields)
+        for i, rc in enumerate(first.spread_cells(PACMAN_COUNT)[1:], 1):
+            personality = PACMAN_PERSONALITIES[i % len(PACMAN_PERSONALITIES)]
+            pacman_extra.append(PacManChaser(map_root=pacmap_root, spawn_rc=rc, coop=coop_planner,
+                                             personality=personality, fields=fields, partner=first,
+                                             occupancy=occupancy))
+        print('[PacMan] Spawned %d cooperative chasers' % (1 + len(pacman_extra)))
+    except Exception as e:
+        print('[PacMan] Extra chaser spawn failed:', e)
+
+def spawn_pacman_swarm(first):
+    global pacman_swarm
+    if PACMAN_SWARM_COUNT <= 0 or first is None or pacman_swarm is not None:
+        return
+    try:
+        from PacManSwarm import PacManSwarm
+        pacman_swarm = PacManSwarm(first, PACMAN_SWARM_COUNT)
+        print('[PacMan] Spawned swarm of %d chasers' % PACMAN_SWARM_COUNT)
+    except Exception as e:
+        print('[PacMan] Swarm spawn failed:', e)
+
+def _on_player_caught():
+    print('[PacMan] Collision: player caught!')
+    try:
+        import Ambience
+        Ambience.play_death_sound()
+    except Exception:
+        pass
+    try:
+        import GameOver
+        GameOver.show_game_over_and_close()
+    except Exception as e:
+        print('[Player] Failed to trigger game over:', e)
+
 if not os.environ.get('EXTERNAL_PACMAN_AI'):
     pacman_ai = None
     def _spawn_pacman_ai():
@@ -363,17 +565,22 @@ if not os.environ.get('EXTERNAL_PACMAN_AI'):
                     except:
                         pass
                 print('[PacMan] AI spawned after 3s delay (jump distance: %.1f)' % PACMAN_JUMP_DISTANCE)
+                spawn_extra_chasers(pacman_ai)
+                spawn_pacman_swarm(pacman_ai)
             except Exception as e:
                 print('[PacMan] AI spawn failed:', e)
     vizact.ontimer(3.0, _spawn_pacman_ai)
 else:
     pacman_ai = None  
 
-keys = {'w':False,'a':False,'s':False,'d':False}
+keys = {'w':False,'a':False,'s':False,'d':False,'sprint':False}
 def set_key(k,s): keys[k]=s
 for k in ['w','a','s','d']:
     vizact.onkeydown(k,lambda kk=k:set_key(kk,True))
     vizact.onkeyup(k,lambda kk=k:set_key(kk,False))
+vizact.onkeydown(viz.KEY_SHIFT_L, lambda: set_key('sprint',True))
+vizact.onkeyup(viz.KEY_SHIFT_L, lambda: set_key('sprint',False))
+_sprint_noise_timer = 0.0
 vizact.onkeydown(viz.KEY_ESCAPE, lambda: viz.quit())
 
 def toggle_mouse():
@@ -521,6 +728,22 @@ def update_camera(dt):
     viz.MainView.setPosition(cam_pos)
     viz.MainView.lookat(look_at)
     return hfx,hfz 
+def _substepped_slide(x, y, z, desired_x, desired_z):
+    # a frame hitch is split into at most MOVE_MAX_SUBSTEPS slices; inner slices are clamped on the grid
+    dx = desired_x - x
+    dz = desired_z - z
+    n = min(MOVE_MAX_SUBSTEPS, int(math.ceil(math.hypot(dx, dz) / MOVE_SUBSTEP_DIST)))
+    if n <= 1:
+        return slide_collision([x, y, z], [desired_x, y, desired_z], check_height=CAMERA_HEIGHT_FP)
+    sx = dx / n
+    sz = dz / n
+    for _ in range(n - 1):
+        if _move_grid is not None:
+            x, z = _move_grid.clamp_move(x, z, sx, sz, margin=COLLISION_BUFFER)
+        else:
+            x, _, z = slide_collision([x, y, z], [x + sx, y, z + sz], check_height=CAMERA_HEIGHT_FP)
+    return slide_collision([x, y, z], [x + sx, y, z + sz], check_height=CAMERA_HEIGHT_FP)
+
 def on_update():
     try:
         import GameOver
@@ -539,6 +762,11 @@ def on_update():
         pass
     
     dt = viz.getFrameElapsed()
+    Hearing.advance(dt)
+    prev_pos = player.getPosition()
+    requested, issued, dropped = _scene_rays.begin_frame()
+    if SCENE_RAY_REPORT and _scene_rays.frame % 120 == 0:
+        print('[Rays] frame=%d requested=%d issued=%d dropped=%d' % (_scene_rays.frame, requested, issued, dropped))
     if CONTROLS_LOCKED or _END_LOCKED:
         try:
             if not FIRST_PERSON:
@@ -564,13 +792,18 @@ def on_update():
         vx /= l; vz /= l
         x,y,z = player.getPosition()
 
-        desired_x = x + vx*PLAYER_SPEED*dt
-        desired_z = z + vz*PLAYER_SPEED*dt
+        speed = PLAYER_SPEED * (PLAYER_SPRINT_MULT if keys['sprint'] else 1.0)
+        desired_x = x + vx*speed*dt
+        desired_z = z + vz*speed*dt
         desired_pos = [desired_x, y, desired_z]
 
-        if USE_RAYCAST_COLLISION:
-            from_pos = [x, y, z]
-            final_pos = slide_collision(from_pos, desired_pos, check_height=CAMERA_HEIGHT_FP)
+        if USE_SWEPT_GRID_COLLISION and _tile_grid is not None:
+            _tile_grid.move_circle(x, z, desired_x - x, desired_z - z, PLAYER_RADIUS + COLLISION_BUFFER)
+            if abs(_tile_grid.out_x - x) > 1e-6 or abs(_tile_grid.out_z - z) > 1e-6:
+                player.setPosition([_tile_grid.out_x, y, _tile_grid.out_z])
+                moved = True
+        elif USE_RAYCAST_COLLISION:
+            final_pos = _substepped_slide(x, y, z, desired_x, desired_z)
             if abs(final_pos[0] - x) > 1e-6 or abs(final_pos[2] - z) > 1e-6:
                 player.setPosition(final_pos)
                 moved = True
@@ -611,6 +844,13 @@ def on_update():
                         pz_new = z_cur + dz * pull
                         player.setPosition([px_new,y_cur,pz_new])
 
+        global _sprint_noise_timer
+        _sprint_noise_timer -= dt
+        if moved and keys['sprint'] and _sprint_noise_timer <= 0.0:
+            sx, sy, sz = player.getPosition()
+            Hearing.emit_noise(sx, sz, Hearing.NOISE_SPRINT)
+            _sprint_noise_timer = Hearing.NOISE_SPRINT_INTERVAL
+
         global player_yaw, player_target_yaw, player_velocity
         if not FIRST_PERSON:
             if moved and (mx != 0 or mz != 0):
@@ -619,19 +859,15 @@ def on_update():
                 player.setEuler([player_yaw, 0, 0])
     try:
         px, py, pz = player.getPosition()
-        pacman_ai.update(dt, (px, py, pz))
-        if pacman_ai.collides_with_point((px, py, pz), radius=PLAYER_RADIUS):
-            print('[PacMan] Collision: player caught!')
-            try:
-                import Ambience
-                Ambience.play_death_sound()
-            except Exception:
-                pass
-            try:
-                import GameOver
-                GameOver.show_game_over_and_close()
-            except Exception as e:
-                print('[Player] Failed to trigger game over:', e)
+        if coop_planner is not None:
+            coop_planner.update(dt)
+        for ai in [pacman_ai] + pacman_extra:
+            ai.update(dt, (px, py, pz))
+            if ai.swept_collides(prev_pos, (px, py, pz), radius=PLAYER_RADIUS, height=CAMERA_HEIGHT_FP):
+                _on_player_caught()
+                break
+        if pacman_swarm is not None and pacman_swarm.update(dt, (px, py, pz)):
+            _on_player_caught()
     except Exception:
         pass
 
@@ -639,6 +875,7 @@ vizact.ontimer(0,on_update)
 
 print('Controls:')
 print('  Move: W A S D')
+print('  Sprint: Shift (noisy)')
 print('  Quit:    Esc')
 print('  Mouse lock ON/OFF: Tab')
 print('  FP/TP toggle: F (InvertY FP:', INVERT_Y_FP, ', InvertY TP:', INVERT_Y_TP, ')')
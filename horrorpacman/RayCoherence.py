@@ -0,0 +1,92 @@
+import math
+
+COHERENCE_MOVE_THRESHOLD = 0.5
+COHERENCE_LOOKAHEAD = 1.0
+COHERENCE_ANGLE_BINS = 72
+COHERENCE_MAX_AGE = 12
+COHERENCE_LATERAL_TOLERANCE = 0.001
+
+
+class RayCoherenceCache:
+    # remembers the last hit face (or clear reach) per quantized ray direction;
+    # cast(ox, y, oz, dx, dz, reach) -> (dist, px, pz, nx, nz) or None
+    def __init__(self, move_threshold=COHERENCE_MOVE_THRESHOLD, lookahead=COHERENCE_LOOKAHEAD,
+                 angle_bins=COHERENCE_ANGLE_BINS, max_age=COHERENCE_MAX_AGE,
+                 lateral_tolerance=COHERENCE_LATERAL_TOLERANCE, face_size=None, face_origin=(0.0, 0.0)):
+        self.move_threshold = move_threshold
+        self.lookahead = lookahead
+        self.angle_bins = angle_bins
+        self.max_age = max_age
+        self.lateral_tolerance = lateral_tolerance
+        self.set_face_grid(face_size, *face_origin)
+        self._entries = {}
+        self.reused = 0
+        self.cast_count = 0
+
+    def set_face_grid(self, face_size, origin_x=0.0, origin_z=0.0):
+        # walls are tile faces of this size centred on the grid; without it hits are never reused
+        self.face_size = face_size
+        self.face_origin_x = origin_x
+        self.face_origin_z = origin_z
+        self._entries = {}
+
+    def clear(self):
+        self._entries.clear()
+
+    def _key(self, y, dx, dz):
+        a = int(round(math.atan2(dx, dz) * self.angle_bins / (2.0 * math.pi))) % self.angle_bins
+        return (a, int(round(y * 10.0)))
+
+    def _face_of(self, x, z, nx, nz):
+        # index of the tile face along the wall, or None when the wall is not grid aligned
+        if self.face_size is None:
+            return None
+        if abs(nx) > 0.99:
+            return int(math.floor((z - self.face_origin_z) / self.face_size + 0.5))
+        if abs(nz) > 0.99:
+            return int(math.floor((x - self.face_origin_x) / self.face_size + 0.5))
+        return None
+
+    def distance(self, ox, y, oz, dx, dz, length, cast):
+        # dx, dz must be unit length; returns hit distance along the ray, or None when clear within length
+        key = self._key(y, dx, dz)
+        e = self._entries.get(key)
+        if e is not None:
+            e[4] += 1
+            rx = ox - e[0]
+            rz = oz - e[1]
+            if math.hypot(rx, rz) < self.move_threshold and e[4] <= self.max_age:
+                cdx, cdz = e[2], e[3]
+                if e[5] is None:
+                    # the new segment must run along the cached clear ray, not beside it
+                    ex = rx + dx * length
+                    ez = rz + dz * length
+                    tol = self.lateral_tolerance
+                    if (rx * cdx + rz * cdz >= 0.0 and ex * cdx + ez * cdz <= e[6]
+                            and abs(rx * cdz - rz * cdx) <= tol and abs(ex * cdz - ez * cdx) <= tol):
+                        self.reused += 1
+                        return None
+                else:
+                    px, pz, nx, nz = e[5], e[6], e[7], e[8]
+                    denom = dx * nx + dz * nz
+                    if denom < -1e-3:
+                        t = ((px - ox) * nx + (pz - oz) * nz) / denom
+                        # the plane only stands in for the wall on the face that was hit
+                        if t >= 0.0 and self._face_of(ox + dx * t, oz + dz * t, nx, nz) == e[9]:
+                            self.reused += 1
+                            return t if t < length else None
+
+        reach = length + self.lookahead
+        self.cast_count += 1
+        res = cast(ox, y, oz, dx, dz, reach)
+        if res is None:
+            self._entries[key] = [ox, oz, dx, dz, 0, None, reach]
+            return None
+        dist, px, pz, nx, nz = res
+        n = math.hypot(nx, nz)
+        face = self._face_of(px, pz, nx / n, nz / n) if n > 0.5 else None
+        if face is not None:
+            self._entries[key] = [ox, oz, dx, dz, 0, px, pz, nx / n, nz / n, face]
+        else:
+            self._entries.pop(key, None)
+        return dist if dist < length else None
@@ -0,0 +1,81 @@
+SCENE_RAY_QUANTUM = 0.01
+SCENE_RAY_BUDGET = 0
+
+
+class _NoHit:
+    valid = False
+    point = (0.0, 0.0, 0.0)
+    normal = (0.0, 0.0, 0.0)
+    object = None
+
+
+NO_HIT = _NoHit()
+
+
+class SceneHit:
+    valid = True
+
+    def __init__(self, point, normal, object=None):
+        self.point = point
+        self.normal = normal
+        self.object = object
+
+
+class SceneRayBatch:
+    # single entry point for scene raycasts: segments whose endpoints agree to within
+    # quantum share one query per frame; budget > 0 caps issued queries, and queries over
+    # it reuse last frame's answer for the same segment or go to the cheap fallback
+    def __init__(self, intersect=None, quantum=SCENE_RAY_QUANTUM, budget=SCENE_RAY_BUDGET, fallback=None):
+        if intersect is None:
+            import viz
+            intersect = viz.intersect
+        self._intersect = intersect
+        self.fallback = fallback
+        self.inv_quantum = 1.0 / quantum
+        self.budget = budget
+        self._memo = {}
+        self._prev = {}
+        self.frame = 0
+        self.requested = 0
+        self.issued = 0
+        self.dropped = 0
+        self.last_counts = (0, 0, 0)
+
+    def begin_frame(self):
+        self.last_counts = (self.requested, self.issued, self.dropped)
+        self._prev = self._memo
+        self._memo = {}
+        self.requested = 0
+        self.issued = 0
+        self.dropped = 0
+        self.frame += 1
+        return self.last_counts
+
+    def _key(self, start, end):
+        q = self.inv_quantum
+        return (int(round(start[0] * q)), int(round(start[1] * q)), int(round(start[2] * q)),
+                int(round(end[0] * q)), int(round(end[1] * q)), int(round(end[2] * q)))
+
+    def intersect(self, start, end):
+        self.requested += 1
+        key = self._key(start, end)
+        info = self._memo.get(key)
+        if info is not None:
+            return info
+        if self.budget and self.issued >= self.budget:
+            self.dropped += 1
+            info = self._prev.get(key)
+            if info is None:
+                try:
+                    info = self.fallback(start, end) if self.fallback is not None else NO_HIT
+                except Exception:
+                    info = NO_HIT
+            self._memo[key] = info
+            return info
+        self.issued += 1
+        try:
+            info = self._intersect(start, end)
+        except Exception:
+            info = NO_HIT
+        self._memo[key] = info
+        return info
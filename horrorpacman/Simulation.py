@@ -0,0 +1,258 @@
+import math
+import random
+from collections import namedtuple
+
+import Hearing
+from GridNav import build_walkable_mask, build_nearest_walkable_table, build_toward_table, NO_CELL
+from GridCollide import TileGrid
+from ChaserCoop import CoopPlanner, OccupancyGrid
+from ChaserFields import FieldBank, PERSONALITIES
+from PacManAI import PacManChaser, _read_grid, GRID_FILE, CELL_SIZE, WALKABLE_EMOJIS, PACMAN_Y, PACMAN_SCALE, PACMAN_JUMP_DISTANCE
+from PacManLoaderAndAnimations import HeadlessPacMan
+from KeyLoader import key_candidate_cells, pick_spread_cells, KEY_COLORS
+from LockLoader import choose_lock_cells, lock_layout
+from Escape import find_escape_cells, ACTIVATE_DISTANCE_CELLS
+from KeyCollector import KEY_PICK_DISTANCE
+from LockUnlocker import UNLOCK_DISTANCE_CELLS
+
+SIM_DT = 1.0 / 60.0
+SIM_PACMAN_DELAY = 3.0
+SIM_PLAYER_SPEED = 6.0
+SIM_SPRINT_MULT = 1.6
+SIM_PLAYER_RADIUS = 0.22
+SIM_COLLISION_BUFFER = 0.3
+SIM_PLAYER_HEIGHT = 1.3
+SIM_NUM_KEYS = 3
+
+LOCK_CELL = '🟩'
+PLAYER_PASSABLE = WALKABLE_EMOJIS | {LOCK_CELL}
+
+RUNNING = 'running'
+CAUGHT = 'caught'
+ESCAPED = 'escaped'
+TIMEOUT = 'timeout'
+
+Action = namedtuple('Action', 'move_x move_z sprint interact activate')
+IDLE = Action(0.0, 0.0, False, False, False)
+
+
+class Simulation:
+    # the game rules on a fixed timestep with no renderer: grid-clamped player movement,
+    # PacManChaser on HeadlessPacMan nodes, key pickup, lock unlock and escape activation.
+    # PacManChaser draws from the global random module, so runs are reproducible per seed
+    # when simulations are run one after another. Noise goes to a queue of its own.
+    def __init__(self, seed=0, chasers=1, dt=SIM_DT, pacman_delay=SIM_PACMAN_DELAY, num_keys=SIM_NUM_KEYS, grid_path=GRID_FILE):
+        random.seed(seed)
+        self.hearing = Hearing.NoiseQueue()
+        self.seed = seed
+        self.dt = dt
+        self.pacman_delay = pacman_delay
+        self.chaser_count = chasers
+        self.grid = _read_grid(grid_path)
+        self.rows = len(self.grid)
+        self.cols = max((len(r) for r in self.grid), default=0)
+        self.origin_x = -(self.cols * CELL_SIZE) / 2.0 + CELL_SIZE / 2.0
+        self.origin_z = -(self.rows * CELL_SIZE) / 2.0 + CELL_SIZE / 2.0
+        self.mask = build_walkable_mask(self.grid, self.rows, self.cols, PLAYER_PASSABLE)
+        self.tiles = TileGrid(self.mask, self.rows, self.cols, self.origin_x, self.origin_z, CELL_SIZE)
+
+        self.keys = self._place_keys(num_keys)
+        self.locks = self._place_locks()
+        self.escape_pos = self._place_escape()
+        self.collected = []
+        self.unlocked = False
+
+        spawn = build_nearest_walkable_table(self.mask, self.rows, self.cols)[self.cell_of(0.0, 0.0)]
+        self.x, self.z = self.cell_center(spawn)
+        self.t = 0.0
+        self.frames = 0
+        self.status = RUNNING
+        self.chasers = []
+        self._sprint_noise_timer = 0.0
+
+    def cell_center(self, idx):
+        r, c = divmod(idx, self.cols)
+        return self.origin_x + c * CELL_SIZE, self.origin_z + (self.rows - 1 - r) * CELL_SIZE
+
+    def cell_of(self, x, z):
+        c = min(self.cols - 1, max(0, int(round((x - self.origin_x) / CELL_SIZE))))
+        grid_r = min(self.rows - 1, max(0, int(round((z - self.origin_z) / CELL_SIZE))))
+        return (self.rows - 1 - grid_r) * self.cols + c
+
+    def _place_keys(self, num_keys):
+        # KeyLoader's selection: random first key, then farthest-point picks
+        cells = pick_spread_cells(key_candidate_cells(self.grid), num_keys)
+        return [(KEY_COLORS[i % len(KEY_COLORS)],) + self.cell_center(r * self.cols + c) for i, (r, c) in enumerate(cells)]
+
+    def _place_locks(self):
+        # LockLoader's layout: green bottom, white top, yellow middle
+        pair = choose_lock_cells(self.grid)
+        if pair is None:
+            return []
+        top, bottom = [self.cell_center(r * self.cols + c) for r, c in pair]
+        layout = lock_layout((top[0], 0.0, top[1]), (bottom[0], 0.0, bottom[1]), cell_size=CELL_SIZE)
+        return [(color, layout[color][0], layout[color][2]) for color in ('green', 'white', 'yellow')]
+
+    def _place_escape(self):
+        # midpoint of Escape's vertical pair of lock cells
+        found = find_escape_cells(self.grid)
+        if found is None:
+            return None
+        r_top, r_bottom, c = found
+        a = self.cell_center(r_top * self.cols + c)
+        b = self.cell_center(r_bottom * self.cols + c)
+        return ((a[0] + b[0]) * 0.5, (a[1] + b[1]) * 0.5)
+
+    def _spawn_chasers(self):
+        first = PacManChaser(existing_node=self._make_node(), grid=self.grid, hearing=self.hearing)
+        self.chasers.append(first)
+        if self.chaser_count <= 1:
+            return
+        coop = CoopPlanner(first._walkable, first.rows, first.cols)
+        coop.attach(first)
+        occupancy = OccupancyGrid(first.rows, first.cols)
+        first.attach_occupancy(occupancy)
+        fields = FieldBank(first._walkable, first.rows, first.cols, kernels=coop.kernels)
+        first.assign_personality(PERSONALITIES[0], fields=fields)
+        self._coop = coop
+        for i, rc in enumerate(first.spread_cells(self.chaser_count)[1:], 1):
+            self.chasers.append(PacManChaser(existing_node=self._make_node(), spawn_rc=rc, coop=coop,
+                                             personality=PERSONALITIES[i % len(PERSONALITIES)],
+                                             fields=fields, partner=first, occupancy=occupancy,
+                                             grid=self.grid, hearing=self.hearing))
+
+    def _make_node(self):
+        return HeadlessPacMan(position=(0.0, PACMAN_Y, 0.0), base_scale=PACMAN_SCALE,
+                              jump_forward=PACMAN_JUMP_DISTANCE, forward_dir=(0.0, 0.0, 1.0), tnow=self.t)
+
+    def _nearest(self, items, reach):
+        best = None
+        best_d = reach
+        for item in items:
+            d = math.hypot(item[1] - self.x, item[2] - self.z)
+            if d <= best_d:
+                best_d = d
+                best = item
+        return best
+
+    def _interact(self):
+        key = self._nearest(self.keys, KEY_PICK_DISTANCE)
+        if key is not None:
+            self.keys.remove(key)
+            self.collected.append(key[0])
+            self.hearing.emit(self.x, self.z, Hearing.NOISE_KEY_PICKUP)
+        lock = self._nearest(self.locks, CELL_SIZE * UNLOCK_DISTANCE_CELLS)
+        if lock is not None and lock[0] in self.collected:
+            self.locks.remove(lock)
+            self.hearing.emit(self.x, self.z, Hearing.NOISE_UNLOCK)
+            if not self.locks:
+                self.unlocked = True
+
+    def _activate(self):
+        if not self.unlocked or self.escape_pos is None:
+            return False
+        return math.hypot(self.x - self.escape_pos[0], self.z - self.escape_pos[1]) <= CELL_SIZE * ACTIVATE_DISTANCE_CELLS
+
+    def step(self, action=IDLE):
+        if self.status != RUNNING:
+            return self.status
+        dt = self.dt
+        self.t += dt
+        self.frames += 1
+        self.hearing.advance(dt)
+        prev = (self.x, 0.0, self.z)
+
+        l = math.hypot(action.move_x, action.move_z)
+        moved = False
+        if l > 1e-9:
+            s = SIM_PLAYER_SPEED * (SIM_SPRINT_MULT if action.sprint else 1.0) * dt / l
+            x, z = self.tiles.clamp_move(self.x, self.z, action.move_x * s, action.move_z * s, margin=SIM_COLLISION_BUFFER)
+            moved = abs(x - self.x) > 1e-6 or abs(z - self.z) > 1e-6
+            self.x, self.z = x, z
+        self._sprint_noise_timer -= dt
+        if moved and action.sprint and self._sprint_noise_timer <= 0.0:
+            self.hearing.emit(self.x, self.z, Hearing.NOISE_SPRINT)
+            self._sprint_noise_timer = Hearing.NOISE_SPRINT_INTERVAL
+
+        if action.interact:
+            self._interact()
+        if action.activate and self._activate():
+            self.status = ESCAPED
+            return self.status
+
+        if not self.chasers and self.t >= self.pacman_delay:
+            self._spawn_chasers()
+        pos = (self.x, 0.0, self.z)
+        if self.chasers and len(self.chasers) > 1:
+            self._coop.update(dt)
+        for ai in self.chasers:
+            ai.node.step(self.t)
+            ai.update(dt, pos)
+            if ai.swept_collides(prev, pos, radius=SIM_PLAYER_RADIUS, height=SIM_PLAYER_HEIGHT):
+                self.status = CAUGHT
+                break
+        return self.status
+
+    def run(self, policy, max_seconds=600.0):
+        while self.status == RUNNING:
+            if self.t >= max_seconds:
+                self.status = TIMEOUT
+                break
+            self.step(policy(self))
+        return self.status
+
+
+class ObjectivePolicy:
+    # baseline bot: walk the grid to the nearest remaining key, then each lock, then the escape,
+    # pressing interact/activate every step; it ignores Pac-Man
+    def __init__(self, sim, sprint=False):
+        self.sim = sim
+        self.sprint = sprint
+        self._target = None
+        self._toward = None
+
+    def _goal(self):
+        sim = self.sim
+        if sim.keys:
+            items = sim.keys
+        elif sim.locks:
+            items = sim.locks
+        elif sim.escape_pos is not None:
+            return sim.escape_pos
+        else:
+            return None
+        best = min(items, key=lambda k: math.hypot(k[1] - sim.x, k[2] - sim.z))
+        return best[1], best[2]
+
+    def __call__(self, sim):
+        goal = self._goal()
+        if goal is None:
+            return IDLE
+        cell = sim.cell_of(*goal)
+        if cell != self._target:
+            self._target = cell
+            self._toward = build_toward_table(sim.mask, sim.rows, sim.cols, [cell]) if sim.mask[cell] else None
+        here = sim.cell_of(sim.x, sim.z)
+        nxt = self._toward[here] if self._toward is not None else NO_CELL
+        if nxt == NO_CELL or nxt == here:
+            tx, tz = goal
+        else:
+            tx, tz = sim.cell_center(nxt)
+        return Action(tx - sim.x, tz - sim.z, self.sprint, True, True)
+
+if __name__ == '__main__':
+    import sys
+    import time
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    chasers = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    results = {}
+    sim_time = 0.0
+    t0 = time.perf_counter()
+    for seed in range(games):
+        sim = Simulation(seed=seed, chasers=chasers)
+        status = sim.run(ObjectivePolicy(sim), max_seconds=300.0)
+        results[status] = results.get(status, 0) + 1
+        sim_time += sim.t
+    wall = time.perf_counter() - t0
+    print('[Sim] %d games, %d chasers: %s' % (games, chasers, results))
+    print('[Sim] simulated %.0f s in %.2f s (%.0fx real time)' % (sim_time, wall, sim_time / max(wall, 1e-9)))
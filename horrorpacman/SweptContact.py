@@ -0,0 +1,31 @@
+import math
+
+
+def swept_circle_toi(ax0, az0, ax1, az1, bx0, bz0, bx1, bz1, radius):
+    # earliest t in [0, 1] at which two linearly moving points come within radius, or -1.0
+    rx = bx0 - ax0
+    rz = bz0 - az0
+    c = rx * rx + rz * rz - radius * radius
+    if c <= 0.0:
+        return 0.0
+    vx = (bx1 - bx0) - (ax1 - ax0)
+    vz = (bz1 - bz0) - (az1 - az0)
+    a = vx * vx + vz * vz
+    b = rx * vx + rz * vz
+    if a < 1e-12 or b >= 0.0:
+        return -1.0
+    disc = b * b - a * c
+    if disc < 0.0:
+        return -1.0
+    t = (-b - math.sqrt(disc)) / a
+    return t if t <= 1.0 else -1.0
+
+
+def swept_capsules_toi(a0, a1, a_lo, a_hi, b0, b1, b_lo, b_hi, radius):
+    # vertical capsules (axis spans [lo, hi] over the frame, radii summed into radius)
+    # moving linearly from *0 to *1 on the xz plane; returns the time of first contact or -1.0
+    gap = max(0.0, b_lo - a_hi, a_lo - b_hi)
+    if gap >= radius:
+        return -1.0
+    flat = math.sqrt(radius * radius - gap * gap)
+    return swept_circle_toi(a0[0], a0[2], a1[0], a1[2], b0[0], b0[2], b1[0], b1[2], flat)
@@ -0,0 +1,287 @@
+import os
+import json
+import struct
+import hashlib
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+from GridSight import CACHE_DIR
+
+BVH_CACHE_VERSION = 1
+BVH_LEAF_SIZE = 4
+WALL_PROBE_Y = 0.8
+
+_COMPONENT_DTYPES = {5120: 'i1', 5121: 'u1', 5122: '<i2', 5123: '<u2', 5125: '<u4', 5126: '<f4'}
+_TYPE_SIZES = {'SCALAR': 1, 'VEC2': 2, 'VEC3': 3, 'VEC4': 4, 'MAT4': 16}
+
+
+def _read_glb(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version, length = struct.unpack_from('<4sII', data, 0)
+    if magic != b'glTF' or version != 2:
+        raise ValueError('not a glTF 2.0 binary: %s' % path)
+    offset = 12
+    gltf = None
+    binary = b''
+    while offset < min(length, len(data)):
+        chunk_len, chunk_type = struct.unpack_from('<II', data, offset)
+        chunk = data[offset + 8:offset + 8 + chunk_len]
+        if chunk_type == 0x4E4F534A:
+            gltf = json.loads(chunk.decode('utf-8'))
+        elif chunk_type == 0x004E4942:
+            binary = chunk
+        offset += 8 + chunk_len
+    if gltf is None:
+        raise ValueError('GLB has no JSON chunk: %s' % path)
+    return gltf, binary
+
+
+def _accessor(gltf, binary, index):
+    acc = gltf['accessors'][index]
+    if 'sparse' in acc or 'bufferView' not in acc:
+        raise ValueError('unsupported accessor %d' % index)
+    view = gltf['bufferViews'][acc['bufferView']]
+    dtype = np.dtype(_COMPONENT_DTYPES[acc['componentType']])
+    width = _TYPE_SIZES[acc['type']]
+    count = acc['count']
+    start = view.get('byteOffset', 0) + acc.get('byteOffset', 0)
+    stride = view.get('byteStride', 0) or dtype.itemsize * width
+    if stride == dtype.itemsize * width:
+        out = np.frombuffer(binary, dtype=dtype, count=count * width, offset=start)
+        return out.reshape(count, width) if width > 1 else out
+    rows = np.frombuffer(binary, dtype=np.uint8, count=stride * (count - 1) + dtype.itemsize * width, offset=start)
+    out = np.empty((count, width), dtype=dtype)
+    for k in range(width):
+        idx = np.arange(count) * stride + k * dtype.itemsize
+        out[:, k] = np.frombuffer(rows[(idx[:, None] + np.arange(dtype.itemsize)).ravel()].tobytes(), dtype=dtype)
+    return out if width > 1 else out[:, 0]
+
+
+def _node_matrix(node):
+    if 'matrix' in node:
+        return np.array(node['matrix'], dtype=np.float64).reshape(4, 4).T
+    m = np.eye(4)
+    qx, qy, qz, qw = node.get('rotation', (0.0, 0.0, 0.0, 1.0))
+    r = np.array([
+        [1 - 2 * (qy * qy + qz * qz), 2 * (qx * qy - qz * qw), 2 * (qx * qz + qy * qw)],
+        [2 * (qx * qy + qz * qw), 1 - 2 * (qx * qx + qz * qz), 2 * (qy * qz - qx * qw)],
+        [2 * (qx * qz - qy * qw), 2 * (qy * qz + qx * qw), 1 - 2 * (qx * qx + qy * qy)],
+    ])
+    m[:3, :3] = r * np.array(node.get('scale', (1.0, 1.0, 1.0)))[None, :]
+    m[:3, 3] = node.get('translation', (0.0, 0.0, 0.0))
+    return m
+
+
+def load_glb_triangles(path):
+    gltf, binary = _read_glb(path)
+    out = []
+    nodes = gltf.get('nodes', [])
+    scene = gltf.get('scenes', [{}])[gltf.get('scene', 0)] if gltf.get('scenes') else {'nodes': list(range(len(nodes)))}
+    stack = [(n, np.eye(4)) for n in scene.get('nodes', [])]
+    while stack:
+        ni, parent = stack.pop()
+        node = nodes[ni]
+        world = parent @ _node_matrix(node)
+        if 'mesh' in node:
+            for prim in gltf['meshes'][node['mesh']].get('primitives', []):
+                if prim.get('mode', 4) != 4 or 'POSITION' not in prim.get('attributes', {}):
+                    continue
+                if 'KHR_draco_mesh_compression' in prim.get('extensions', {}):
+                    raise ValueError('Draco-compressed meshes are not supported: %s' % path)
+                pos = _accessor(gltf, binary, prim['attributes']['POSITION']).astype(np.float64)
+                pos = pos @ world[:3, :3].T + world[:3, 3]
+                if 'indices' in prim:
+                    idx = _accessor(gltf, binary, prim['indices']).astype(np.int64)
+                else:
+                    idx = np.arange(len(pos))
+                out.append(pos[idx[:len(idx) // 3 * 3]].reshape(-1, 3, 3))
+        for child in node.get('children', []):
+            stack.append((child, world))
+    if not out:
+        return np.zeros((0, 3, 3), dtype=np.float32)
+    return np.concatenate(out).astype(np.float32)
+
+
+def build_bvh(tris, leaf_size=BVH_LEAF_SIZE):
+    tris = np.asarray(tris, dtype=np.float32).reshape(-1, 3, 3)
+    n = len(tris)
+    if n == 0:
+        # a single empty leaf; WallBVH.raycast returns misses without traversing it
+        zero = np.zeros(1, dtype=np.int32)
+        return {
+            'node_lo': np.zeros((1, 3), dtype=np.float32), 'node_hi': np.zeros((1, 3), dtype=np.float32),
+            'left': np.full(1, -1, dtype=np.int32), 'right': np.full(1, -1, dtype=np.int32),
+            'start': zero, 'count': zero.copy(), 'tris': tris,
+        }
+    lo = tris.min(axis=1)
+    hi = tris.max(axis=1)
+    centroid = (lo + hi) * 0.5
+    order = np.arange(n, dtype=np.int32)
+    cap = max(1, 2 * n)
+    node_lo = np.zeros((cap, 3), dtype=np.float32)
+    node_hi = np.zeros((cap, 3), dtype=np.float32)
+    left = np.full(cap, -1, dtype=np.int32)
+    right = np.full(cap, -1, dtype=np.int32)
+    start = np.zeros(cap, dtype=np.int32)
+    count = np.zeros(cap, dtype=np.int32)
+    used = 1
+    stack = [(0, 0, n)]
+    while stack:
+        node, s, e = stack.pop()
+        ids = order[s:e]
+        if e > s:
+            node_lo[node] = lo[ids].min(axis=0)
+            node_hi[node] = hi[ids].max(axis=0)
+        if e - s <= leaf_size:
+            start[node] = s
+            count[node] = e - s
+            continue
+        c = centroid[ids]
+        axis = int(np.argmax(c.max(axis=0) - c.min(axis=0)))
+        mid = (e - s) // 2
+        part = np.argpartition(c[:, axis], mid)
+        order[s:e] = ids[part]
+        left[node] = used
+        right[node] = used + 1
+        used += 2
+        stack.append((left[node], s, s + mid))
+        stack.append((right[node], s + mid, e))
+    return {
+        'node_lo': node_lo[:used], 'node_hi': node_hi[:used],
+        'left': left[:used], 'right': right[:used],
+        'start': start[:used], 'count': count[:used],
+        'tris': tris[order],
+    }
+
+
+class WallBVH:
+    def __init__(self, arrays, probe_y=WALL_PROBE_Y):
+        self.node_lo = arrays['node_lo']
+        self.node_hi = arrays['node_hi']
+        self.left = arrays['left']
+        self.right = arrays['right']
+        self.start = arrays['start']
+        self.count = arrays['count']
+        self.tris = arrays['tris']
+        self.probe_y = probe_y
+        self._v0 = self.tris[:, 0].astype(np.float64)
+        self._e1 = self.tris[:, 1].astype(np.float64) - self._v0
+        self._e2 = self.tris[:, 2].astype(np.float64) - self._v0
+
+    @classmethod
+    def from_triangles(cls, tris, probe_y=WALL_PROBE_Y):
+        return cls(build_bvh(tris), probe_y=probe_y)
+
+    def raycast(self, origins, dirs, max_dist):
+        # breadth-first traversal of all (ray, node) pairs at once; returns (distance, triangle or -1)
+        origins = np.asarray(origins, dtype=np.float64).reshape(-1, 3)
+        dirs = np.asarray(dirs, dtype=np.float64).reshape(-1, 3)
+        n = len(origins)
+        norm = np.linalg.norm(dirs, axis=1)
+        dirs = dirs / np.where(norm > 1e-12, norm, 1.0)[:, None]
+        best = np.broadcast_to(np.asarray(max_dist, dtype=np.float64), (n,)).copy()
+        hit_tri = np.full(n, -1, dtype=np.int64)
+        if len(self.tris) == 0 or n == 0:
+            return best, hit_tri
+        with np.errstate(divide='ignore'):
+            inv = 1.0 / dirs
+        ray = np.arange(n)
+        node = np.zeros(n, dtype=np.int64)
+        while ray.size:
+            o = origins[ray]
+            iv = inv[ray]
+            with np.errstate(invalid='ignore'):
+                t0 = (self.node_lo[node] - o) * iv
+                t1 = (self.node_hi[node] - o) * iv
+            t_near = np.nanmax(np.minimum(t0, t1), axis=1)
+            t_far = np.nanmin(np.maximum(t0, t1), axis=1)
+            keep = (t_near <= t_far) & (t_far >= 0.0) & (t_near <= best[ray])
+            ray = ray[keep]
+            node = node[keep]
+            leaf = self.left[node] < 0
+            if leaf.any():
+                self._intersect_leaves(origins, dirs, ray[leaf], node[leaf], best, hit_tri)
+            inner = ~leaf
+            ray = np.concatenate((ray[inner], ray[inner]))
+            node = np.concatenate((self.left[node[inner]], self.right[node[inner]])).astype(np.int64)
+        return best, hit_tri
+
+    def _intersect_leaves(self, origins, dirs, rays, nodes, best, hit_tri):
+        counts = self.count[nodes]
+        rays = np.repeat(rays, counts)
+        first = np.repeat(self.start[nodes], counts)
+        offs = np.arange(len(rays)) - np.repeat(np.cumsum(counts) - counts, counts)
+        tri = first + offs
+        d = dirs[rays]
+        e1 = self._e1[tri]
+        e2 = self._e2[tri]
+        p = np.cross(d, e2)
+        det = np.einsum('ij,ij->i', e1, p)
+        ok = np.abs(det) > 1e-12
+        inv_det = np.where(ok, 1.0 / np.where(ok, det, 1.0), 0.0)
+        s = origins[rays] - self._v0[tri]
+        u = np.einsum('ij,ij->i', s, p) * inv_det
+        q = np.cross(s, e1)
+        v = np.einsum('ij,ij->i', d, q) * inv_det
+        t = np.einsum('ij,ij->i', e2, q) * inv_det
+        ok &= (u >= 0.0) & (v >= 0.0) & (u + v <= 1.0) & (t >= 0.0)
+        if not ok.any():
+            return
+        rays, tri, t = rays[ok], tri[ok], t[ok]
+        closer = t < best[rays]
+        rays, tri, t = rays[closer], tri[closer], t[closer]
+        # several hits may target one ray: keep the nearest
+        order = np.lexsort((t, rays))
+        rays, tri, t = rays[order], tri[order], t[order]
+        first = np.ones(len(rays), dtype=bool)
+        first[1:] = rays[1:] != rays[:-1]
+        best[rays[first]] = t[first]
+        hit_tri[rays[first]] = tri[first]
+
+    def cast(self, ox, oz, dx, dz, max_dist):
+        # horizontal rays at probe_y, same signature as GridRaycaster.cast
+        ox = np.asarray(ox, dtype=np.float64).ravel()
+        n = len(ox)
+        origins = np.column_stack((ox, np.full(n, self.probe_y), np.asarray(oz, dtype=np.float64).ravel()))
+        dirs = np.column_stack((np.broadcast_to(np.asarray(dx, dtype=np.float64).ravel(), (n,)), np.zeros(n),
+                                np.broadcast_to(np.asarray(dz, dtype=np.float64).ravel(), (n,))))
+        return self.raycast(origins, dirs, max_dist)
+
+
+def _cache_path(paths):
+    h = hashlib.sha1()
+    for path in paths:
+        with open(path, 'rb') as f:
+            h.update(f.read())
+    h.update(('leaf=%d:v%d' % (BVH_LEAF_SIZE, BVH_CACHE_VERSION)).encode('ascii'))
+    return os.path.join(CACHE_DIR, 'walls_%s.npz' % h.hexdigest())
+
+
+def load_or_build_wall_bvh(paths, probe_y=WALL_PROBE_Y, use_cache=True):
+    paths = [p for p in paths if os.path.exists(p)]
+    if not paths:
+        return None
+    path = _cache_path(paths)
+    if use_cache and os.path.exists(path):
+        try:
+            with np.load(path) as data:
+                return WallBVH({k: data[k] for k in data.files}, probe_y=probe_y)
+        except Exception as e:
+            print('[WallBVH] Cache read failed, rebuilding:', e)
+    tris = np.concatenate([load_glb_triangles(p) for p in paths])
+    if len(tris) == 0:
+        print('[WallBVH] Wall meshes have no triangles')
+        return None
+    arrays = build_bvh(tris)
+    if use_cache:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmp = path + '.tmp.npz'
+            np.savez(tmp, **arrays)
+            os.replace(tmp, path)
+        except Exception as e:
+            print('[WallBVH] Cache write failed:', e)
+    return WallBVH(arrays, probe_y=probe_y)
@@ -0,0 +1,12 @@
+import os
+import sys
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# the game modules import each other as top-level names from horrorpacman/
+sys.path.insert(0, GAME_DIR)
+
+from vizstandin import install
+
+# real Vizard wins when it is importable; otherwise every module sees the stand-in
+install()
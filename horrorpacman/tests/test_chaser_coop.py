@@ -0,0 +1,96 @@
+from ChaserCoop import CoopPlanner, OccupancyGrid, COOP_ROBUST_STEPS
+from ChaserFields import FieldBank
+
+MAZE = (
+    '#########',
+    '#.......#',
+    '#.#.#.#.#',
+    '#.......#',
+    '#.#.#.#.#',
+    '#.......#',
+    '#########',
+)
+ROWS = len(MAZE)
+COLS = len(MAZE[0])
+MASK = bytearray(1 if ch == '.' else 0 for row in MAZE for ch in row)
+
+
+class FakeChaser:
+    def __init__(self, rc):
+        self.grid_r, self.grid_c = rc
+        self.current_path = []
+        self.step0 = None
+
+    def _set_path(self, path, next_idx=1, step0=None):
+        self.current_path = path
+        self.step0 = step0
+
+
+def _cell_at(path, t):
+    return tuple(path[min(t, len(path) - 1)])
+
+
+def test_personality_target_is_reserved_by_planner():
+    fields = FieldBank(MASK, ROWS, COLS)
+    fields.observe_player((1, 7), 0.0, 0.0)
+    planner = CoopPlanner(MASK, ROWS, COLS)
+    chaser = FakeChaser((5, 1))
+    planner.attach(chaser)
+    here = (chaser.grid_r, chaser.grid_c)
+    field, tactic = fields.target_field('chase', here)
+    assert tactic == 'chase'
+    goal = fields.descend(field, here, max_steps=ROWS * COLS)[-1]
+    assert goal == (1, 7)
+
+    planner.request(chaser.agent_id, goal)
+    planner.update(0.0)
+
+    path = chaser.current_path
+    assert tuple(path[-1]) == goal
+    assert chaser.step0 == planner.current_step()
+    for t, (r, c) in enumerate(path):
+        for k in range(COOP_ROBUST_STEPS + 1):
+            assert planner.table.owner(chaser.step0 + t + k, r * COLS + c) == chaser.agent_id
+
+
+def test_two_chasers_never_share_a_reserved_step():
+    fields = FieldBank(MASK, ROWS, COLS)
+    fields.observe_player((3, 4), 0.0, 0.0)
+    planner = CoopPlanner(MASK, ROWS, COLS)
+    a = FakeChaser((1, 1))
+    b = FakeChaser((1, 7))
+    for chaser in (a, b):
+        planner.attach(chaser)
+        here = (chaser.grid_r, chaser.grid_c)
+        field, _ = fields.target_field('chase', here)
+        planner.request(chaser.agent_id, fields.descend(field, here, max_steps=ROWS * COLS)[-1])
+    planner.update(0.0)
+
+    assert a.current_path and b.current_path
+    for t in range(planner.horizon):
+        assert _cell_at(a.current_path, t) != _cell_at(b.current_path, t)
+        swapped = (_cell_at(a.current_path, t) == _cell_at(b.current_path, t + 1)
+                   and _cell_at(b.current_path, t) == _cell_at(a.current_path, t + 1))
+        assert not swapped
+
+
+def test_occupancy_owner_survives_co_occupancy():
+    occupancy = OccupancyGrid(ROWS, COLS)
+    low = occupancy.register()
+    high = occupancy.register()
+    late = occupancy.register()
+    idx = 1 * COLS + 1
+    occupancy.enter(low, idx)
+    occupancy.enter(high, idx)
+    occupancy.leave(high, idx)
+    assert occupancy.blocks(late, idx)
+    assert occupancy.blocks(high, idx)
+    assert not occupancy.blocks(low, idx)
+
+    occupancy.enter(high, idx)
+    occupancy.leave(low, idx)
+    assert occupancy.blocks(late, idx)
+    assert not occupancy.blocks(low, idx)
+    occupancy.leave(high, idx)
+    assert occupancy.is_free(idx)
+    assert not occupancy.blocks(late, idx)
@@ -0,0 +1,71 @@
+import math
+import random
+
+from GridCollide import TileGrid
+
+CELL = 3.0
+MAZE = (
+    '#####',
+    '#...#',
+    '#.#.#',
+    '#...#',
+    '#####',
+)
+ROWS = len(MAZE)
+COLS = len(MAZE[0])
+MASK = bytearray(1 if ch == '.' else 0 for row in MAZE for ch in row)
+
+
+def _grid():
+    return TileGrid(MASK, ROWS, COLS, 0.0, 0.0, CELL)
+
+
+def _centre(r, c):
+    # origin is the centre of cell (ROWS - 1, 0); rows grow towards -z
+    return c * CELL, (ROWS - 1 - r) * CELL
+
+
+def test_raycast_hits_the_wall_face():
+    grid = _grid()
+    x, z = _centre(1, 1)
+    assert math.isclose(grid.raycast(x, z, 1.0, 0.0, 100.0), 2.5 * CELL)
+    assert math.isclose(grid.raycast(x, z, 0.0, 1.0, 100.0), 0.5 * CELL)
+    assert grid.raycast(x, z, 1.0, 0.0, 1.0) == 1.0
+
+
+def test_clamp_travel_stops_margin_short_of_the_wall():
+    grid = _grid()
+    x, z = _centre(1, 1)
+    margin = 0.35
+    travel = grid.clamp_travel(x, z, 1.0, 0.0, 100.0, margin)
+    assert math.isclose(travel, 2.5 * CELL - margin)
+    assert not grid.is_wall_at(x + travel, z)
+    assert grid.clamp_travel(x, z, 1.0, 0.0, 1.0, margin) == 1.0
+    assert grid.clamp_travel(x, z, 0.0, 1.0, 5.0, 2.0 * CELL) == 0.0
+
+
+def test_move_circle_never_ends_inside_a_wall():
+    grid = _grid()
+    rng = random.Random(0)
+    radius = 0.5
+    x, z = _centre(1, 1)
+    for _ in range(2000):
+        angle = rng.uniform(0.0, 2.0 * math.pi)
+        step = rng.uniform(0.0, 2.5 * CELL)
+        grid.move_circle(x, z, math.cos(angle) * step, math.sin(angle) * step, radius)
+        x, z = grid.out_x, grid.out_z
+        assert not grid.is_wall_at(x, z)
+        for ox, oz in ((radius, 0.0), (-radius, 0.0), (0.0, radius), (0.0, -radius)):
+            assert not grid.is_wall_at(x + ox * 0.99, z + oz * 0.99)
+
+
+def test_clamp_move_slides_along_a_wall_without_pushing_out():
+    grid = _grid()
+    margin = 0.2
+    x, z = _centre(1, 1)
+    # diagonal into the top wall: z stops margin short, x keeps going
+    nx, nz = grid.clamp_move(x, z, 2.0, 4.0, margin)
+    assert math.isclose(nx, x + 2.0)
+    assert math.isclose(nz, z + 0.5 * CELL - margin)
+    # already inside the stand-off: no travel toward the wall, and no push back
+    assert grid.clamp_move(nx, nz, 0.0, 1.0, margin) == (nx, nz)
@@ -0,0 +1,40 @@
+from GridNav import NO_CELL, build_nearest_walkable_table, build_source_table, build_toward_table
+
+MAZE = (
+    '.....',
+    '.###.',
+    '.#...',
+)
+ROWS = len(MAZE)
+COLS = len(MAZE[0])
+MASK = bytearray(1 if ch == '.' else 0 for row in MAZE for ch in row)
+
+
+def _idx(r, c):
+    return r * COLS + c
+
+
+def test_nearest_walkable_maps_walls_to_an_adjacent_floor_cell():
+    table = build_nearest_walkable_table(MASK, ROWS, COLS)
+    assert table[_idx(0, 0)] == _idx(0, 0)
+    assert table[_idx(1, 1)] in (_idx(0, 1), _idx(1, 0))
+    assert all(MASK[table[idx]] for idx in range(ROWS * COLS))
+
+
+def test_toward_table_steps_back_to_the_source():
+    table = build_toward_table(MASK, ROWS, COLS, [_idx(0, 0)])
+    idx = _idx(2, 2)
+    steps = 0
+    while table[idx] != idx:
+        idx = table[idx]
+        steps += 1
+    assert idx == _idx(0, 0)
+    assert steps == 8
+    assert table[_idx(1, 2)] == NO_CELL
+
+
+def test_source_table_labels_the_closest_source():
+    table = build_source_table(MASK, ROWS, COLS, [_idx(0, 0), _idx(2, 4)])
+    assert table[_idx(0, 1)] == _idx(0, 0)
+    assert table[_idx(1, 4)] == _idx(2, 4)
+    assert table[_idx(2, 0)] == _idx(0, 0)
@@ -0,0 +1,91 @@
+import math
+import random
+
+from GridCollide import TileGrid
+from RayCoherence import RayCoherenceCache
+
+CELL = 3.0
+# 1 = open; rows grow towards -z, origin is the centre of the bottom-left cell
+LAYOUT = [
+    "0000000",
+    "0111110",
+    "0110110",
+    "0111110",
+    "0111000",
+    "0111110",
+    "0000000",
+]
+
+
+def _grid():
+    rows = len(LAYOUT)
+    cols = len(LAYOUT[0])
+    mask = [1 if ch == '1' else 0 for line in LAYOUT for ch in line]
+    return TileGrid(mask, rows, cols, 0.0, 0.0, CELL)
+
+
+def _cast_for(tiles):
+    def cast(ox, y, oz, dx, dz, reach):
+        d = tiles.raycast(ox, oz, dx, dz, reach)
+        if d >= reach:
+            return None
+        hx = ox + dx * d
+        hz = oz + dz * d
+        u = (hx - tiles.origin_x) / CELL + 0.5
+        if abs(u - round(u)) < 1e-6:
+            return d, hx, hz, (-1.0 if dx > 0 else 1.0), 0.0
+        return d, hx, hz, 0.0, (-1.0 if dz > 0 else 1.0)
+    return cast
+
+
+def _check(cache, cast, ox, oz, dx, dz, length):
+    got = cache.distance(ox, 1.0, oz, dx, dz, length, cast)
+    res = cast(ox, 1.0, oz, dx, dz, length)
+    want = res[0] if res is not None and res[0] < length else None
+    if want is None:
+        return got is None
+    return got is not None and abs(got - want) < 1e-6
+
+
+def test_miss_is_not_reused_after_lateral_move():
+    tiles = _grid()
+    cast = _cast_for(tiles)
+    cache = RayCoherenceCache()
+    # clear ray along the open row at z = 15 towards +x, just above the wall tile at (row 2, col 3)
+    assert cache.distance(4.0, 1.0, 13.6, 1.0, 0.0, 5.0, cast) is None
+    # strafe towards the wall tile: the same segment now enters it
+    assert _check(cache, cast, 4.0, 13.4, 1.0, 0.0, 5.0)
+
+
+def test_hit_is_not_reused_past_a_wall_end():
+    tiles = _grid()
+    cast = _cast_for(tiles)
+    cache = RayCoherenceCache(face_size=CELL)
+    # hit the south face of the wall run in row 4 just right of where it ends at x = 10.5
+    assert cache.distance(10.8, 1.0, 4.0, 0.0, 1.0, 3.0, cast) is not None
+    # step left past the end of the wall: the extrapolated plane would still report a hit
+    assert _check(cache, cast, 10.4, 4.0, 0.0, 1.0, 3.0)
+
+
+def test_cached_answers_match_fresh_casts():
+    tiles = _grid()
+    cast = _cast_for(tiles)
+    cache = RayCoherenceCache(face_size=CELL)
+    rng = random.Random(3)
+    wrong = 0
+    for _ in range(3000):
+        ox = rng.uniform(3.5, 14.5)
+        oz = rng.uniform(3.5, 14.5)
+        if tiles.is_wall_at(ox, oz):
+            continue
+        a = rng.choice([0.0, 0.5 * math.pi, math.pi, 1.5 * math.pi]) + rng.uniform(-0.03, 0.03)
+        dx, dz = math.sin(a), math.cos(a)
+        for _ in range(6):
+            if not _check(cache, cast, ox, oz, dx, dz, 1.5):
+                wrong += 1
+            ox += rng.uniform(-0.15, 0.15)
+            oz += rng.uniform(-0.15, 0.15)
+            if tiles.is_wall_at(ox, oz):
+                break
+    assert wrong == 0
+    assert cache.reused > 0
@@ -0,0 +1,68 @@
+from SceneRays import NO_HIT, SCENE_RAY_QUANTUM, SceneHit, SceneRayBatch
+
+
+class CountingIntersect:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, start, end):
+        self.calls.append((tuple(start), tuple(end)))
+        return SceneHit(tuple(end), (0.0, 0.0, -1.0))
+
+
+def test_near_identical_segments_share_one_query():
+    fake = CountingIntersect()
+    rays = SceneRayBatch(fake)
+    nudge = SCENE_RAY_QUANTUM * 0.2
+    first = rays.intersect((0.0, 1.0, 0.0), (0.0, 1.0, 5.0))
+    again = rays.intersect((nudge, 1.0, 0.0), (0.0, 1.0, 5.0 - nudge))
+    other = rays.intersect((0.0, 1.0, 0.0), (0.0, 1.0, 5.0 + 3 * SCENE_RAY_QUANTUM))
+    assert again is first
+    assert other is not first
+    assert len(fake.calls) == 2
+
+
+def test_begin_frame_reports_counts_and_clears_the_memo():
+    fake = CountingIntersect()
+    rays = SceneRayBatch(fake)
+    rays.intersect((0.0, 1.0, 0.0), (1.0, 1.0, 0.0))
+    rays.intersect((0.0, 1.0, 0.0), (1.0, 1.0, 0.0))
+    assert rays.begin_frame() == (2, 1, 0)
+    assert rays.frame == 1
+    rays.intersect((0.0, 1.0, 0.0), (1.0, 1.0, 0.0))
+    assert len(fake.calls) == 2
+    assert rays.begin_frame() == (1, 1, 0)
+
+
+def test_over_budget_reuses_last_frame_then_falls_back():
+    fake = CountingIntersect()
+    fallback_calls = []
+
+    def fallback(start, end):
+        fallback_calls.append((start, end))
+        return NO_HIT
+
+    rays = SceneRayBatch(fake, budget=1, fallback=fallback)
+    a = ((0.0, 1.0, 0.0), (2.0, 1.0, 0.0))
+    b = ((0.0, 1.0, 0.0), (0.0, 1.0, 2.0))
+    hit_a = rays.intersect(*a)
+    hit_b = rays.intersect(*b)
+    assert hit_b is NO_HIT
+    assert len(fallback_calls) == 1
+    rays.begin_frame()
+    rays.intersect(*b)
+    assert rays.intersect(*a) is hit_a
+    assert rays.begin_frame() == (2, 1, 1)
+    assert len(fake.calls) == 2
+    assert len(fallback_calls) == 1
+
+
+def test_failing_intersect_reports_no_hit():
+    def broken(start, end):
+        raise RuntimeError('no scene')
+
+    rays = SceneRayBatch(broken)
+    assert rays.intersect((0.0, 0.0, 0.0), (1.0, 0.0, 0.0)) is NO_HIT
+    rays = SceneRayBatch(CountingIntersect(), budget=1, fallback=broken)
+    rays.intersect((0.0, 0.0, 0.0), (1.0, 0.0, 0.0))
+    assert rays.intersect((0.0, 0.0, 0.0), (0.0, 0.0, 1.0)) is NO_HIT
@@ -0,0 +1,52 @@
+from PacManAI import GRID_FILE, _read_grid
+from Simulation import Simulation, ObjectivePolicy
+
+
+def test_custom_grid_reaches_chasers(tmp_path):
+    grid = _read_grid(GRID_FILE)
+    r, c = next((r, c) for r, row in enumerate(grid) for c, ch in enumerate(row)
+                if ch == '🟨' and r > len(grid) // 2)
+    grid[r][c] = '🟥'
+    path = tmp_path / 'grid.txt'
+    path.write_text('\n'.join(''.join(row) for row in grid) + '\n', encoding='utf-8')
+    sim = Simulation(seed=0, chasers=2, pacman_delay=0.0, grid_path=str(path))
+    sim.step()
+    assert sim.chasers
+    for ai in sim.chasers:
+        assert not ai.is_walkable(r, c)
+
+
+def test_simulations_do_not_hear_each_other():
+    alone = Simulation(seed=0, chasers=1, pacman_delay=0.0)
+    noisy = Simulation(seed=1, chasers=1, pacman_delay=0.0)
+    alone.step()
+    noisy.step()
+    noisy.hearing.emit(noisy.x, noisy.z, 1.0)
+    assert alone.hearing.events_since(0) == []
+    assert alone.chasers[0].hearing is alone.hearing
+
+
+def _holds_reservation(ai):
+    coop = ai.coop
+    return coop.table.owner(coop.current_step(), ai.grid_r * ai.cols + ai.grid_c) == ai.agent_id
+
+
+def test_chasing_personalities_plan_through_the_coop_planner():
+    sim = Simulation(seed=0, chasers=4)
+    policy = ObjectivePolicy(sim)
+    reserved = False
+    while sim.status == 'running' and sim.t < 30.0 and not reserved:
+        sim.step(policy(sim))
+        owners = set(sim.chasers[0].coop.table.cells.values()) if len(sim.chasers) > 1 else set()
+        reserved = any(ai.mode == 'chase' and ai.personality is not None and ai.agent_id in owners
+                       for ai in sim.chasers)
+    assert reserved
+
+
+def test_reserved_chasers_never_share_a_cell():
+    sim = Simulation(seed=1, chasers=4)
+    policy = ObjectivePolicy(sim)
+    while sim.status == 'running' and sim.t < 20.0:
+        sim.step(policy(sim))
+        held = [(ai.grid_r, ai.grid_c) for ai in sim.chasers if ai.coop is not None and _holds_reservation(ai)]
+        assert len(set(held)) == len(held)
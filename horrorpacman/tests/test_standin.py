@@ -0,0 +1,31 @@
+import os
+
+import viz
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_floor_does_not_block_horizontal_rays(monkeypatch):
+    monkeypatch.chdir(GAME_DIR)
+    floor = viz.addChild(os.path.join('assets', 'PacMan_Floor.glb'))
+    try:
+        minX, minY, minZ, maxX, maxY, maxZ = floor.getBoundingBox()
+        assert maxY - minY < 0.5 and maxZ - minZ > 50.0
+        assert not viz.intersect([0.0, 0.8, -5.0], [0.0, 0.8, 5.0]).valid
+        assert viz.intersect([0.0, 2.0, 0.0], [0.0, -2.0, 0.0]).valid
+    finally:
+        floor.remove()
+
+
+def test_player_steps_under_standin(monkeypatch):
+    monkeypatch.chdir(GAME_DIR)
+    viz.reset()
+    import Player
+    start = Player.player.getPosition()
+    viz.press('w')
+    frames = viz.run(4.0)
+    viz.release('w')
+    assert frames == 240
+    assert not viz.quit_requested
+    assert Player.player.getPosition() != start
+    assert Player.pacman_ai is not None
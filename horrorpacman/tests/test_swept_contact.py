@@ -0,0 +1,53 @@
+import math
+
+from PacManAI import PacManChaser, PACMAN_SCALE
+from PacManLoaderAndAnimations import HeadlessPacMan
+from SweptContact import swept_capsules_toi, swept_circle_toi
+
+
+def test_fast_pass_through_is_caught_mid_frame():
+    # the bodies end 4 m apart on opposite sides, but their paths cross at t = 0.5
+    toi = swept_circle_toi(-2.0, 0.0, 2.0, 0.0, 2.0, 0.0, -2.0, 0.0, 1.0)
+    assert math.isclose(toi, 0.375)
+
+
+def test_parallel_motion_at_constant_distance_never_touches():
+    assert swept_circle_toi(0.0, 0.0, 5.0, 0.0, 0.0, 2.0, 5.0, 2.0, 1.0) == -1.0
+    assert swept_circle_toi(0.0, 0.0, 5.0, 0.0, 0.0, 0.5, 5.0, 0.5, 1.0) == 0.0
+
+
+def test_vertical_gap_excludes_contact():
+    a0, a1 = (0.0, 0.0, 0.0), (4.0, 0.0, 0.0)
+    b0, b1 = (4.0, 3.0, 0.0), (0.0, 3.0, 0.0)
+    assert swept_capsules_toi(a0, a1, 0.0, 0.5, b0, b1, 2.0, 3.0, 1.0) == -1.0
+    # the same paths with overlapping spans do meet
+    assert swept_capsules_toi(a0, a1, 0.0, 2.5, b0, b1, 2.0, 3.0, 1.0) >= 0.0
+
+
+def test_overlapping_start_reports_time_zero():
+    assert swept_circle_toi(0.0, 0.0, 1.0, 0.0, 0.5, 0.0, 3.0, 0.0, 1.0) == 0.0
+    p = (0.0, 0.0, 0.0)
+    assert swept_capsules_toi(p, p, 0.0, 1.0, (0.3, 0.5, 0.0), (9.0, 0.5, 0.0), 0.5, 1.5, 0.6) == 0.0
+
+
+def _chaser_at(x, y, z):
+    ai = PacManChaser(existing_node=HeadlessPacMan(base_scale=PACMAN_SCALE))
+    # the chaser snaps its node to a spawn cell; tests place it by hand
+    ai.node.setPosition((x, y, z))
+    return ai
+
+
+def test_chaser_catches_a_player_it_jumps_past():
+    ai = _chaser_at(-3.0, 0.35, 0.0)
+    still = (0.0, 0.0, 0.0)
+    assert not ai.swept_collides(still, still)
+    # one frame carries Pac-Man from 3 m on one side of the player to 3 m on the other
+    ai.node.setPosition((3.0, 0.35, 0.0))
+    assert ai.swept_collides(still, still)
+
+
+def test_chaser_misses_a_player_moving_alongside():
+    ai = _chaser_at(0.0, 0.35, -3.0)
+    assert not ai.swept_collides((3.0, 0.0, -3.0), (3.0, 0.0, -3.0))
+    ai.node.setPosition((0.0, 0.35, 3.0))
+    assert not ai.swept_collides((3.0, 0.0, -3.0), (3.0, 0.0, 3.0))
@@ -0,0 +1,62 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from WallBVH import WallBVH, build_bvh
+
+
+def _brute_force(tris, origin, direction, max_dist):
+    # Moller-Trumbore against every triangle
+    best = max_dist
+    for v0, v1, v2 in tris.astype(np.float64):
+        e1 = v1 - v0
+        e2 = v2 - v0
+        p = np.cross(direction, e2)
+        det = e1.dot(p)
+        if abs(det) <= 1e-12:
+            continue
+        s = origin - v0
+        u = s.dot(p) / det
+        q = np.cross(s, e1)
+        v = direction.dot(q) / det
+        t = e2.dot(q) / det
+        if u >= 0.0 and v >= 0.0 and u + v <= 1.0 and 0.0 <= t < best:
+            best = t
+    return best
+
+
+def _wall_quads(rng, count):
+    # vertical quads like maze wall faces, two triangles each
+    tris = []
+    for _ in range(count):
+        x, z = rng.uniform(-20.0, 20.0, size=2)
+        ax, az = rng.choice([(1.0, 0.0), (0.0, 1.0)], axis=0) * rng.uniform(1.0, 6.0)
+        a = (x, 0.0, z)
+        b = (x + ax, 0.0, z + az)
+        c = (x + ax, 2.0, z + az)
+        d = (x, 2.0, z)
+        tris.append((a, b, c))
+        tris.append((a, c, d))
+    return np.array(tris, dtype=np.float32)
+
+
+def test_raycast_matches_brute_force():
+    rng = np.random.default_rng(0)
+    tris = _wall_quads(rng, 60)
+    bvh = WallBVH.from_triangles(tris)
+    angles = rng.uniform(0.0, 2.0 * np.pi, size=300)
+    origins = np.column_stack((rng.uniform(-20.0, 20.0, 300), np.full(300, 0.8), rng.uniform(-20.0, 20.0, 300)))
+    dirs = np.column_stack((np.cos(angles), np.zeros(300), np.sin(angles)))
+    dist, hit = bvh.raycast(origins, dirs, 30.0)
+    expected = np.array([_brute_force(tris, o, d, 30.0) for o, d in zip(origins, dirs)])
+    np.testing.assert_allclose(dist, expected, rtol=1e-5, atol=1e-5)
+    assert ((hit >= 0) == (expected < 30.0)).all()
+    assert (hit >= 0).sum() > 50
+
+
+def test_empty_mesh_builds_and_misses():
+    arrays = build_bvh(np.zeros((0, 3, 3), dtype=np.float32))
+    assert len(arrays['tris']) == 0
+    dist, hit = WallBVH(arrays).cast([0.0], [0.0], [1.0], [0.0], 5.0)
+    assert dist[0] == 5.0
+    assert hit[0] == -1
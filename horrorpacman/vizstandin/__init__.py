@@ -0,0 +1,23 @@
+import os
+import sys
+
+STANDIN_DIR = os.path.dirname(os.path.abspath(__file__))
+GAME_DIR = os.path.dirname(STANDIN_DIR)
+
+
+def install(force=False):
+    # puts the stand-in viz/vizact/vizshape first on sys.path unless real Vizard is importable
+    if not force:
+        try:
+            import viz
+            return bool(getattr(viz, 'STANDIN', False))
+        except ImportError:
+            pass
+    for name in ('viz', 'vizact', 'vizshape'):
+        sys.modules.pop(name, None)
+    if STANDIN_DIR not in sys.path:
+        sys.path.insert(0, STANDIN_DIR)
+    # the stand-in reads model bounds with the game's own GLB loader
+    if GAME_DIR not in sys.path:
+        sys.path.append(GAME_DIR)
+    return True
@@ -0,0 +1,54 @@
+import os
+import sys
+import time
+
+from vizstandin import install
+
+install(force=True)
+import viz
+
+# scripted input: walk forward, sweep the mouse, sprint now and then
+SCRIPT = [
+    (0.0, 'press', 'w'),
+    (4.0, 'mouse', (40, 0)),
+    (6.0, 'press', viz.KEY_SHIFT_L),
+    (8.0, 'release', viz.KEY_SHIFT_L),
+    (9.0, 'mouse', (-80, 0)),
+    (12.0, 'press', 'd'),
+    (14.0, 'release', 'd'),
+]
+
+
+def main(seconds=10.0):
+    sys.path.insert(0, os.getcwd())
+    t0 = time.perf_counter()
+    import PacMan_exe
+    load_s = time.perf_counter() - t0
+    game = PacMan_exe.game
+    rays = getattr(game, '_scene_rays', None)
+    pending = sorted(SCRIPT, key=lambda s: s[0])
+    frames = 0
+    totals = [0, 0, 0]
+    t0 = time.perf_counter()
+    while viz.getFrameTime() < seconds and not viz.quit_requested:
+        while pending and pending[0][0] <= viz.getFrameTime():
+            _, kind, arg = pending.pop(0)
+            if kind == 'mouse':
+                viz.move_mouse(*arg)
+            else:
+                getattr(viz, kind)(arg)
+        viz.step()
+        frames += 1
+        if rays is not None:
+            totals = [totals[0] + rays.requested, totals[1] + rays.issued, totals[2] + rays.dropped]
+    run_s = time.perf_counter() - t0
+    print('[standin] load %.2fs, %d frames (%.1f sim s) in %.2fs -> %.0fx real time'
+          % (load_s, frames, viz.getFrameTime(), run_s, viz.getFrameTime() / max(run_s, 1e-9)))
+    print('[standin] player at', [round(v, 2) for v in game.player.getPosition()],
+          'nodes:', len(viz._nodes), 'quit:', viz.quit_requested)
+    if rays is not None:
+        print('[standin] scene rays requested/issued/dropped:', *totals)
+
+
+if __name__ == '__main__':
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 10.0)
@@ -0,0 +1,585 @@
+import os
+import math
+
+STANDIN = True
+
+OFF = 0
+ON = 1
+TOGGLE = -1
+LIGHTING = 'lighting'
+FOG = 'fog'
+LOOP = 'loop'
+SCREEN = 'screen'
+ALIGN_CENTER_TOP = 'center_top'
+ABS_PARENT = 'abs_parent'
+ABS_GLOBAL = 'abs_global'
+WHITE = [1.0, 1.0, 1.0]
+RED = [1.0, 0.0, 0.0]
+BLACK = [0.0, 0.0, 0.0]
+
+KEY_ESCAPE = 65307
+KEY_TAB = 65289
+KEY_SHIFT_L = 65505
+
+UPDATE_EVENT = 'update'
+MOUSE_MOVE_EVENT = 'mouse_move'
+
+DEFAULT_DT = 1.0 / 60.0
+
+_time = 0.0
+_elapsed = 0.0
+_frame = 0
+_timers = []
+_callbacks = {}
+_key_down = {}
+_key_up = {}
+_nodes = []
+_glb_bounds = {}
+quit_requested = False
+sounds_played = []
+
+
+def _euler_matrix(yaw, pitch, roll):
+    # rows of R = Ry(yaw) * Rx(pitch) * Rz(roll); yaw turns +z towards +x
+    cy, sy = math.cos(math.radians(yaw)), math.sin(math.radians(yaw))
+    cp, sp = math.cos(math.radians(pitch)), math.sin(math.radians(pitch))
+    cr, sr = math.cos(math.radians(roll)), math.sin(math.radians(roll))
+    return (
+        (cy * cr + sy * sp * sr, -cy * sr + sy * sp * cr, sy * cp),
+        (cp * sr, cp * cr, -sp),
+        (-sy * cr + cy * sp * sr, sy * sr + cy * sp * cr, cy * cp),
+    )
+
+
+def _glb_box(path):
+    # bounds of the model with its node transforms applied; needs NumPy like the wall BVH
+    if path in _glb_bounds:
+        return _glb_bounds[path]
+    box = None
+    try:
+        from WallBVH import load_glb_triangles
+        pts = load_glb_triangles(path).reshape(-1, 3)
+        if len(pts):
+            box = ([float(v) for v in pts.min(axis=0)], [float(v) for v in pts.max(axis=0)])
+    except Exception as e:
+        print('[standin] No bounds for', path, ':', e)
+    _glb_bounds[path] = box
+    return box
+
+
+class Node:
+    def __init__(self, box=None, name=''):
+        self.name = name
+        self._box = box
+        self._pos = [0.0, 0.0, 0.0]
+        self._euler = [0.0, 0.0, 0.0]
+        self._scale = [1.0, 1.0, 1.0]
+        self._color = [1.0, 1.0, 1.0]
+        self._visible = True
+        self._disabled = set()
+        self._parent = None
+        self._children = []
+        self._removed = False
+        _nodes.append(self)
+
+    def __repr__(self):
+        return '<standin.Node %s>' % (self.name or id(self))
+
+    def setPosition(self, x, y=None, z=None, mode=None):
+        if y is None or isinstance(y, str):
+            x, y, z = (list(x) + [0.0])[:3] if len(x) == 2 else x
+        elif z is None or isinstance(z, str):
+            z = 0.0
+        self._pos = [float(x), float(y), float(z)]
+
+    def getPosition(self, mode=None):
+        if mode == ABS_GLOBAL:
+            return list(self._to_world(0.0, 0.0, 0.0))
+        return list(self._pos)
+
+    def setEuler(self, yaw, pitch=None, roll=None, mode=None):
+        if pitch is None or isinstance(pitch, str):
+            yaw, pitch, roll = yaw
+        self._euler = [float(yaw), float(pitch), float(roll)]
+
+    def getEuler(self, mode=None):
+        return list(self._euler)
+
+    def setScale(self, x, y=None, z=None, mode=None):
+        if y is None or isinstance(y, str):
+            x, y, z = x
+        self._scale = [float(x), float(y), float(z)]
+
+    def getScale(self, mode=None):
+        return list(self._scale)
+
+    def setParent(self, parent, *args):
+        if self._parent is not None and self in self._parent._children:
+            self._parent._children.remove(self)
+        self._parent = parent if isinstance(parent, Node) else None
+        if self._parent is not None:
+            self._parent._children.append(self)
+
+    def getParent(self, *args):
+        return self._parent
+
+    def getChildren(self):
+        return list(self._children)
+
+    def color(self, r=None, g=None, b=None, *args):
+        if r is None:
+            return list(self._color)
+        if g is None:
+            r, g, b = list(r)[:3]
+        self._color = [float(r), float(g), float(b)]
+        for c in self._children:
+            c.color(r, g, b)
+
+    def getColor(self):
+        return list(self._color)
+
+    def visible(self, state=ON, *args):
+        self._visible = (not self._visible) if state == TOGGLE else bool(state)
+
+    def getVisible(self):
+        return self._visible
+
+    def disable(self, flag):
+        self._disabled.add(flag)
+
+    def enable(self, flag):
+        self._disabled.discard(flag)
+
+    def texture(self, *args):
+        pass
+
+    def alpha(self, *args):
+        pass
+
+    def remove(self, *args):
+        for c in list(self._children):
+            c.remove()
+        self.setParent(None)
+        self._removed = True
+        if self in _nodes:
+            _nodes.remove(self)
+
+    def clone(self, *args):
+        copy = Node(box=self._box, name=self.name)
+        copy._pos = list(self._pos)
+        copy._euler = list(self._euler)
+        copy._scale = list(self._scale)
+        copy._color = list(self._color)
+        copy._visible = self._visible
+        copy._disabled = set(self._disabled)
+        for c in self._children:
+            c.clone().setParent(copy)
+        return copy
+
+    def _to_parent(self, x, y, z):
+        sx, sy, sz = self._scale
+        m = _euler_matrix(*self._euler)
+        x, y, z = x * sx, y * sy, z * sz
+        px, py, pz = self._pos
+        return (m[0][0] * x + m[0][1] * y + m[0][2] * z + px,
+                m[1][0] * x + m[1][1] * y + m[1][2] * z + py,
+                m[2][0] * x + m[2][1] * y + m[2][2] * z + pz)
+
+    def _to_world(self, x, y, z):
+        node = self
+        while node is not None:
+            x, y, z = node._to_parent(x, y, z)
+            node = node._parent
+        return x, y, z
+
+    def _live(self):
+        node = self
+        while node is not None:
+            if node._removed or not node._visible:
+                return False
+            node = node._parent
+        return True
+
+    def _corners(self):
+        (x0, y0, z0), (x1, y1, z1) = self._box
+        return [(x, y, z) for x in (x0, x1) for y in (y0, y1) for z in (z0, z1)]
+
+    def _subtree_points(self):
+        # corners of every box below this node, in this node's own frame
+        pts = list(self._corners()) if self._box is not None else []
+        for c in self._children:
+            pts.extend(c._to_parent(*p) for p in c._subtree_points())
+        return pts
+
+    def getBoundingBox(self, mode=None):
+        pts = [self._to_parent(*p) for p in self._subtree_points()]
+        if mode == ABS_GLOBAL and self._parent is not None:
+            pts = [self._parent._to_world(*p) for p in pts]
+        if not pts:
+            return []
+        xs, ys, zs = zip(*pts)
+        return [min(xs), min(ys), min(zs), max(xs), max(ys), max(zs)]
+
+    def getBoundingSphere(self, mode=None):
+        bb = self.getBoundingBox(mode)
+        if not bb:
+            return []
+        cx, cy, cz = (bb[0] + bb[3]) * 0.5, (bb[1] + bb[4]) * 0.5, (bb[2] + bb[5]) * 0.5
+        return [cx, cy, cz, math.sqrt((bb[3] - cx) ** 2 + (bb[4] - cy) ** 2 + (bb[5] - cz) ** 2)]
+
+    def _world_box(self):
+        xs, ys, zs = zip(*[self._to_world(*p) for p in self._corners()])
+        return min(xs), min(ys), min(zs), max(xs), max(ys), max(zs)
+
+
+class _Text(Node):
+    def __init__(self, text, parent=None):
+        Node.__init__(self, name='text')
+        self.text = text
+        self.screen = parent == SCREEN
+        if isinstance(parent, Node):
+            self.setParent(parent)
+
+    def message(self, text=None):
+        if text is None:
+            return self.text
+        self.text = text
+
+    def fontSize(self, *args):
+        pass
+
+    def alignment(self, *args):
+        pass
+
+
+class _Audio:
+    def __init__(self, path):
+        self.path = path
+        self.playing = False
+        self._volume = 1.0
+        self._loop = False
+
+    def play(self):
+        self.playing = True
+        sounds_played.append(self.path)
+
+    def stop(self):
+        self.playing = False
+
+    def pause(self):
+        self.playing = False
+
+    def volume(self, v=None):
+        if v is None:
+            return self._volume
+        self._volume = float(v)
+
+    def loop(self, state=ON):
+        self._loop = bool(state)
+
+    def pitch(self, *args):
+        pass
+
+    def getState(self):
+        return 'playing' if self.playing else 'stopped'
+
+
+class _View:
+    def __init__(self):
+        self._pos = [0.0, 0.0, 0.0]
+        self._euler = [0.0, 0.0, 0.0]
+        self.look_at = None
+
+    def setPosition(self, x, y=None, z=None, *args):
+        self._pos = [float(v) for v in (x if y is None else (x, y, z))]
+
+    def getPosition(self, *args):
+        return list(self._pos)
+
+    def setEuler(self, yaw, pitch=None, roll=None, *args):
+        self._euler = [float(v) for v in (yaw if pitch is None else (yaw, pitch, roll))]
+
+    def getEuler(self, *args):
+        return list(self._euler)
+
+    def lookat(self, target, *args):
+        self.look_at = list(target)
+
+
+class _Scene:
+    def __init__(self):
+        self.fog_params = None
+        self.fog_color = None
+
+    def fog(self, *args):
+        self.fog_params = args
+
+    def fogColor(self, color, *args):
+        self.fog_color = color
+
+
+class _Mouse:
+    def __init__(self):
+        self.position = [0.5, 0.5]
+        self.trapped = False
+        self.shown = True
+
+    def setOverride(self, *args):
+        pass
+
+    def setVisible(self, state):
+        self.shown = bool(state)
+
+    def setTrap(self, state):
+        self.trapped = bool(state)
+
+    def setPosition(self, pos, *args):
+        self.position = list(pos)
+
+
+class _Window:
+    size = [1280, 720]
+
+    def getSize(self, *args):
+        return list(self.size)
+
+
+class _Intersection:
+    def __init__(self, valid=False, point=(0.0, 0.0, 0.0), normal=(0.0, 0.0, 0.0), obj=None):
+        self.valid = valid
+        self.point = list(point)
+        self.normal = list(normal)
+        self.object = obj
+        self.name = obj.name if obj is not None else ''
+
+
+class _MouseEvent:
+    def __init__(self, dx, dy):
+        self.dx = dx
+        self.dy = dy
+
+
+class _Handle:
+    def __init__(self, table, key, entry):
+        self._table = table
+        self._key = key
+        self.entry = entry
+
+    def setEnabled(self, state):
+        self.entry[-1] = bool(state)
+
+    def getEnabled(self):
+        return self.entry[-1]
+
+    def remove(self):
+        entries = self._table.get(self._key, self._table) if isinstance(self._table, dict) else self._table
+        if self.entry in entries:
+            entries.remove(self.entry)
+
+
+MainView = _View()
+MainScene = _Scene()
+mouse = _Mouse()
+window = _Window()
+
+
+def addGroup(parent=None, *args, **kw):
+    node = Node(name='group')
+    if isinstance(parent, Node):
+        node.setParent(parent)
+    return node
+
+
+def addChild(path, parent=None, *args, **kw):
+    if not os.path.exists(path):
+        print('[standin] Missing model ->', path)
+    node = Node(box=_glb_box(path) if path.lower().endswith('.glb') else None, name=os.path.basename(path))
+    if isinstance(parent, Node):
+        node.setParent(parent)
+    return node
+
+
+def addText(text, parent=None, *args, **kw):
+    return _Text(text, parent)
+
+
+def addAudio(path, *args, **kw):
+    return _Audio(path)
+
+
+def playSound(path, *args):
+    sounds_played.append(path)
+
+
+def remove(node):
+    node.remove()
+
+
+def intersect(start, end, *args, **kw):
+    # segment against the box of every visible node; boxes containing the start are skipped
+    sx, sy, sz = start
+    d = (end[0] - sx, end[1] - sy, end[2] - sz)
+    best_t = 1.0
+    best = None
+    for node in _nodes:
+        if node._box is None or not node._live():
+            continue
+        lo = node._world_box()
+        hi = lo[3:]
+        lo = lo[:3]
+        if all(lo[k] <= start[k] <= hi[k] for k in range(3)):
+            continue
+        t0, t1, axis = 0.0, best_t, -1
+        for k in range(3):
+            if abs(d[k]) < 1e-12:
+                if start[k] < lo[k] or start[k] > hi[k]:
+                    t0 = 2.0
+                    break
+                continue
+            a = (lo[k] - start[k]) / d[k]
+            b = (hi[k] - start[k]) / d[k]
+            if a > b:
+                a, b = b, a
+            if a > t0:
+                t0, axis = a, k
+            t1 = min(t1, b)
+            if t0 > t1:
+                break
+        if t0 <= t1 and axis >= 0 and t0 < best_t:
+            normal = [0.0, 0.0, 0.0]
+            normal[axis] = -1.0 if d[axis] > 0 else 1.0
+            best_t = t0
+            best = (node, normal)
+    if best is None:
+        return _Intersection()
+    point = (sx + d[0] * best_t, sy + d[1] * best_t, sz + d[2] * best_t)
+    return _Intersection(True, point, best[1], best[0])
+
+
+def callback(event, func, *args):
+    _callbacks.setdefault(event, []).append(func)
+
+
+def setMultiSample(*args):
+    pass
+
+
+def clearcolor(*args):
+    pass
+
+
+def setOption(*args):
+    pass
+
+
+def setMousePosition(pos, *args):
+    mouse.setPosition(pos)
+
+
+def getWindowSize():
+    return window.getSize()
+
+
+def go(*args):
+    pass
+
+
+def quit():
+    global quit_requested
+    quit_requested = True
+
+
+def getFrameTime():
+    return _time
+
+
+def getFrameElapsed():
+    return _elapsed
+
+
+def getFrameNumber():
+    return _frame
+
+
+def _add_timer(interval, repeats, func, args):
+    # entry: [next_time, interval, repeats_left (-1 = forever), func, args, enabled]
+    entry = [_time + interval, interval, repeats, func, args, True]
+    _timers.append(entry)
+    return _Handle(_timers, None, entry)
+
+
+def _add_key_handler(table, key, func, args):
+    entry = [func, args, True]
+    table.setdefault(key, []).append(entry)
+    return _Handle(table, key, entry)
+
+
+def _fire_keys(table, key):
+    for entry in list(table.get(key, [])):
+        if entry[-1]:
+            entry[0](*entry[1])
+
+
+def press(key):
+    _fire_keys(_key_down, key)
+
+
+def release(key):
+    _fire_keys(_key_up, key)
+
+
+def tap(key):
+    press(key)
+    release(key)
+
+
+def move_mouse(dx, dy):
+    e = _MouseEvent(dx, dy)
+    for func in list(_callbacks.get(MOUSE_MOVE_EVENT, [])):
+        func(e)
+
+
+def step(dt=DEFAULT_DT):
+    # one frame of the manual clock: timers in registration order, then update callbacks
+    global _time, _elapsed, _frame
+    _time += dt
+    _elapsed = dt
+    _frame += 1
+    for entry in list(_timers):
+        if not entry[-1] or _time + 1e-9 < entry[0]:
+            continue
+        entry[0] = _time + entry[1]
+        if entry[2] == 0:
+            continue
+        if entry[2] > 0:
+            entry[2] -= 1
+        entry[3](*entry[4])
+        if entry[2] == 0 and entry in _timers:
+            _timers.remove(entry)
+    for func in list(_callbacks.get(UPDATE_EVENT, [])):
+        func()
+
+
+def run(seconds, dt=DEFAULT_DT, until=None):
+    # pumps frames until the time is up, viz.quit() is called or until() returns true
+    end = _time + seconds
+    frames = 0
+    while _time + 1e-9 < end and not quit_requested:
+        step(dt)
+        frames += 1
+        if until is not None and until():
+            break
+    return frames
+
+
+def reset():
+    global _time, _elapsed, _frame, quit_requested
+    _time = _elapsed = 0.0
+    _frame = 0
+    quit_requested = False
+    del _timers[:]
+    del _nodes[:]
+    del sounds_played[:]
+    _callbacks.clear()
+    _key_down.clear()
+    _key_up.clear()
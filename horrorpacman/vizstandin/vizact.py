@@ -0,0 +1,17 @@
+import viz
+
+
+def ontimer(rate, func, *args):
+    return viz._add_timer(rate, -1, func, args)
+
+
+def ontimer2(rate, repeats, func, *args):
+    return viz._add_timer(rate, repeats + 1, func, args)
+
+
+def onkeydown(key, func, *args):
+    return viz._add_key_handler(viz._key_down, key, func, args)
+
+
+def onkeyup(key, func, *args):
+    return viz._add_key_handler(viz._key_up, key, func, args)
@@ -0,0 +1,34 @@
+import viz
+
+AXIS_X = 'x'
+AXIS_Y = 'y'
+AXIS_Z = 'z'
+
+
+def _along(axis, radial, length):
+    half = {AXIS_X: (length, radial, radial), AXIS_Y: (radial, length, radial), AXIS_Z: (radial, radial, length)}[axis]
+    return ([-h for h in half], list(half))
+
+
+def addSphere(radius=0.5, *args, **kw):
+    return viz.Node(box=([-radius] * 3, [radius] * 3), name='sphere')
+
+
+def addBox(size=(1.0, 1.0, 1.0), *args, **kw):
+    half = [s * 0.5 for s in size]
+    return viz.Node(box=([-h for h in half], half), name='box')
+
+
+def addCylinder(height=1.0, radius=0.5, axis=AXIS_Y, *args, **kw):
+    return viz.Node(box=_along(axis, radius, height * 0.5), name='cylinder')
+
+
+def addPlane(size=(1.0, 1.0), axis=AXIS_Y, *args, **kw):
+    w, d = size
+    if axis == AXIS_Y:
+        box = ([-w * 0.5, 0.0, -d * 0.5], [w * 0.5, 0.0, d * 0.5])
+    elif axis == AXIS_X:
+        box = ([0.0, -w * 0.5, -d * 0.5], [0.0, w * 0.5, d * 0.5])
+    else:
+        box = ([-w * 0.5, -d * 0.5, 0.0], [w * 0.5, d * 0.5, 0.0])
+    return viz.Node(box=box, name='plane')